@@ -72,6 +72,7 @@ class BatchSettings:
         self.vmt_rebound_rate_ice = None
         self.vmt_rebound_rate_bev = None
         self.net_benefit_ghg_scope = 'global'  # default value; change via batch file ('domestic' and 'both' are options)
+        self.session_processes = 1  # default value; number of sessions to run at a time, change via batch file
 
         self.inputs_filelist = list()
         self.maintenance_costs_file = None
@@ -508,3 +509,11 @@ class BatchSettings:
         if self.save_input_files in self.true_false_dict:
             self.save_input_files = self.true_false_dict[self.save_input_files]
             effects_log.logwrite(f'{string_id} is {self.save_input_files}')
+
+        string_id = 'Session Processes'
+        try:
+            # optional, protect against a missing entry, NaN or empty string
+            self.session_processes = int(float(self._dict[(string_id, 'all')]['value']))
+        except (KeyError, TypeError, ValueError):
+            self.session_processes = 1
+        effects_log.logwrite(f'{string_id} is {self.session_processes}')
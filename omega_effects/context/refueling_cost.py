@@ -46,6 +46,8 @@ Data Column Name and Description
 **CODE**
 
 """
+import marshal
+
 from omega_effects.general.general_functions import read_input_file
 from omega_effects.general.input_validation import \
     validate_template_version_info, validate_template_column_names
@@ -59,6 +61,31 @@ class RefuelingCost:
     def __init__(self):
         self._data = dict()
 
+    def __getstate__(self):
+        """
+        Get the state to pickle, e.g. to pass the batch settings to pool worker processes.  Code objects can't be
+        pickled so the compiled cost equations are marshalled.
+
+        Returns:
+            Dict of object attributes
+
+        """
+        state = self.__dict__.copy()
+        state['_data'] = {k: {**v, 'value': marshal.dumps(v['value'])} for k, v in self._data.items()}
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        Set the state from an unpickled state, see ``__getstate__()``.
+
+        Args:
+            state (dict): object attributes
+
+        """
+        state['_data'] = {k: {**v, 'value': marshal.loads(v['value'])} for k, v in state['_data'].items()}
+        self.__dict__.update(state)
+
     def init_from_file(self, filepath, batch_settings, effects_log):
         """
 
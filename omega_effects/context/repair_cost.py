@@ -44,6 +44,7 @@ Data Column Name and Description
 # reactivate these imports for QA/QC of this module
 # from matplotlib import pyplot
 from math import e
+import numpy as np
 
 from omega_effects.general.general_functions import read_input_file
 from omega_effects.general.input_validation import \
@@ -113,3 +114,32 @@ class RepairCost:
         repair_cost_per_mile = veh_type_multiplier * pt_multiplier * a_value * e ** (veh_cost * b)
 
         return repair_cost_per_mile
+
+    def calc_repair_cost_per_mile_arrays(self, veh_cost, pt_type, repair_type, age):
+        """
+
+        Args:
+            veh_cost: (array) The values of the vehicles when sold as new
+            pt_type: (array) The powertrain types (ICE, HEV, PHEV, BEV)
+            repair_type: (array) The vehicle repair types (car, suv, truck)
+            age: (array) The ages of the vehicles where age=0 is year 1 in operation.
+
+        Returns:
+            An array of repair costs per mile, one for each vehicle, consistent with ``calc_repair_cost_per_mile()``.
+
+        """
+        age = np.asarray(age)
+        veh_type_multiplier = np.array([self._data[f'{t}_multiplier']['value'] for t in repair_type], dtype=float)
+        pt_multiplier = np.array([self._data[f'{t}_multiplier']['value'] for t in pt_type], dtype=float)
+
+        a_values = np.array([self._data[f'a_value_{a}']['value'] for a in range(5)])
+        a_value = np.where(
+            age <= 4,
+            a_values[np.clip(age, 0, 4)],
+            self._data['a_value_4']['value'] + self._data['a_value_add']['value'] * (age - 4)
+        )
+        b = self._data['b']['value']
+
+        repair_cost_per_mile = veh_type_multiplier * pt_multiplier * a_value * e ** (np.asarray(veh_cost) * b)
+
+        return repair_cost_per_mile
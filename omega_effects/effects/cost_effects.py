@@ -1,13 +1,15 @@
 """
 
-A series of functions to calculate costs associated with the policy. The calc_cost_effects function is called by the
-omega_effects module and other functions here are called from within the calc_cost_effects function.
+A series of functions to calculate costs associated with the policy. The calc_cost_effects_columnar function is called
+by the omega_effects module and other functions here are called from within the calc_cost_effects_columnar function.
+The calc_cost_effects function is the equivalent record-by-record calculation, retained for equivalence testing.
 
 ----
 
 **CODE**
 
 """
+import numpy as np
 import pandas as pd
 
 from omega_effects.effects.discounting import discount_model_year_values
@@ -50,7 +52,8 @@ def get_maintenance_cost(batch_settings, veh_type):
 
 def calc_cost_effects(batch_settings, session_settings, physical_effects_dict, context_fuel_cpm_dict):
     """
-    Calculate cost effects
+    Calculate cost effects record-by-record.  Reference implementation for ``calc_cost_effects_columnar()``, retained
+    for equivalence testing.
 
     Args:
         batch_settings: an instance of the BatchSettings class.
@@ -297,6 +300,222 @@ def calc_cost_effects(batch_settings, session_settings, physical_effects_dict, c
     return costs_dict
 
 
+def calc_cost_effects_columnar(batch_settings, session_settings, physical_effects_df, context_fuel_cpm_dict):
+    """
+    Calculate cost effects
+
+    Args:
+        batch_settings: an instance of the BatchSettings class.
+        session_settings: an instance of the SessionSettings class.
+        physical_effects_df: A DataFrame of physical effects for each vehicle in each analysis year.
+        context_fuel_cpm_dict: dictionary; the context session fuel costs per mile by vehicle_id and age.
+
+    Returns:
+        A DataFrame of cost effects for each vehicle in each analysis year, matching the DataFrame built from the
+        dictionary returned by ``calc_cost_effects()``.
+
+    Note:
+        Fuel prices, cost factors and vehicle prices are looked up once per calendar year, fuel, reg class or vehicle
+        and joined to the physical effects as arrays, so that all costs are calculated with vectorized expressions.
+
+    """
+    vehicle_attribute_list = [
+        'new_vehicle_mfr_cost_dollars',
+        'price_dollars',
+        'price_modification_dollars',
+        'battery_cost',
+        'bev',
+        'phev',
+        'hev',
+        'mhev',
+        'charge_depleting_range_mi',
+    ]
+    legacy_fleet_vehicle_id_start = batch_settings.legacy_fleet.legacy_fleet_vehicle_id_start
+
+    df = physical_effects_df
+    df = df.loc[df['onroad_direct_co2e_grams_per_mile'].values.astype(bool)
+                | df['onroad_direct_kwh_per_mile'].values.astype(bool)].reset_index(drop=True)
+
+    vehicle_id = df['vehicle_id'].values
+    calendar_year = df['calendar_year'].values
+    model_year = df['model_year'].values
+    age = df['age'].values
+    name = df['name']
+    in_use_fuel_id = df['in_use_fuel_id'].values
+    base_year_powertrain_type = df['base_year_powertrain_type'].values
+    vehicle_count = df['registered_count'].values
+    odometer = df['odometer'].values
+    vmt = df['vmt'].values
+    vmt_rebound = df['vmt_rebound'].values
+    vmt_liquid = df['vmt_liquid_fuel'].values
+    vmt_elec = df['vmt_electricity'].values
+    kwh = df['fuel_consumption_kWh'].values
+    gallons = df['fuel_consumption_gallons'].values
+    battery_kwh = df['battery_kwh'].values
+
+    # vehicle info once for each vehicle, legacy fleet prices are those of the vehicle's first calendar year
+    vehicle_info_dict = {}
+    first_rows = np.flatnonzero(~df['vehicle_id'].duplicated().values)
+    for row in first_rows:
+        if vehicle_id[row] < legacy_fleet_vehicle_id_start:
+            vehicle_info_dict[vehicle_id[row]] = \
+                session_settings.vehicles.get_vehicle_attributes(vehicle_id[row], *vehicle_attribute_list)
+        else:
+            price_data = batch_settings.legacy_fleet.get_legacy_fleet_price(vehicle_id[row], calendar_year[row])
+            powertrain_type = base_year_powertrain_type[row]
+            vehicle_info_dict[vehicle_id[row]] = [
+                price_data, price_data, price_data, 0,
+                int(powertrain_type == 'BEV'),
+                int(powertrain_type == 'PHEV'),
+                int(powertrain_type == 'HEV'),
+                int(powertrain_type == 'MHEV'),
+                300 if powertrain_type == 'BEV' else 0,
+            ]
+    vehicle_info_df = \
+        pd.DataFrame.from_dict(vehicle_info_dict, orient='index', columns=vehicle_attribute_list).astype(float)
+    vehicle_info_df = vehicle_info_df.loc[vehicle_id]
+
+    avg_mfr_cost = vehicle_info_df['new_vehicle_mfr_cost_dollars'].values
+    avg_purchase_price = vehicle_info_df['price_dollars'].values
+    avg_purchase_credit = vehicle_info_df['price_modification_dollars'].values
+    battery_cost = vehicle_info_df['battery_cost'].values
+    bev_flag = vehicle_info_df['bev'].values == 1
+    phev_flag = vehicle_info_df['phev'].values == 1
+    hev_flag = (vehicle_info_df['hev'].values == 1) | (vehicle_info_df['mhev'].values == 1)
+    charge_depleting_range = vehicle_info_df['charge_depleting_range_mi'].values
+
+    # tech costs, only for age=0
+    new_vehicle = age == 0
+    mfr_cost_dollars = np.where(new_vehicle, vehicle_count * avg_mfr_cost, 0)
+    purchase_price_dollars = np.where(new_vehicle, vehicle_count * avg_purchase_price, 0)
+    purchase_credit_dollars = np.where(new_vehicle, vehicle_count * avg_purchase_credit, 0)
+    battery_cost_dollars = np.where(new_vehicle, vehicle_count * battery_cost, 0)
+    battery_cost_dollars_per_kwh = np.zeros(len(df))
+    idx = np.flatnonzero(new_vehicle & (battery_kwh > 0))
+    battery_cost_dollars_per_kwh[idx] = battery_cost_dollars[idx] / battery_kwh[idx]
+    battery_credit_dollars = np.zeros(len(df))
+    for idx in np.flatnonzero(new_vehicle & bev_flag):
+        battery_credit_dollars[idx] = \
+            session_settings.powertrain_cost.get_battery_tax_offset(model_year[idx], battery_kwh[idx])
+
+    # fuel costs
+    fuel_retail_cost_dollars = np.zeros(len(df))
+    fuel_pretax_cost_dollars = np.zeros(len(df))
+    calendar_years = pd.unique(calendar_year)
+    for fuel_id in pd.unique(in_use_fuel_id):
+        fuel_id_mask = in_use_fuel_id == fuel_id
+        for fuel, fuel_share in eval(fuel_id).items():
+            retail_price = pd.Series(
+                {cy: batch_settings.context_fuel_prices.get_fuel_prices(
+                    batch_settings, cy, 'retail_dollars_per_unit', fuel) for cy in calendar_years})
+            pretax_price = pd.Series(
+                {cy: batch_settings.context_fuel_prices.get_fuel_prices(
+                    batch_settings, cy, 'pretax_dollars_per_unit', fuel) for cy in calendar_years})
+            if 'electricity' in fuel:
+                quantity = kwh
+            else:
+                quantity = gallons
+            idx = np.flatnonzero(fuel_id_mask & quantity.astype(bool))
+            fuel_retail_cost_dollars[idx] += retail_price.loc[calendar_year[idx]].values * quantity[idx]
+            fuel_pretax_cost_dollars[idx] += pretax_price.loc[calendar_year[idx]].values * quantity[idx]
+
+    # maintenance costs
+    powertrain_type = np.select([bev_flag, phev_flag, hev_flag], ['BEV', 'PHEV', 'HEV'], 'ICE')
+    slope, intercept = np.zeros(len(df)), np.zeros(len(df))
+    for pt in pd.unique(powertrain_type):
+        idx = np.flatnonzero(powertrain_type == pt)
+        slope[idx], intercept[idx] = get_maintenance_cost(batch_settings, pt)
+    maintenance_cost_per_mile = slope * odometer + intercept
+    maintenance_cost_dollars = maintenance_cost_per_mile * vmt
+
+    # repair costs
+    operating_veh_type = np.select(
+        [name.str.contains('car', regex=False).values, name.str.contains('Pickup', regex=False).values],
+        ['car', 'truck'], 'suv')
+
+    repair_cost_per_mile = batch_settings.repair_cost.calc_repair_cost_per_mile_arrays(
+        avg_mfr_cost.astype(float), powertrain_type, operating_veh_type, age)
+    repair_cost_dollars = repair_cost_per_mile * vmt
+
+    # refueling costs
+    refueling_cost_dollars = np.zeros(len(df))
+    for veh_type, bev_range in dict.fromkeys(zip(operating_veh_type[bev_flag], charge_depleting_range[bev_flag])):
+        idx = np.flatnonzero(bev_flag & (operating_veh_type == veh_type) & (charge_depleting_range == bev_range))
+        refueling_cost_dollars[idx] \
+            = batch_settings.refueling_cost.calc_bev_refueling_cost_per_mile(veh_type, bev_range) * vmt[idx]
+    for veh_type in pd.unique(operating_veh_type[~bev_flag]):
+        idx = np.flatnonzero(~bev_flag & (operating_veh_type == veh_type))
+        refueling_cost_dollars[idx] \
+            = batch_settings.refueling_cost.calc_liquid_refueling_cost_per_gallon(veh_type) * gallons[idx]
+
+    # congestion and noise costs (maybe congestion and noise cost factors will differ one day?)
+    congestion_cf, noise_cf = np.zeros(len(df)), np.zeros(len(df))
+    for base_year_reg_class_id in df['base_year_reg_class_id'].unique():
+        idx = np.flatnonzero(df['base_year_reg_class_id'].values == base_year_reg_class_id)
+        congestion_cf[idx], noise_cf[idx] = get_congestion_noise_cf(batch_settings, base_year_reg_class_id)
+
+    congestion_cost_dollars = np.zeros(len(df))
+    noise_cost_dollars = np.zeros(len(df))
+    for vmt_fuel in (vmt_elec, vmt_liquid):
+        idx = np.flatnonzero(vmt_fuel.astype(bool))
+        congestion_cost_dollars[idx] += vmt_fuel[idx] * congestion_cf[idx]
+        noise_cost_dollars[idx] += vmt_fuel[idx] * noise_cf[idx]
+
+    # calc drive value relative to the context as value of rebound vmt plus the drive surplus
+    fuel_cpm = fuel_retail_cost_dollars / vmt
+    context_fuel_cpm_dict_keys = \
+        list(zip(df['base_year_vehicle_id'].astype(int), base_year_powertrain_type, model_year.astype(int), age))
+    drive_value_cost_dollars = np.zeros(len(df))
+    idx = np.array([k in context_fuel_cpm_dict for k in context_fuel_cpm_dict_keys], dtype=bool)
+    context_fuel_cpm = np.array([context_fuel_cpm_dict[k]['fuel_cost_per_mile']
+                                 for k, found in zip(context_fuel_cpm_dict_keys, idx) if found], dtype=float)
+    drive_value_cost_dollars[idx] = 0.5 * vmt_rebound[idx] * (fuel_cpm[idx] + context_fuel_cpm)
+
+    return pd.DataFrame({
+        'session_policy': session_settings.session_policy,
+        'session_name': session_settings.session_name,
+        'discount_rate': 0,
+        'vehicle_id': vehicle_id,
+        'base_year_vehicle_id': df['base_year_vehicle_id'].values.astype(int),
+        'manufacturer_id': df['manufacturer_id'].values,
+        'name': name.values,
+        'calendar_year': calendar_year,
+        'model_year': model_year.astype(int),
+        'age': age,
+        'base_year_reg_class_id': df['base_year_reg_class_id'].values,
+        'reg_class_id': df['reg_class_id'].values,
+        'in_use_fuel_id': in_use_fuel_id,
+        'fueling_class': df['fueling_class'].values,
+        'base_year_powertrain_type': base_year_powertrain_type,
+        'powertrain_type': powertrain_type,
+        'body_style': df['body_style'].values,
+        'footprint_ft2': df['footprint_ft2'].values,
+        'workfactor': df['workfactor'].values,
+        'registered_count': vehicle_count,
+        'annual_vmt': df['annual_vmt'].values,
+        'odometer': odometer,
+        'vmt': vmt,
+        'vmt_liquid_fuel': vmt_liquid,
+        'vmt_electricity': vmt_elec,
+        'battery_kwh': battery_kwh,
+        'vehicle_cost_dollars': mfr_cost_dollars,
+        'battery_cost_dollars': battery_cost_dollars,
+        'battery_cost_per_kWh': battery_cost_dollars_per_kwh,
+        'battery_credit_dollars': battery_credit_dollars,
+        'purchase_price_dollars': purchase_price_dollars,
+        'purchase_credit_dollars': purchase_credit_dollars,
+        'fuel_retail_cost_dollars': fuel_retail_cost_dollars,
+        'fuel_pretax_cost_dollars': fuel_pretax_cost_dollars,
+        'fuel_taxes_cost_dollars': fuel_retail_cost_dollars - fuel_pretax_cost_dollars,
+        'congestion_cost_dollars': congestion_cost_dollars,
+        'noise_cost_dollars': noise_cost_dollars,
+        'maintenance_cost_dollars': maintenance_cost_dollars,
+        'repair_cost_dollars': repair_cost_dollars,
+        'refueling_cost_dollars': refueling_cost_dollars,
+        'drive_value_cost_dollars': drive_value_cost_dollars,
+    })
+
+
 def calc_annual_cost_effects(input_df):
     """
 
@@ -420,3 +639,152 @@ def calc_period_consumer_view(batch_settings, input_df):
         return_df = pd.concat([return_df, s], axis=1)
 
     return return_df
+
+
+if __name__ == '__main__':
+    try:
+        # columnar equivalence test, columnar cost effects versus record-by-record reference implementation
+        import tempfile
+        from pathlib import Path
+        from types import SimpleNamespace
+
+        from omega_effects.general.effects_log import EffectsLog
+        from omega_effects.context.ip_deflators import ImplicitPriceDeflators
+        from omega_effects.context.fuel_prices import FuelPrice
+        from omega_effects.context.maintenance_cost import MaintenanceCost
+        from omega_effects.context.repair_cost import RepairCost
+        from omega_effects.context.refueling_cost import RefuelingCost
+        from omega_effects.context.powertrain_cost import PowertrainCost
+        from omega_effects.effects.cost_factors_congestion_noise import CostFactorsCongestionNoise
+
+        test_inputs = Path(__file__).parents[2] / 'omega_model' / 'test_inputs'
+
+        test_log = EffectsLog()
+        test_log.init_logfile(Path(tempfile.mkdtemp()))
+
+        legacy_fleet_vehicle_id_start = 1000
+
+        def get_legacy_fleet_price(vehicle_id, calendar_year):
+            return 20000 + 100 * (calendar_year - 2000) + vehicle_id
+
+        test_batch = SimpleNamespace(context_name='AEO2021', context_case='Reference case',
+                                     analysis_dollar_basis=2020, ip_deflators=ImplicitPriceDeflators(),
+                                     context_fuel_prices=FuelPrice(), maintenance_cost=MaintenanceCost(),
+                                     repair_cost=RepairCost(), refueling_cost=RefuelingCost(),
+                                     congestion_noise_cost_factors=CostFactorsCongestionNoise(),
+                                     legacy_fleet=SimpleNamespace(
+                                         legacy_fleet_vehicle_id_start=legacy_fleet_vehicle_id_start,
+                                         get_legacy_fleet_price=get_legacy_fleet_price))
+        test_batch.ip_deflators.init_from_file(test_inputs / 'implicit_price_deflators.csv', test_log)
+        test_batch.context_fuel_prices.init_from_file(test_inputs / 'context_fuel_prices.csv', test_batch, test_log)
+        test_batch.maintenance_cost.init_from_file(test_inputs / 'maintenance_cost.csv', test_batch, test_log)
+        test_batch.repair_cost.init_from_file(test_inputs / 'repair_cost.csv', test_log)
+        test_batch.refueling_cost.init_from_file(test_inputs / 'refueling_cost.csv', test_batch, test_log)
+        test_batch.congestion_noise_cost_factors.init_from_file(
+            test_inputs / 'cost_factors_congestion_noise.csv', test_batch, test_log)
+
+        rng = np.random.default_rng(0)
+
+        # sample of analysis fleet vehicles and legacy fleet vehicles, in calendar year order like the physical effects
+        test_vehicles = dict()
+        physical_effects = []
+        sample = [(vehicle_id, model_year, reg_class_id, powertrain_type)
+                  for vehicle_id, (model_year, reg_class_id, powertrain_type) in enumerate(
+                  [(model_year, reg_class_id, powertrain_type)
+                   for model_year in range(2022, 2027, 2)
+                   for reg_class_id in ['car', 'truck']
+                   for powertrain_type in ['ICE', 'HEV', 'MHEV', 'PHEV', 'BEV']])]
+        sample += [(legacy_fleet_vehicle_id_start + vehicle_id, model_year, reg_class_id, powertrain_type)
+                   for vehicle_id, (model_year, reg_class_id, powertrain_type) in enumerate(
+                   [(model_year, reg_class_id, powertrain_type)
+                    for model_year in range(2012, 2022, 3)
+                    for reg_class_id in ['car', 'truck']
+                    for powertrain_type in ['ICE', 'HEV', 'BEV']])]
+        for calendar_year in range(2022, 2031):
+            for vehicle_id, model_year, reg_class_id, powertrain_type in sample:
+                if calendar_year < model_year:
+                    continue
+                legacy = vehicle_id >= legacy_fleet_vehicle_id_start
+                if powertrain_type == 'BEV':
+                    in_use_fuel_id = "{'US electricity':1.0}"
+                elif powertrain_type == 'PHEV':
+                    in_use_fuel_id = "{'pump gasoline':0.4, 'US electricity':0.6}"
+                else:
+                    in_use_fuel_id = "{'pump gasoline':1.0}"
+                if vehicle_id not in test_vehicles:
+                    test_vehicles[vehicle_id] = {
+                        'new_vehicle_mfr_cost_dollars': 20000 + 20000 * rng.random(),
+                        'price_dollars': 25000 + 20000 * rng.random(),
+                        'price_modification_dollars': -1000 * rng.random(),
+                        'battery_cost': 0 if powertrain_type == 'ICE' else 10000 * rng.random(),
+                        'bev': int(powertrain_type == 'BEV'), 'phev': int(powertrain_type == 'PHEV'),
+                        'hev': int(powertrain_type == 'HEV'), 'mhev': int(powertrain_type == 'MHEV'),
+                        'charge_depleting_range_mi': {'BEV': 300, 'PHEV': 40}.get(powertrain_type, 0),
+                        'battery_kwh': {'BEV': 80, 'PHEV': 20, 'ICE': 0}.get(powertrain_type, 1),
+                    }
+                vehicle = test_vehicles[vehicle_id]
+                vmt = 1e9 * rng.random()
+                electric_share = eval(in_use_fuel_id).get('US electricity', 0)
+                physical_effects.append({
+                    'vehicle_id': vehicle_id, 'calendar_year': calendar_year, 'age': calendar_year - model_year,
+                    'base_year_vehicle_id': vehicle_id % 7, 'model_year': model_year,
+                    'manufacturer_id': 'legacy_fleet' if legacy else 'consolidated_OEM',
+                    'name': '%s %s' % ({'car': 'car', 'truck': 'Pickup' if vehicle_id % 2 else 'SUV'}[reg_class_id],
+                                       powertrain_type),
+                    'base_year_reg_class_id': reg_class_id, 'reg_class_id': reg_class_id,
+                    'in_use_fuel_id': in_use_fuel_id, 'market_class_id': 'non_hauling.%s' % powertrain_type,
+                    'fueling_class': 'BEV' if powertrain_type == 'BEV' else 'ICE',
+                    'base_year_powertrain_type': powertrain_type, 'body_style': 'sedan',
+                    'footprint_ft2': 40 + 15 * rng.random(), 'workfactor': 0,
+                    'battery_kwh': vehicle['battery_kwh'] * (calendar_year == model_year),
+                    'onroad_direct_co2e_grams_per_mile': 0 if powertrain_type == 'BEV' else 200 * rng.random(),
+                    'onroad_direct_kwh_per_mile': 0.3 * rng.random() if electric_share else 0,
+                    'registered_count': 1e5 * rng.random(), 'annual_vmt': 1e4 * rng.random(),
+                    'odometer': 1e5 * rng.random(), 'vmt': vmt, 'vmt_rebound': 0.01 * vmt,
+                    'vmt_liquid_fuel': vmt * (1 - electric_share), 'vmt_electricity': vmt * electric_share,
+                    'fuel_consumption_kWh': 0.3 * vmt * electric_share,
+                    'fuel_consumption_gallons': vmt * (1 - electric_share) / 30,
+                    'barrels_of_imported_oil': rng.random(),
+                })
+        physical_effects_df = pd.DataFrame(physical_effects)
+        # vehicles without onroad energy consumption are skipped
+        physical_effects_df.loc[::17, ['onroad_direct_co2e_grams_per_mile', 'onroad_direct_kwh_per_mile']] = 0
+
+        test_context_fuel_cpm_dict = {
+            (v['base_year_vehicle_id'], v['base_year_powertrain_type'], v['model_year'], v['age']):
+                {'fuel_cost_per_mile': 0.1 * rng.random()}
+            for v in physical_effects[::3]}
+
+        def get_vehicle_attributes(vehicle_id, *attribute_names):
+            return [test_vehicles[vehicle_id][attribute_name] for attribute_name in attribute_names]
+
+        test_session = SimpleNamespace(session_policy='action_a', session_name='action_a',
+                                       vehicles=SimpleNamespace(get_vehicle_attributes=get_vehicle_attributes),
+                                       powertrain_cost=PowertrainCost())
+        test_session.powertrain_cost.init_from_file(test_inputs / 'powertrain_cost.csv', test_log)
+
+        physical_effects_dict = {(v['vehicle_id'], v['calendar_year']): v
+                                 for v in physical_effects_df.to_dict(orient='records')}
+        record_by_record_df = pd.DataFrame.from_dict(
+            calc_cost_effects(test_batch, test_session, physical_effects_dict, test_context_fuel_cpm_dict),
+            orient='index').reset_index(drop=True)
+        columnar_df = calc_cost_effects_columnar(test_batch, test_session, physical_effects_df,
+                                                 test_context_fuel_cpm_dict)
+
+        assert list(columnar_df.columns) == list(record_by_record_df.columns)
+        assert len(columnar_df) == len(record_by_record_df)
+        for column in columnar_df.columns:
+            columnar_values, record_values = columnar_df[column], record_by_record_df[column]
+            if columnar_values.dtype.kind in 'biuf' and record_values.dtype.kind in 'biuf':
+                assert np.allclose(columnar_values.to_numpy(dtype=float), record_values.to_numpy(dtype=float),
+                                   rtol=1e-12, atol=0, equal_nan=True), column
+            else:
+                assert (columnar_values.astype(str) == record_values.astype(str)).all(), column
+
+        print('calc_cost_effects_columnar() test passed, %d rows' % len(columnar_df))
+
+    except:
+        import os
+        import traceback
+        print("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
+        os._exit(-1)
@@ -2,11 +2,17 @@
 
 **OMEGA effects discounting module.**
 
+The ``Discounting`` methods with the ``_columnar`` suffix are called by the omega_effects module, they build the same
+annual, present and annualized values as the equivalent record-by-record methods, but as DataFrames, by applying
+discount and annualization factor matrices (by calendar year or period and discount rate) to all monetized columns at
+once.
+
 ----
 
 **CODE**
 
 """
+import numpy as np
 import pandas as pd
 
 
@@ -25,6 +31,10 @@ class Discounting:
         self.pv_dict = {}
         self.eav_dict = {}
 
+        self.annual_values_df = None
+        self.pv_df = None
+        self.eav_df = None
+
         self.all_monetized_args = []
         self.monetized_non_emission_args = []
         self.rate_list_dict = {}
@@ -56,32 +66,11 @@ class Discounting:
         discount_to_year = batch_settings.discount_values_to_year
         cost_accrual = batch_settings.cost_accrual
 
-        emission_dr25 = '2.5'
-        emission_dr3 = '3.'
-        emission_dr5 = '5.0'
-        emission_dr7 = '7.0'
-
         # establish and distinguish attributes
         nested_dict = [n_dict for n_dict in dict_of_values.values()][0]
-        self.all_monetized_args = [k for k, v in nested_dict.items() if '_dollars' in k and 'avg' not in k]
-        monetized_args_dr25 = [arg for arg in self.all_monetized_args if f'_{emission_dr25}' in arg]
-        monetized_args_dr3 = [arg for arg in self.all_monetized_args if f'_{emission_dr3}' in arg]
-        monetized_args_dr5 = [arg for arg in self.all_monetized_args if f'_{emission_dr5}' in arg]
-        monetized_args_dr7 = [arg for arg in self.all_monetized_args if f'_{emission_dr7}' in arg]
-        self.monetized_non_emission_args = [arg for arg in self.all_monetized_args
-                                       if arg not in monetized_args_dr25
-                                       and arg not in monetized_args_dr3
-                                       and arg not in monetized_args_dr5
-                                       and arg not in monetized_args_dr7]
+        self.set_monetized_args(nested_dict)
         id_args = [k for k, v in nested_dict.items() if '_dollars' not in k]
 
-        self.rate_list_dict = {
-            0.025: monetized_args_dr25,
-            0.03: monetized_args_dr3,
-            0.05: monetized_args_dr5,
-            0.07: monetized_args_dr7,
-        }
-
         update_dict = {}
         for v in dict_of_values.values():
 
@@ -117,6 +106,176 @@ class Discounting:
 
         self.annual_values_dict = dict_of_values.copy()
 
+    def set_monetized_args(self, args):
+        """
+        Determine the monetized attributes and the discount rate of the monetized emission attributes.
+
+        Parameters:
+            args: the attribute names, e.g. DataFrame columns.
+
+        Returns:
+            Nothing, but sets ``all_monetized_args``, ``monetized_non_emission_args`` and ``rate_list_dict``.
+
+        """
+        emission_dr25 = '2.5'
+        emission_dr3 = '3.'
+        emission_dr5 = '5.0'
+        emission_dr7 = '7.0'
+
+        self.all_monetized_args = [k for k in args if '_dollars' in k and 'avg' not in k]
+        monetized_args_dr25 = [arg for arg in self.all_monetized_args if f'_{emission_dr25}' in arg]
+        monetized_args_dr3 = [arg for arg in self.all_monetized_args if f'_{emission_dr3}' in arg]
+        monetized_args_dr5 = [arg for arg in self.all_monetized_args if f'_{emission_dr5}' in arg]
+        monetized_args_dr7 = [arg for arg in self.all_monetized_args if f'_{emission_dr7}' in arg]
+        self.monetized_non_emission_args = [arg for arg in self.all_monetized_args
+                                            if arg not in monetized_args_dr25
+                                            and arg not in monetized_args_dr3
+                                            and arg not in monetized_args_dr5
+                                            and arg not in monetized_args_dr7]
+
+        self.rate_list_dict = {
+            0.025: monetized_args_dr25,
+            0.03: monetized_args_dr3,
+            0.05: monetized_args_dr5,
+            0.07: monetized_args_dr7,
+        }
+
+    def get_monetized_arg_rates(self):
+        """
+        Get the discount rate of each monetized attribute, the last matching emission discount rate for monetized
+        emission attributes, as in ``discount_annual_values()``.
+
+        Returns:
+            A dictionary of discount rates by monetized attribute name, ``None`` for non-emission attributes which are
+            discounted at the social discount rate.
+
+        """
+        arg_rates = dict.fromkeys(self.all_monetized_args)
+        for emission_discrate, arg_list in self.rate_list_dict.items():
+            arg_rates.update(dict.fromkeys(arg_list, emission_discrate))
+
+        return arg_rates
+
+    def discount_annual_values_columnar(self, batch_settings, annual_values_df):
+        """
+        Columnar version of ``discount_annual_values()``.
+
+        Parameters:
+            batch_settings: an instance of the omega effects batch settings class.
+            annual_values_df: A DataFrame of values to be discounted.
+
+        Returns:
+            Nothing, but sets ``annual_values_df``, a DataFrame of the annual values followed by the discounted annual
+            values at each social discount rate, rows in the same order as ``annual_values_dict``.
+
+        """
+        discount_to_year = batch_settings.discount_values_to_year
+        cost_accrual = batch_settings.cost_accrual
+
+        self.set_monetized_args(annual_values_df.columns)
+        arg_rates = self.get_monetized_arg_rates()
+
+        df = drop_duplicate_keys(annual_values_df,
+                                 ['session_policy', 'calendar_year', 'reg_class_id', 'in_use_fuel_id'])
+
+        rates = list(dict.fromkeys([*self.social_discrates, *self.rate_list_dict]))
+        years = np.unique(df['calendar_year'].values)
+        discount_factors = calc_discount_factors(years, rates, discount_to_year, cost_accrual)
+
+        year_index = np.searchsorted(years, df['calendar_year'].values)
+        values = df[self.all_monetized_args].to_numpy(dtype=float)
+
+        discounted_dfs = []
+        for social_discrate in self.social_discrates:
+            arg_rate_index = [rates.index(social_discrate if rate is None else rate) for rate in arg_rates.values()]
+            discounted_df = df.copy()
+            discounted_df['discount_rate'] = social_discrate
+            discounted_df[self.all_monetized_args] = \
+                values / discount_factors[year_index[:, np.newaxis], np.array(arg_rate_index)[np.newaxis, :]]
+            discounted_dfs.append(discounted_df)
+
+        discounted_df = interleave_rows(discounted_dfs)
+        discounted_df[[c for c in df.columns if '_dollars' in c and 'avg' in c]] = np.nan
+
+        self.annual_values_df = pd.concat([annual_values_df, discounted_df], axis=0, ignore_index=True)
+
+    def calc_present_values_columnar(self, batch_settings):
+        """
+        Columnar version of ``calc_present_values()``, present values are the cumulative sum of the discounted annual
+        values by session_policy, reg_class_id, in_use_fuel_id and discount_rate, starting from the "Discount Values to
+        Year".
+
+        Args:
+            batch_settings: an instance of the BatchSettings class.
+
+        Returns:
+            Nothing, but sets ``pv_df``, a DataFrame of present values, rows in the same order as ``pv_dict``.
+
+        """
+        discount_to_year = batch_settings.discount_values_to_year
+
+        df = self.annual_values_df
+        df = drop_duplicate_keys(df.loc[df['discount_rate'].values != 0],
+                                 ['session_policy', 'calendar_year', 'reg_class_id', 'in_use_fuel_id', 'discount_rate'])
+
+        group_index = df.groupby(['session_policy', 'reg_class_id', 'in_use_fuel_id', 'discount_rate'],
+                                 sort=False, dropna=False).ngroup().values
+        year_index = df['calendar_year'].values - df['calendar_year'].min()
+
+        # a group by calendar year by monetized attribute table, accumulated along the calendar years after the
+        # discount to year
+        values_table = np.zeros((group_index.max() + 1, year_index.max() + 1, len(self.all_monetized_args)))
+        values_table[group_index, year_index] = df[self.all_monetized_args].to_numpy(dtype=float)
+        first_year_index = min(max(0, discount_to_year - df['calendar_year'].min()), year_index.max())
+        values_table[:, first_year_index:] = np.cumsum(values_table[:, first_year_index:], axis=1)
+
+        self.pv_df = df.reset_index(drop=True)
+        self.pv_df[self.all_monetized_args] = values_table[group_index, year_index]
+        self.pv_df['series'] = 'PresentValue'
+
+    def calc_annualized_values_columnar(self, batch_settings):
+        """
+        Columnar version of ``calc_annualized_values()``.
+
+        Args:
+            batch_settings: an instance of the BatchSettings class.
+
+        Returns:
+            Nothing, but sets ``eav_df``, a DataFrame of equivalent annualized values, rows in the same order as
+            ``eav_dict``.
+
+        """
+        discount_to_year = batch_settings.discount_values_to_year
+        cost_accrual = batch_settings.cost_accrual
+        offset_list = ['start-of-year', 'end-of-year']
+        offset = offset_list.index(cost_accrual)
+
+        arg_rates = self.get_monetized_arg_rates()
+
+        self.eav_df = self.pv_df.copy()
+        self.eav_df['series'] = 'AnnualizedValue'
+
+        periods = self.eav_df['calendar_year'].values - discount_to_year + offset
+        rows = np.flatnonzero(periods >= 1)
+        if len(rows) == 0:
+            return
+
+        discount_rate = self.eav_df['discount_rate'].values[rows]
+        rates = list(dict.fromkeys([*pd.unique(discount_rate), *self.rate_list_dict]))
+        unique_periods = np.unique(periods[rows])
+        growth_factors, annuity_divisors = calc_annualization_factors(unique_periods, rates, cost_accrual)
+
+        period_index = np.searchsorted(unique_periods, periods[rows])[:, np.newaxis]
+        row_rate_index = np.array([rates.index(rate) for rate in discount_rate])[:, np.newaxis]
+        rate_index = np.where(np.array([rate is None for rate in arg_rates.values()])[np.newaxis, :], row_rate_index,
+                              np.array([0 if rate is None else rates.index(rate) for rate in arg_rates.values()]))
+        rate_values = np.array(rates)[rate_index]
+
+        values = self.eav_df[self.all_monetized_args].to_numpy(dtype=float, copy=True)
+        values[rows] = values[rows] * rate_values * growth_factors[period_index, rate_index] \
+            / annuity_divisors[period_index, rate_index]
+        self.eav_df[self.all_monetized_args] = values
+
     def calc_present_values(self, batch_settings):
         """
 
@@ -247,6 +406,93 @@ def discount_model_year_values(model_year_df):
     return pd.DataFrame.from_dict(discounted_my_dict, orient='index')
 
 
+def drop_duplicate_keys(df, key_args):
+    """
+    Drop the rows with duplicate keys the way a dictionary keyed by the key attributes would, keeping the last row of
+    each key at the position of the first.
+
+    Parameters:
+        df: a DataFrame.
+        key_args: the names of the key attributes.
+
+    Returns:
+        The DataFrame without rows with duplicate keys.
+
+    """
+    keys = df[key_args]
+    if not keys.duplicated().any():
+        return df
+
+    key_index = keys.groupby(key_args, sort=False, dropna=False).ngroup().values
+    rows = np.flatnonzero(~keys.duplicated(keep='last').values)
+
+    return df.iloc[rows[np.argsort(key_index[rows], kind='stable')]]
+
+
+def interleave_rows(dfs):
+    """
+    Interleave the rows of DataFrames of equal length, the first row of each DataFrame, then the second, etc.
+
+    Parameters:
+        dfs: a list of DataFrames.
+
+    Returns:
+        A DataFrame of the interleaved rows.
+
+    """
+    df = pd.concat(dfs, axis=0, ignore_index=True)
+
+    return df.iloc[np.arange(len(df)).reshape(len(dfs), -1).T.ravel()].reset_index(drop=True)
+
+
+def calc_discount_factors(years, rates, discount_to, cost_accrual):
+    """
+
+    Parameters:
+        years: the calendar years.
+        rates: the discount rates.
+        discount_to (int): the calendar year to which to discount values.
+        cost_accrual (str): set via the general_inputs file to indicate whether costs occur at the start or end of
+        the year.
+
+    Returns:
+        A calendar year by discount rate array of the factors by which ``discount_value()`` divides values.
+
+    """
+    # no discounting of values that occur prior to "discount_to_year"; exponent controls for that
+    if 'start' in cost_accrual:
+        exponents = [max(0, int(year) - discount_to) for year in years]
+    else:
+        exponents = [max(0, int(year) - discount_to + 1) for year in years]
+
+    return np.array([[(1 + rate) ** exponent for rate in rates] for exponent in exponents])
+
+
+def calc_annualization_factors(periods, rates, cost_accrual):
+    """
+
+    Parameters:
+        periods: the numbers of periods over which to annualize.
+        rates: the discount rates.
+        cost_accrual (str): set via the general_inputs file to indicate whether costs occur at the start or end of
+        the year.
+
+    Returns:
+        Period by discount rate arrays of the growth factors and divisors of ``annualize_value()``, i.e. the
+        annualized value is ``present_value * rate * growth_factor / divisor``.
+
+    """
+    if 'start' in cost_accrual:
+        divisor_periods = [int(period) + 1 for period in periods]
+    else:
+        divisor_periods = [int(period) for period in periods]
+
+    growth_factors = np.array([[(1 + rate) ** int(period) for rate in rates] for period in periods])
+    annuity_divisors = np.array([[(1 + rate) ** period - 1 for rate in rates] for period in divisor_periods])
+
+    return growth_factors, annuity_divisors
+
+
 def discount_value(arg_value, rate, year, discount_to, cost_accrual):
     """
 
@@ -308,3 +554,66 @@ def set_fueling_class(fuel_id):
         return 'BEV'
     else:
         return 'ICE'
+
+
+if __name__ == '__main__':
+    try:
+        # columnar equivalence test, columnar methods versus record-by-record methods
+        from types import SimpleNamespace
+
+        rng = np.random.default_rng(0)
+
+        test_values_df = pd.DataFrame([
+            {'session_policy': session_policy, 'session_name': session_policy, 'discount_rate': 0,
+             'calendar_year': calendar_year, 'series': 'AnnualValue', 'reg_class_id': reg_class_id,
+             'in_use_fuel_id': in_use_fuel_id, 'registered_count': rng.random() * 1e6}
+            for session_policy in ['no_action', 'action_a']
+            for calendar_year in range(2022, 2051)
+            for reg_class_id in ['car', 'truck']
+            for in_use_fuel_id in ["{'pump gasoline':1.0}", "{'US electricity':1.0}"]])
+
+        for arg in ['vehicle_cost_dollars', 'fuel_retail_cost_dollars', 'avg_vehicle_price_dollars',
+                    'co2_global_2.5_dollars', 'co2_global_3.0_dollars', 'co2_global_5.0_dollars',
+                    'pm25_Wu_3.0_dollars', 'pm25_Wu_7.0_dollars']:
+            test_values_df[arg] = rng.random(len(test_values_df)) * 1e9
+
+        for cost_accrual in ['start-of-year', 'end-of-year']:
+            for discount_values_to_year in [2022, 2030, 2050]:
+                test_settings = SimpleNamespace(discount_values_to_year=discount_values_to_year,
+                                                cost_accrual=cost_accrual)
+
+                record_by_record = Discounting()
+                record_by_record.discount_annual_values(test_settings, test_values_df)
+                record_by_record.calc_present_values(test_settings)
+                record_by_record.calc_annualized_values(test_settings)
+                record_by_record_df = pd.DataFrame.from_dict(
+                    {**record_by_record.annual_values_dict, **record_by_record.pv_dict,
+                     **record_by_record.eav_dict}, orient='index').reset_index(drop=True)
+
+                columnar = Discounting()
+                columnar.discount_annual_values_columnar(test_settings, test_values_df)
+                columnar.calc_present_values_columnar(test_settings)
+                columnar.calc_annualized_values_columnar(test_settings)
+                columnar_df = pd.concat([columnar.annual_values_df, columnar.pv_df, columnar.eav_df],
+                                        axis=0, ignore_index=True)
+
+                assert list(columnar_df.columns) == list(record_by_record_df.columns)
+                assert columnar_df.shape == record_by_record_df.shape, \
+                    'shape mismatch, %s %d' % (cost_accrual, discount_values_to_year)
+                for column in columnar_df.columns:
+                    if column.endswith('_dollars') or column == 'discount_rate':
+                        assert np.allclose(columnar_df[column].to_numpy(dtype=float),
+                                           record_by_record_df[column].to_numpy(dtype=float),
+                                           rtol=1e-12, atol=0, equal_nan=True), \
+                            '%s mismatch, %s %d' % (column, cost_accrual, discount_values_to_year)
+                    else:
+                        assert (columnar_df[column].astype(str) == record_by_record_df[column].astype(str)).all(), \
+                            '%s mismatch, %s %d' % (column, cost_accrual, discount_values_to_year)
+
+        print('Discounting columnar equivalence test passed')
+
+    except:
+        import os
+        import traceback
+        print("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
+        os._exit(-1)
@@ -71,6 +71,9 @@ Data Column Name and Description
 **CODE**
 
 """
+from bisect import bisect_right
+
+import numpy as np
 
 from omega_effects.general.general_functions import read_input_file
 from omega_effects.general.input_validation import \
@@ -86,6 +89,7 @@ class EmissionRatesVehicles:
     """
     def __init__(self):
         self._data = dict()  # private dict, emission factors vehicles by model year, age, legacy reg class ID and in-use fuel ID
+        self._start_years = dict()  # sorted start years by sourcetype, legacy reg class ID, in-use fuel ID and rate name
         self._cache = dict()
         self.startyear_min = 0
 
@@ -135,10 +139,38 @@ class EmissionRatesVehicles:
 
         self._data = df.to_dict('index')
 
-        for rate_key in rate_keys:
+        for rate_key in self._data:
             rate_eq = self._data[rate_key]['equation']
             self._data[rate_key].update({'equation': compile(rate_eq, '<string>', 'eval')})
 
+            start_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name = rate_key
+            self._start_years.setdefault((sourcetype_name, reg_class_id, in_use_fuel_id, rate_name), list()).\
+                append(start_year)
+
+        for start_years in self._start_years.values():
+            start_years.sort()
+
+    def get_rate_key(self, model_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name):
+        """
+
+        Args:
+            model_year (int): vehicle model year for which to get emission factors
+            sourcetype_name (str): the MOVES sourcetype name (e.g., 'passenger car', 'light commercial truck')
+            reg_class_id (str): the regulatory class, e.g., 'car' or 'truck'
+            in_use_fuel_id (str): the liquid fuel ID, e.g., 'pump gasoline'
+            rate_name (str): name of emission rate to get
+
+        Returns:
+            The key of the rate equation applicable to the given model_year, i.e., the latest start_year not after the
+            model_year, or the earliest start_year if all are after the model_year.
+
+        """
+        start_years = self._start_years[(sourcetype_name, reg_class_id, in_use_fuel_id, rate_name)]
+        idx = bisect_right(start_years, model_year)
+        start_year = start_years[max(idx - 1, 0)]
+
+        return start_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name
+
     def get_emission_rate(self, model_year, sourcetype_name, reg_class_id, in_use_fuel_id, age, *rate_names):
         """
 
@@ -153,6 +185,10 @@ class EmissionRatesVehicles:
         Returns:
             A list of emission rates for the given type of vehicle of the given model_year and age.
 
+        Note:
+            Where the rate equation returns a negative rate, the rate at the prior age is used.  A negative rate at age 0
+            raises an Exception.
+
         """
         locals_dict = locals()
         rate = 0
@@ -167,37 +203,72 @@ class EmissionRatesVehicles:
             if cache_key in self._cache:
                 rate = self._cache[cache_key]
             else:
-                rate_keys = [
-                    k for k in self._data
-                    if k[0] <= model_year
-                       and k[1] == sourcetype_name
-                       and k[2] == reg_class_id
-                       and k[3] == in_use_fuel_id
-                       and k[4] == rate_name
-                ]
-                if not rate_keys:
-                    rate_keys = [
-                        k for k in self._data
-                        if k[1] == sourcetype_name
-                           and k[2] == reg_class_id
-                           and k[3] == in_use_fuel_id
-                           and k[4] == rate_name
-                    ]
-                    start_year = min([k[0] for k in rate_keys])
-                else:
-                    max_start_year = max([k[0] for k in rate_keys])
-                    start_year = min(model_year, max_start_year)
-
-                rate_key = start_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name
+                rate_key = self.get_rate_key(model_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name)
 
                 rate = eval(self._data[rate_key]['equation'], {}, locals_dict)
 
                 if rate < 0:
-                    temp_key = (model_year, sourcetype_name, reg_class_id, in_use_fuel_id, age - 1, rate_name)
-                    rate = self._cache[temp_key]
+                    if age <= 0:
+                        raise Exception('Negative %s emission rate for %s, %s, %s, model year %d, at age %d' %
+                                        (rate_name, sourcetype_name, reg_class_id, in_use_fuel_id, model_year, age))
+                    rate = self.get_emission_rate(
+                        model_year, sourcetype_name, reg_class_id, in_use_fuel_id, age - 1, rate_name)[0]
 
                 self._cache[cache_key] = rate
 
             return_rates.append(rate)
 
         return return_rates
+
+    def get_emission_rate_arrays(self, model_year, sourcetype_name, reg_class_id, in_use_fuel_id, age, *rate_names):
+        """
+
+        Args:
+            model_year (int): vehicle model year for which to get emission factors
+            sourcetype_name (str): the MOVES sourcetype name (e.g., 'passenger car', 'light commercial truck')
+            reg_class_id (str): the regulatory class, e.g., 'car' or 'truck'
+            in_use_fuel_id (str): the liquid fuel ID, e.g., 'pump gasoline'
+            age: array of vehicle ages in years
+            rate_names: name of emission rate(s) to get
+
+        Returns:
+            A list of emission rate arrays, one array per rate name with one rate per age, for the given type of
+            vehicle of the given model_year.
+
+        Note:
+            Each rate equation is evaluated once over the whole age array.  Where the equation returns a negative
+            rate, the rate at the prior age is used, consistent with ``get_emission_rate()``.  A negative rate at age 0
+            raises an Exception.
+
+        """
+        ages = np.asarray(age)
+        return_rates = list()
+
+        if model_year < self.startyear_min:
+            model_year = self.startyear_min
+
+        for rate_name in rate_names:
+            rate_key = self.get_rate_key(model_year, sourcetype_name, reg_class_id, in_use_fuel_id, rate_name)
+
+            locals_dict = {
+                'self': self,
+                'model_year': model_year,
+                'sourcetype_name': sourcetype_name,
+                'reg_class_id': reg_class_id,
+                'in_use_fuel_id': in_use_fuel_id,
+                'age': ages,
+                'rate_names': rate_names,
+            }
+            rates = np.array(np.broadcast_to(eval(self._data[rate_key]['equation'], {}, locals_dict), ages.shape),
+                             dtype=float)
+
+            for idx in np.flatnonzero(rates < 0):
+                if ages[idx] <= 0:
+                    raise Exception('Negative %s emission rate for %s, %s, %s, model year %d, at age %d' %
+                                    (rate_name, sourcetype_name, reg_class_id, in_use_fuel_id, model_year, ages[idx]))
+                rates[idx] = self.get_emission_rate(
+                    model_year, sourcetype_name, reg_class_id, in_use_fuel_id, ages[idx] - 1, rate_name)[0]
+
+            return_rates.append(rates)
+
+        return return_rates
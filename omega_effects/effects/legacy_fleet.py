@@ -81,7 +81,13 @@ Data Column Name and Description
 **CODE**
 
 """
+import hashlib
+
+import numpy as np
+import pandas as pd
+
 from omega_effects.general.general_functions import read_input_file
+from omega_effects.effects.physical_effects import get_egu_emission_rate
 from omega_effects.general.input_validation import \
     validate_template_version_info, validate_template_column_names
 
@@ -98,7 +104,9 @@ class LegacyFleet:
         """
         self._data = {}  # private dict, the legacy_fleet_file data
         self._legacy_fleet = {}  # the built legacy fleet for the analysis
+        self.legacy_fleet_df = pd.DataFrame()  # the built legacy fleet as a table indexed by vehicle_id, calendar_year
         self.adjusted_legacy_fleet = {}
+        self._effects_cache = {}  # legacy fleet safety and physical effects by effects key, see get_safety_effects_key
         self.legacy_fleet_calendar_year_max = 0
         self.legacy_fleet_vehicle_id_start = pow(10, 6)
 
@@ -225,6 +233,8 @@ class LegacyFleet:
                     self.update_legacy_fleet(update_dict['vehicle_id'], calendar_year, update_dict)
                     self.legacy_fleet_calendar_year_max = max(self.legacy_fleet_calendar_year_max, calendar_year)
 
+        self.legacy_fleet_df = pd.DataFrame.from_dict(self._legacy_fleet, orient='index')
+
     def get_legacy_fleet_price(self, vehicle_id, calendar_year):
         """
 
@@ -235,9 +245,7 @@ class LegacyFleet:
         Returns:
 
         """
-        price = [v['transaction_price_dollars'] for v in self._legacy_fleet.values()
-                 if v['vehicle_id'] == vehicle_id
-                 and v['calendar_year'] == calendar_year][0]
+        price = self._legacy_fleet[(vehicle_id, calendar_year)]['transaction_price_dollars']
 
         return price
 
@@ -251,9 +259,7 @@ class LegacyFleet:
         Returns:
 
         """
-        odometer = [v['odometer'] for v in self.adjusted_legacy_fleet.values()
-                    if v['vehicle_id'] == vehicle_id
-                    and v['calendar_year'] == calendar_year][0]
+        odometer = self.adjusted_legacy_fleet[(vehicle_id, calendar_year)]['odometer']
 
         return odometer
 
@@ -272,47 +278,182 @@ class LegacyFleet:
             There is no rebound VMT calculated for the legacy fleet.
 
         """
-        self.adjusted_legacy_fleet = {}
+        df = self.legacy_fleet_df
+        if df.empty:
+            self.adjusted_legacy_fleet = {}
+            return
+
+        vehicle_id = df['vehicle_id'].values
+        calendar_year = df['calendar_year'].values
+
+        # adjust vmt and legacy fleet stock
+        calendar_year_vmt_adj = pd.Series(
+            {cy: vmt_adjustments_session.get_vmt_adjustment(cy) for cy in pd.unique(calendar_year)}
+        ).loc[calendar_year].values
+        vmt_adjusted = df['vmt'].values * calendar_year_vmt_adj
+
+        calendar_year_stock_adj = pd.Series(
+            {cy: vmt_adjustments_session.get_stock_adjustment(cy) for cy in pd.unique(calendar_year)}
+        ).loc[calendar_year].values
+        stock_adjusted = df['registered_count'].values * calendar_year_stock_adj
+
+        annual_vmt_adjusted = vmt_adjusted / stock_adjusted
+
+        # odometers accumulate the adjusted annual vmt onto the odometer before the first calendar year of driving,
+        # as a cumulative sum along the calendar years of a vehicle by calendar year table
+        first_year = ~df['vehicle_id'].duplicated().values
+        vehicle_index = pd.factorize(vehicle_id)[0]
+        year_index = calendar_year - calendar_year.min()
+        odometer_table = np.zeros((vehicle_index.max() + 1, year_index.max() + 1))
+        odometer_table[vehicle_index, year_index] = \
+            np.where(first_year, df['odometer'].values - df['annual_vmt'].values + annual_vmt_adjusted,
+                     annual_vmt_adjusted)
+        odometer_adjusted = np.cumsum(odometer_table, axis=1)[vehicle_index, year_index]
+
+        adjusted_df = pd.DataFrame({
+            'vehicle_id': vehicle_id,
+            'age': df['age'].values,
+            'calendar_year': calendar_year,
+            'registered_count': stock_adjusted,
+            'context_vmt_adjustment': calendar_year_vmt_adj,
+            'annual_vmt': annual_vmt_adjusted,
+            'odometer': odometer_adjusted,
+            'vmt': vmt_adjusted,
+            'market_class_id': df['market_class_id'].values,
+            'reg_class_id': df['reg_class_id'].values,
+            'in_use_fuel_id': df['in_use_fuel_id'].values,
+            'body_style': df['body_style'].values,
+            'curbweight_lbs': df['curbweight_lbs'].values,
+            'miles_per_gallon': df['miles_per_gallon'].values,
+            'kwh_per_mile': df['kwh_per_mile'].values,
+        })
+
+        self.adjusted_legacy_fleet = \
+            dict(zip(zip(vehicle_id.tolist(), calendar_year.tolist()), adjusted_df.to_dict(orient='records')))
+
+    def get_safety_effects_key(self, session_settings, vmt_adjustments_session):
+        """
+        Get the key of the session legacy fleet safety effects in the effects cache, a hash of the session vmt and
+        stock adjustments for the legacy fleet calendar years and of the safety input files.
+
+        Args:
+            session_settings: an instance of the SessionSettings class.
+            vmt_adjustments_session: an instance of the AdjustmentsVMT class.
 
-        calendar_years = batch_settings.calendar_years
-
-        for v in self._legacy_fleet.values():
-
-            vehicle_id, calendar_year, age = v['vehicle_id'], v['calendar_year'], v['age']
-            registered_count = v['registered_count']
-
-            # adjust vmt and legacy fleet stock
-            calendar_year_vmt_adj = vmt_adjustments_session.get_vmt_adjustment(calendar_year)
-            vmt_adjusted = v['vmt'] * calendar_year_vmt_adj
-
-            calendar_year_stock_adj = vmt_adjustments_session.get_stock_adjustment(calendar_year)
-            stock_adjusted = registered_count * calendar_year_stock_adj
-
-            annual_vmt_adjusted = vmt_adjusted / stock_adjusted
-
-            if v['calendar_year'] == calendar_years[0]:
-                annual_vmt = v['annual_vmt']
-                odometer = v['odometer']
-                odometer_adjusted = odometer - annual_vmt + annual_vmt_adjusted
-            else:
-                odometer_last_year = self.get_adjusted_legacy_fleet_odometer(vehicle_id, calendar_year - 1)
-                odometer_adjusted = odometer_last_year + annual_vmt_adjusted
-
-            update_dict = {
-                'vehicle_id': vehicle_id,
-                'age': age,
-                'calendar_year': calendar_year,
-                'registered_count': stock_adjusted,
-                'context_vmt_adjustment': calendar_year_vmt_adj,
-                'annual_vmt': annual_vmt_adjusted,
-                'odometer': odometer_adjusted,
-                'vmt': vmt_adjusted,
-                'market_class_id': v['market_class_id'],
-                'reg_class_id': v['reg_class_id'],
-                'in_use_fuel_id': v['in_use_fuel_id'],
-                'body_style': v['body_style'],
-                'curbweight_lbs': v['curbweight_lbs'],
-                'miles_per_gallon': v['miles_per_gallon'],
-                'kwh_per_mile': v['kwh_per_mile'],
-            }
-            self.adjusted_legacy_fleet[(vehicle_id, calendar_year)] = update_dict
+        Returns:
+            The safety effects key (str).
+
+        """
+        key = hashlib.sha256()
+
+        adjustments = [(vmt_adjustments_session.get_vmt_adjustment(calendar_year),
+                        vmt_adjustments_session.get_stock_adjustment(calendar_year))
+                       for calendar_year in pd.unique(self.legacy_fleet_df.get('calendar_year', []))]
+        key.update(np.array(adjustments, dtype=float).tobytes())
+
+        update_key_from_files(key, session_settings.safety_values_file, session_settings.fatality_rates_file)
+
+        return key.hexdigest()
+
+    def get_physical_effects_key(self, session_settings, safety_effects_key):
+        """
+        Get the key of the session legacy fleet physical effects in the effects cache, a hash of the safety effects key,
+        the emission rate input files and the session EGU emission rates for the legacy fleet calendar years.
+
+        Args:
+            session_settings: an instance of the SessionSettings class.
+            safety_effects_key (str): the session legacy fleet safety effects key.
+
+        Returns:
+            The physical effects key (str).
+
+        Note:
+            The session EGU emission rates are set by the analysis fleet energy consumption, so this function must not
+            be called until AFTER the analysis fleet physical effects have been calculated.
+
+        """
+        key = hashlib.sha256(safety_effects_key.encode())
+
+        egu_rates = [get_egu_emission_rate(session_settings, calendar_year, 0)
+                     for calendar_year in pd.unique(self.legacy_fleet_df.get('calendar_year', []))]
+        key.update(np.array(egu_rates, dtype=float).tobytes())
+
+        update_key_from_files(key, session_settings.powersector_emission_rates_file,
+                              session_settings.refinery_emission_factors_file,
+                              session_settings.refinery_emission_rates_file,
+                              session_settings.vehicle_emission_rates_file)
+
+        return key.hexdigest()
+
+    def get_cached_safety_effects(self, safety_effects_key, session_settings):
+        """
+        Get the legacy fleet safety effects of an earlier session with the same safety effects key.
+
+        Args:
+            safety_effects_key (str): the session legacy fleet safety effects key.
+            session_settings: an instance of the SessionSettings class.
+
+        Returns:
+            A copy of the cached legacy fleet safety effects dictionary for the given session, or ``None`` if there
+            are no cached safety effects for the key.
+
+        """
+        if safety_effects_key not in self._effects_cache:
+            return None
+
+        return {k: {**v, 'session_policy': session_settings.session_policy,
+                    'session_name': session_settings.session_name}
+                for k, v in self._effects_cache[safety_effects_key].items()}
+
+    def get_cached_physical_effects(self, physical_effects_key, session_settings):
+        """
+        Get the legacy fleet physical effects of an earlier session with the same physical effects key.
+
+        Args:
+            physical_effects_key (str): the session legacy fleet physical effects key.
+            session_settings: an instance of the SessionSettings class.
+
+        Returns:
+            A copy of the cached legacy fleet physical effects DataFrame for the given session, or ``None`` if there
+            are no cached physical effects for the key.
+
+        """
+        if physical_effects_key not in self._effects_cache:
+            return None
+
+        return self._effects_cache[physical_effects_key].assign(
+            session_policy=session_settings.session_policy, session_name=session_settings.session_name)
+
+    def cache_effects(self, effects_key, effects):
+        """
+        Cache session legacy fleet effects for use by later sessions with the same effects key.
+
+        Args:
+            effects_key (str): the session legacy fleet safety or physical effects key.
+            effects: the legacy fleet safety effects dictionary or physical effects DataFrame.
+
+        Returns:
+            Nothing, but updates the effects cache.
+
+        """
+        self._effects_cache[effects_key] = effects
+
+
+def update_key_from_files(key, *filepaths):
+    """
+    Update a hash with the contents of input files.
+
+    Args:
+        key: a ``hashlib`` hash object.
+        *filepaths: the paths of the input files, ``None`` for input files not used.
+
+    Returns:
+        Nothing, but updates the hash.
+
+    """
+    for filepath in filepaths:
+        if filepath:
+            with open(filepath, 'rb') as file:
+                key.update(file.read())
+        else:
+            key.update(b'None')
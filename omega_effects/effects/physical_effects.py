@@ -10,22 +10,18 @@ calculate from them the pollutant inventories, including fuel consumed, for each
 **CODE**
 
 """
+import numpy as np
 import pandas as pd
 
 
-def get_vehicle_emission_rate(session_settings, model_year, sourcetype_name, reg_class_id, fuel, ind_var_value):
+def get_vehicle_emission_rate_names(fuel):
     """
 
     Args:
-        session_settings: an instance of the SessionSettings class.
-        model_year (int): The model year of the specific vehicle.
-        sourcetype_name (str): The MOVES sourcetype name (e.g., 'passenger car', 'passenger truck', 'light commercial truck')
-        reg_class_id (str): The regulatory class ID of the vehicle.
         fuel (str): The fuel ID (i.e., pump gasoline, pump diesel)
-        ind_var_value (str): The independent variable value, e.g., age or odometer
 
     Returns:
-        A list of emission rates for the given model year vehicle in a given calendar year.
+        A list of the emission rate names that apply to the given fuel.
 
     """
     if 'gasoline' in fuel:
@@ -95,12 +91,70 @@ def get_vehicle_emission_rate(session_settings, model_year, sourcetype_name, reg
     else:
         rate_names = []
 
+    return rate_names
+
+
+def get_vehicle_emission_rate(session_settings, model_year, sourcetype_name, reg_class_id, fuel, ind_var_value):
+    """
+
+    Args:
+        session_settings: an instance of the SessionSettings class.
+        model_year (int): The model year of the specific vehicle.
+        sourcetype_name (str): The MOVES sourcetype name (e.g., 'passenger car', 'passenger truck', 'light commercial truck')
+        reg_class_id (str): The regulatory class ID of the vehicle.
+        fuel (str): The fuel ID (i.e., pump gasoline, pump diesel)
+        ind_var_value (str): The independent variable value, e.g., age or odometer
+
+    Returns:
+        A list of emission rates for the given model year vehicle in a given calendar year.
+
+    """
+    rate_names = get_vehicle_emission_rate_names(fuel)
+
     rates = session_settings.emission_rates_vehicles.get_emission_rate(model_year, sourcetype_name, reg_class_id, fuel,
                                                                        ind_var_value, *rate_names)
 
     return rates
 
 
+def get_vehicle_emission_rate_arrays(session_settings, model_years, sourcetype_names, reg_class_ids, fuel,
+                                     ind_var_values):
+    """
+
+    Args:
+        session_settings: an instance of the SessionSettings class.
+        model_years: An array of vehicle model years.
+        sourcetype_names: An array of MOVES sourcetype names.
+        reg_class_ids: An array of vehicle regulatory class IDs.
+        fuel (str): The fuel ID (i.e., pump gasoline, pump diesel)
+        ind_var_values: An array of independent variable values, e.g., age or odometer
+
+    Returns:
+        A dictionary of emission rate arrays keyed by rate name, one value per vehicle.
+
+    Note:
+        Vehicles are grouped into model year, sourcetype and reg class cohorts and the rates for each cohort are
+        evaluated over its independent variable values in one call.
+
+    """
+    rate_names = get_vehicle_emission_rate_names(fuel)
+    ind_var_values = np.asarray(ind_var_values)
+
+    rates = {rate_name: np.zeros(len(ind_var_values)) for rate_name in rate_names}
+
+    cohorts = pd.DataFrame({
+        'model_year': model_years, 'sourcetype_name': sourcetype_names, 'reg_class_id': reg_class_ids,
+    }).groupby(['model_year', 'sourcetype_name', 'reg_class_id'], sort=False).indices
+
+    for (model_year, sourcetype_name, reg_class_id), idx in cohorts.items():
+        cohort_rates = session_settings.emission_rates_vehicles.get_emission_rate_arrays(
+            model_year, sourcetype_name, reg_class_id, fuel, ind_var_values[idx], *rate_names)
+        for rate_name, cohort_rate in zip(rate_names, cohort_rates):
+            rates[rate_name][idx] = cohort_rate
+
+    return rates
+
+
 def get_egu_emission_rate(session_settings, calendar_year, kwh_consumption):
     """
 
@@ -237,6 +291,8 @@ def get_inputs_for_effects(batch_settings, arg=None):
 
 def calc_physical_effects(batch_settings, session_settings, safety_effects_dict):
     """
+    Calculate physical effects vehicle-by-vehicle.  Reference implementation for ``calc_physical_effects_columnar()``,
+    retained for equivalence testing.
 
     Args:
         batch_settings: an instance of the BatchSettings class.
@@ -716,6 +772,428 @@ def calc_physical_effects(batch_settings, session_settings, safety_effects_dict)
     return physical_effects_dict
 
 
+def calc_physical_effects_columnar(batch_settings, session_settings, safety_effects_dict):
+    """
+
+    Args:
+        batch_settings: an instance of the BatchSettings class.
+        session_settings: an instance of the SessionSettings class.
+        safety_effects_dict: The dictionary generated via the safety_effects module.
+
+    Returns:
+        A DataFrame of physical effects with one row per vehicle_id and calendar_year, matching the DataFrame built
+        from the dictionary returned by ``calc_physical_effects()``.
+
+    Note:
+        Vehicle annual data, vehicle attributes, safety effects and emission rates are joined as arrays for each
+        calendar year and the inventories are calculated with vectorized expressions rather than vehicle-by-vehicle.
+
+    """
+    vehicle_attribute_list = [
+        'base_year_vehicle_id',
+        'manufacturer_id',
+        'name',
+        'model_year',
+        'base_year_reg_class_id',
+        'reg_class_id',
+        'in_use_fuel_id',
+        'market_class_id',
+        'fueling_class',
+        'base_year_powertrain_type',
+        'footprint_ft2',
+        'workfactor',
+        'target_co2e_grams_per_mile',
+        'onroad_direct_co2e_grams_per_mile',
+        'onroad_direct_kwh_per_mile',
+        'body_style',
+        'battery_kwh',
+    ]
+    safety_attribute_list = [
+        'session_fatalities',
+        'vmt',
+        'annual_vmt',
+        'odometer',
+        'context_vmt_adjustment',
+        'vmt_rebound',
+        'annual_vmt_rebound',
+        'context_size_class',
+    ]
+    exhaust_rate_names = {
+        'pm25': 'pm25_exhaust_grams_per_mile',
+        'nmog': 'nmog_exhaust_grams_per_mile',
+        'co': 'co_exhaust_grams_per_mile',
+        'nox': 'nox_exhaust_grams_per_mile',
+        'acetaldehyde': 'acetaldehyde_exhaust_grams_per_mile',
+        'acrolein': 'acrolein_exhaust_grams_per_mile',
+        'benzene': 'benzene_exhaust_grams_per_mile',
+        'ethylbenzene': 'ethylbenzene_exhaust_grams_per_mile',
+        'formaldehyde': 'formaldehyde_exhaust_grams_per_mile',
+        'naphthalene': 'naphthalene_exhaust_grams_per_mile',
+        '13_butadiene': '13_butadiene_exhaust_grams_per_mile',
+        '15pah': '15pah_exhaust_grams_per_mile',
+    }
+    evaporative_rate_names = {
+        'nmog': [
+            'nmog_evap_permeation_grams_per_gallon',
+            'nmog_evap_fuel_vapor_venting_grams_per_gallon',
+            'nmog_evap_fuel_leaks_grams_per_gallon',
+            'nmog_refueling_displacement_grams_per_gallon',
+            'nmog_refueling_spillage_grams_per_gallon',
+        ],
+        'benzene': [
+            'benzene_evap_permeation_grams_per_gallon',
+            'benzene_evap_fuel_vapor_venting_grams_per_gallon',
+            'benzene_evap_fuel_leaks_grams_per_gallon',
+            'benzene_refueling_displacement_grams_per_gallon',
+            'benzene_refueling_spillage_grams_per_gallon',
+        ],
+        'ethylbenzene': [
+            'ethylbenzene_evap_fuel_vapor_venting_grams_per_gallon',
+            'ethylbenzene_evap_fuel_leaks_grams_per_gallon',
+            'ethylbenzene_evap_permeation_grams_per_gallon',
+            'ethylbenzene_refueling_displacement_grams_per_gallon',
+            'ethylbenzene_refueling_spillage_grams_per_gallon',
+        ],
+        'naphthalene': [
+            'naphthalene_refueling_spillage_grams_per_gallon',
+        ],
+    }
+    liquid_rate_names = list(dict.fromkeys(
+        get_vehicle_emission_rate_names('pump gasoline') + get_vehicle_emission_rate_names('pump diesel')))
+
+    grams_per_us_ton, grams_per_metric_ton, gal_per_bbl, e0_share, e0_energy_density_ratio, \
+        diesel_energy_density_ratio, fuel_reduction_leading_to_reduced_domestic_refining \
+        = get_inputs_for_effects(batch_settings)
+
+    calendar_years = batch_settings.calendar_years
+
+    vad_arrays_dict = dict()
+    for calendar_year in calendar_years:
+        vad_arrays_dict[calendar_year] = session_settings.vehicle_annual_data.\
+            get_adjusted_vehicle_annual_data_arrays_by_calendar_year(calendar_year, 'vehicle_id', 'age',
+                                                                     'registered_count')
+
+    # need vehicle info once for each vehicle, not every calendar year for each vehicle
+    vehicle_ids = pd.unique(np.concatenate(
+        [np.asarray(v['vehicle_id'], dtype=int) for v in vad_arrays_dict.values()] + [np.array([], dtype=int)]))
+    vehicle_info = [session_settings.vehicles.get_vehicle_attributes(vehicle_id, *vehicle_attribute_list)
+                    for vehicle_id in vehicle_ids]
+    vehicle_info_df = pd.DataFrame(vehicle_info, columns=vehicle_attribute_list, index=vehicle_ids)
+    vehicle_info_df['has_target'] = \
+        [v[vehicle_attribute_list.index('target_co2e_grams_per_mile')] is not None for v in vehicle_info]
+
+    sourcetype_name = np.full(len(vehicle_info_df), None, dtype=object)
+    base_year_reg_class_id = vehicle_info_df['base_year_reg_class_id'].values
+    body_style = vehicle_info_df['body_style'].astype(str)
+    sourcetype_name[base_year_reg_class_id == 'car'] = 'passenger car'
+    sourcetype_name[base_year_reg_class_id == 'truck'] = 'passenger truck'
+    sourcetype_name[(base_year_reg_class_id == 'mediumduty') & body_style.str.contains('cuv').values] \
+        = 'passenger truck'
+    sourcetype_name[(base_year_reg_class_id == 'mediumduty') & body_style.str.contains('pickup').values] \
+        = 'light commercial truck'
+    if pd.isnull(sourcetype_name).any():
+        print('Improper sourcetype_name for vehicle emission rates.')
+    vehicle_info_df['sourcetype_name'] = sourcetype_name
+
+    fuel_dicts = {fuel_id: eval(fuel_id) for fuel_id in vehicle_info_df['in_use_fuel_id'].unique()}
+
+    safety_df = pd.DataFrame.from_dict(safety_effects_dict, orient='index', columns=safety_attribute_list)
+
+    calendar_year_effects_dfs = list()
+    for calendar_year in calendar_years:
+
+        vad = vad_arrays_dict[calendar_year]
+        vehicle_id = np.asarray(vad['vehicle_id'], dtype=int)
+        age = np.asarray(vad['age'], dtype=int)
+        registered_count = vad['registered_count']
+
+        info = vehicle_info_df.loc[vehicle_id]
+        safety = safety_df.reindex(pd.MultiIndex.from_arrays([vehicle_id, np.full(len(vehicle_id), calendar_year)]))
+        in_use_fuel_id = info['in_use_fuel_id'].values
+        onroad_direct_kwh_per_mile = info['onroad_direct_kwh_per_mile'].values
+        vmt = safety['vmt'].values
+
+        # first determine kwh demand for this calendar year
+        fuel_consumption_kWh_annual = 0
+        for fuel_id, fuel_dict in fuel_dicts.items():
+            for fuel, fuel_share in fuel_dict.items():
+                if fuel == 'US electricity':
+                    mask = (in_use_fuel_id == fuel_id) & onroad_direct_kwh_per_mile.astype(bool)
+                    fuel_consumption_kWh_annual += \
+                        np.sum(vmt[mask] * fuel_share * onroad_direct_kwh_per_mile[mask].astype(float))
+
+        # upstream EGU emission rates for this calendar year to apply to electric fuel operation
+        voc_egu_rate, co_egu_rate, nox_egu_rate, pm25_egu_rate, sox_egu_rate, \
+            co2_egu_rate, ch4_egu_rate, n2o_egu_rate, hcl_egu_rate, hg_egu_rate \
+            = get_egu_emission_rate(session_settings, calendar_year, fuel_consumption_kWh_annual)
+
+        # keep analysis fleet vehicles with targets
+        keep = (info['model_year'].values >= calendar_years[0]) & info['has_target'].values.astype(bool)
+        vehicle_id, age, registered_count = vehicle_id[keep], age[keep], np.asarray(registered_count)[keep]
+        info, safety = info[keep], safety[keep]
+
+        num_rows = len(vehicle_id)
+        in_use_fuel_id = info['in_use_fuel_id'].values
+        model_year = info['model_year'].values.tolist()
+        sourcetype_name = info['sourcetype_name'].values
+        base_year_reg_class_id = info['base_year_reg_class_id'].values
+        fueling_class = info['fueling_class'].values
+        onroad_direct_co2e_grams_per_mile = info['onroad_direct_co2e_grams_per_mile'].values
+        onroad_direct_kwh_per_mile = info['onroad_direct_kwh_per_mile'].values
+        vmt = safety['vmt'].values.astype(float)
+
+        # for physical effects, we want battery kwh implemented on new vehicles (age=0)
+        battery_kwh = np.where(age == 0, info['battery_kwh'].values.astype(float) * registered_count, 0)
+
+        veh_rates_by = 'age'  # for now; set as an input if we want to; value can be 'age' or 'odometer'
+        ind_var_value = age.tolist()
+        if veh_rates_by == 'odometer':
+            ind_var_value = safety['odometer'].values.tolist()
+
+        vmt_liquid_fuel, vmt_electricity, onroad_gallons_per_mile, fuel_consumption_gallons, \
+            onroad_miles_per_gallon, fuel_generation_kWh, fuel_consumption_kWh \
+            = (np.zeros(num_rows) for _ in range(7))
+
+        exh_ustons = {pollutant: np.zeros(num_rows) for pollutant in exhaust_rate_names}
+        evap_ustons = {pollutant: np.zeros(num_rows) for pollutant in evaporative_rate_names}
+        sox_exh_ustons, ch4_veh_metrictons, n2o_veh_metrictons, co2_veh_metrictons \
+            = (np.zeros(num_rows) for _ in range(4))
+
+        liquid_rates = {rate_name: np.zeros(num_rows) for rate_name in liquid_rate_names}
+        pm25_brakewear_rate_e, pm25_tirewear_rate_e = np.zeros(num_rows), np.zeros(num_rows)
+
+        voc_ref_rate, co_ref_rate, nox_ref_rate, pm25_ref_rate, sox_ref_rate, co2_ref_rate, ch4_ref_rate, \
+            n2o_ref_rate = (np.zeros(num_rows) for _ in range(8))
+
+        pure_share, energy_density_ratio = np.zeros(num_rows), np.zeros(num_rows)
+
+        for fuel_id, fuel_dict in fuel_dicts.items():
+            fuel_id_mask = in_use_fuel_id == fuel_id
+            if not fuel_id_mask.any():
+                continue
+
+            for fuel, fuel_share in fuel_dict.items():
+                transmission_efficiency \
+                    = batch_settings.onroad_fuels.get_fuel_attribute(calendar_year, fuel, 'transmission_efficiency')
+
+                # calc fuel consumption and get emission rates
+                if fuel == 'US electricity':
+                    idx = np.flatnonzero(fuel_id_mask & onroad_direct_kwh_per_mile.astype(bool))
+                    vmt_electricity[idx] = vmt[idx] * fuel_share
+                    fuel_consumption_kWh[idx] += vmt_electricity[idx] * onroad_direct_kwh_per_mile[idx].astype(float)
+                    fuel_generation_kWh[idx] = fuel_consumption_kWh[idx] / transmission_efficiency
+
+                    # vehicle emission rates; PHEVs use the ICE vehicle rates
+                    idx = idx[fueling_class[idx] == 'BEV']
+                    if len(idx):
+                        rates = get_vehicle_emission_rate_arrays(
+                            session_settings, [model_year[i] for i in idx], sourcetype_name[idx],
+                            base_year_reg_class_id[idx], fuel, [ind_var_value[i] for i in idx])
+                        pm25_brakewear_rate_e[idx] = rates['pm25_brakewear_grams_per_mile']
+                        pm25_tirewear_rate_e[idx] = rates['pm25_tirewear_grams_per_mile']
+
+                else:
+                    idx = np.flatnonzero(fuel_id_mask & onroad_direct_co2e_grams_per_mile.astype(bool))
+                    if not len(idx):
+                        continue
+
+                    refuel_efficiency \
+                        = batch_settings.onroad_fuels.get_fuel_attribute(calendar_year, fuel, 'refuel_efficiency')
+                    co2_emissions_grams_per_unit \
+                        = batch_settings.onroad_fuels.get_fuel_attribute(
+                            calendar_year, fuel, 'direct_co2e_grams_per_unit') / refuel_efficiency
+
+                    co2e_grams_per_mile = onroad_direct_co2e_grams_per_mile[idx].astype(float)
+                    vmt_liquid_fuel[idx] = vmt[idx] * fuel_share
+                    onroad_gallons_per_mile[idx] += co2e_grams_per_mile / co2_emissions_grams_per_unit
+                    fuel_consumption_gallons[idx] = \
+                        vmt_liquid_fuel[idx] * onroad_gallons_per_mile[idx] / transmission_efficiency
+                    onroad_miles_per_gallon[idx] = 1 / onroad_gallons_per_mile[idx]
+
+                    if fuel in ('pump gasoline', 'pump diesel'):
+                        rates = get_vehicle_emission_rate_arrays(
+                            session_settings, [model_year[i] for i in idx], sourcetype_name[idx],
+                            base_year_reg_class_id[idx], fuel, [ind_var_value[i] for i in idx])
+                        for rate_name, rate in rates.items():
+                            liquid_rates[rate_name][idx] = rate
+
+                        if fuel == 'pump gasoline':
+                            energy_density_ratio[idx], pure_share[idx] = e0_energy_density_ratio, e0_share
+                        else:
+                            energy_density_ratio[idx], pure_share[idx] = diesel_energy_density_ratio, 1
+                    else:
+                        pass  # add additional liquid fuels (E85) if necessary
+
+                    # upstream refinery emission factors for liquid fuel operation
+                    if session_settings.emission_factors_refinery:
+                        voc_ref_rate[idx], co_ref_rate[idx], nox_ref_rate[idx], pm25_ref_rate[idx], \
+                            sox_ref_rate[idx], co2_ref_rate[idx], ch4_ref_rate[idx], n2o_ref_rate[idx] \
+                            = get_refinery_ef(session_settings, calendar_year, fuel)
+                    else:
+                        voc_ref_rate[idx], nox_ref_rate[idx], pm25_ref_rate[idx], sox_ref_rate[idx] = \
+                            get_refinery_emission_rate(session_settings, calendar_year)
+
+                    # calc exhaust and evaporative emissions for liquid fuel operation
+                    factor = vmt_liquid_fuel[idx] / grams_per_us_ton
+                    for pollutant, rate_name in exhaust_rate_names.items():
+                        exh_ustons[pollutant][idx] += liquid_rates[rate_name][idx] * factor
+
+                    factor = fuel_consumption_gallons[idx] / grams_per_us_ton
+                    sox_exh_ustons[idx] += liquid_rates['sox_exhaust_grams_per_gallon'][idx] * factor
+                    for pollutant, rate_names in evaporative_rate_names.items():
+                        evap_ustons[pollutant][idx] += \
+                            sum([liquid_rates[rate_name][idx] for rate_name in rate_names]) * factor
+
+                    factor = vmt_liquid_fuel[idx] / grams_per_metric_ton
+                    ch4_veh_metrictons[idx] += liquid_rates['ch4_exhaust_grams_per_mile'][idx] * factor
+                    n2o_veh_metrictons[idx] += liquid_rates['n2o_exhaust_grams_per_mile'][idx] * factor
+                    co2_veh_metrictons[idx] += co2e_grams_per_mile * factor
+
+        # calc vehicle inventories as exhaust plus evap (where applicable)
+        nmog_veh_ustons = exh_ustons['nmog'] + evap_ustons['nmog']
+        benzene_veh_ustons = exh_ustons['benzene'] + evap_ustons['benzene']
+        ethylbenzene_veh_ustons = exh_ustons['ethylbenzene'] + evap_ustons['ethylbenzene']
+        naphthalene_veh_ustons = exh_ustons['naphthalene'] + evap_ustons['naphthalene']
+
+        # calc vehicle pm25 emissions
+        pm25_brakewear_ustons = \
+            (vmt_liquid_fuel * liquid_rates['pm25_brakewear_grams_per_mile']
+             + vmt_electricity * pm25_brakewear_rate_e) / grams_per_us_ton
+        pm25_tirewear_ustons = \
+            (vmt_liquid_fuel * liquid_rates['pm25_tirewear_grams_per_mile']
+             + vmt_electricity * pm25_tirewear_rate_e) / grams_per_us_ton
+
+        pm25_veh_ustons = exh_ustons['pm25'] + pm25_brakewear_ustons + pm25_tirewear_ustons
+
+        # calc upstream emissions for both liquid and electric fuel operation
+        kwhs, gallons = fuel_generation_kWh, fuel_consumption_gallons
+        ref_factor = fuel_reduction_leading_to_reduced_domestic_refining
+        voc_upstream_ustons = (kwhs * voc_egu_rate + gallons * voc_ref_rate * ref_factor) / grams_per_us_ton
+        co_upstream_ustons = (kwhs * co_egu_rate + gallons * co_ref_rate * ref_factor) / grams_per_us_ton
+        nox_upstream_ustons = (kwhs * nox_egu_rate + gallons * nox_ref_rate * ref_factor) / grams_per_us_ton
+        pm25_upstream_ustons = (kwhs * pm25_egu_rate + gallons * pm25_ref_rate * ref_factor) / grams_per_us_ton
+        sox_upstream_ustons = (kwhs * sox_egu_rate + gallons * sox_ref_rate * ref_factor) / grams_per_us_ton
+        hcl_upstream_ustons = (kwhs * hcl_egu_rate) / grams_per_us_ton
+        hg_upstream_ustons = (kwhs * hg_egu_rate) / grams_per_us_ton
+
+        co2_upstream_metrictons = \
+            (kwhs * co2_egu_rate + gallons * co2_ref_rate * ref_factor) / grams_per_metric_ton
+        ch4_upstream_metrictons = \
+            (kwhs * ch4_egu_rate + gallons * ch4_ref_rate * ref_factor) / grams_per_metric_ton
+        n2o_upstream_metrictons = \
+            (kwhs * n2o_egu_rate + gallons * n2o_ref_rate * ref_factor) / grams_per_metric_ton
+
+        # calc energy security related attributes and comparisons to year_for_compares
+        oil_bbl = fuel_consumption_gallons * pure_share * energy_density_ratio / gal_per_bbl
+        imported_oil_bbl = oil_bbl * get_energysecurity_cf(batch_settings, calendar_year)
+        imported_oil_bbl_per_day = imported_oil_bbl / 365
+
+        calendar_year_effects_dfs.append(pd.DataFrame({
+            'session_policy': session_settings.session_policy,
+            'session_name': session_settings.session_name,
+            'vehicle_id': vehicle_id,
+            'base_year_vehicle_id': info['base_year_vehicle_id'].values.astype(int),
+            'manufacturer_id': info['manufacturer_id'].values,
+            'name': info['name'].values,
+            'calendar_year': int(calendar_year),
+            'model_year': calendar_year - age,
+            'age': age,
+            'base_year_reg_class_id': base_year_reg_class_id,
+            'reg_class_id': info['reg_class_id'].values,
+            'context_size_class': safety['context_size_class'].values,
+            'in_use_fuel_id': in_use_fuel_id,
+            'market_class_id': info['market_class_id'].values,
+            'fueling_class': fueling_class,
+            'base_year_powertrain_type': info['base_year_powertrain_type'].values,
+            'body_style': info['body_style'].values,
+            'footprint_ft2': info['footprint_ft2'].values,
+            'workfactor': info['workfactor'].values,
+            'registered_count': registered_count,
+            'context_vmt_adjustment': safety['context_vmt_adjustment'].values,
+            'annual_vmt': safety['annual_vmt'].values,
+            'odometer': safety['odometer'].values,
+            'vmt': vmt,
+            'annual_vmt_rebound': safety['annual_vmt_rebound'].values,
+            'vmt_rebound': safety['vmt_rebound'].values,
+            'vmt_liquid_fuel': vmt_liquid_fuel,
+            'vmt_electricity': vmt_electricity,
+            'battery_kwh': battery_kwh,
+            'onroad_direct_co2e_grams_per_mile': onroad_direct_co2e_grams_per_mile,
+            'onroad_direct_kwh_per_mile': onroad_direct_kwh_per_mile,
+            'onroad_gallons_per_mile': onroad_gallons_per_mile,
+            'onroad_miles_per_gallon': onroad_miles_per_gallon,
+            'fuel_consumption_gallons': fuel_consumption_gallons,
+            'fuel_consumption_kWh': fuel_consumption_kWh,
+            'fuel_generation_kWh': fuel_generation_kWh,
+
+            'barrels_of_oil': oil_bbl,
+            'barrels_of_imported_oil': imported_oil_bbl,
+            'barrels_of_imported_oil_per_day': imported_oil_bbl_per_day,
+
+            'session_fatalities': safety['session_fatalities'].values,
+
+            'nmog_exhaust_ustons': exh_ustons['nmog'],
+            'nmog_evaporative_ustons': evap_ustons['nmog'],
+            'nmog_vehicle_ustons': nmog_veh_ustons,
+            'co_vehicle_ustons': exh_ustons['co'],
+            'nox_vehicle_ustons': exh_ustons['nox'],
+            'pm25_exhaust_ustons': exh_ustons['pm25'],
+            'pm25_brakewear_ustons': pm25_brakewear_ustons,
+            'pm25_tirewear_ustons': pm25_tirewear_ustons,
+            'pm25_vehicle_ustons': pm25_veh_ustons,
+            'sox_vehicle_ustons': sox_exh_ustons,
+            'acetaldehyde_vehicle_ustons': exh_ustons['acetaldehyde'],
+            'acrolein_vehicle_ustons': exh_ustons['acrolein'],
+            'benzene_exhaust_ustons': exh_ustons['benzene'],
+            'benzene_evaporative_ustons': evap_ustons['benzene'],
+            'benzene_vehicle_ustons': benzene_veh_ustons,
+            'ethylbenzene_exhaust_ustons': exh_ustons['ethylbenzene'],
+            'ethylbenzene_evaporative_ustons': evap_ustons['ethylbenzene'],
+            'ethylbenzene_vehicle_ustons': ethylbenzene_veh_ustons,
+            'formaldehyde_vehicle_ustons': exh_ustons['formaldehyde'],
+            'naphthalene_exhaust_ustons': exh_ustons['naphthalene'],
+            'naphthalene_evaporative_ustons': evap_ustons['naphthalene'],
+            'naphthalene_vehicle_ustons': naphthalene_veh_ustons,
+            '13_butadiene_vehicle_ustons': exh_ustons['13_butadiene'],
+            '15pah_vehicle_ustons': exh_ustons['15pah'],
+
+            'ch4_vehicle_metrictons': ch4_veh_metrictons,
+            'n2o_vehicle_metrictons': n2o_veh_metrictons,
+            'co2_vehicle_metrictons': co2_veh_metrictons,
+
+            'voc_upstream_ustons': voc_upstream_ustons,
+            'co_upstream_ustons': co_upstream_ustons,
+            'nox_upstream_ustons': nox_upstream_ustons,
+            'pm25_upstream_ustons': pm25_upstream_ustons,
+            'sox_upstream_ustons': sox_upstream_ustons,
+            'hcl_upstream_ustons': hcl_upstream_ustons,
+            'hg_upstream_ustons': hg_upstream_ustons,
+
+            'ch4_upstream_metrictons': ch4_upstream_metrictons,
+            'n2o_upstream_metrictons': n2o_upstream_metrictons,
+            'co2_upstream_metrictons': co2_upstream_metrictons,
+
+            'nmog_and_voc_total_ustons': nmog_veh_ustons + voc_upstream_ustons,
+            'co_total_ustons': exh_ustons['co'] + co_upstream_ustons,
+            'nox_total_ustons': exh_ustons['nox'] + nox_upstream_ustons,
+            'pm25_total_ustons': pm25_veh_ustons + pm25_upstream_ustons,
+            'sox_total_ustons': sox_exh_ustons + sox_upstream_ustons,
+            'acetaldehyde_total_ustons': exh_ustons['acetaldehyde'],
+            'acrolein_total_ustons': exh_ustons['acrolein'],
+            'benzene_total_ustons': benzene_veh_ustons,
+            'ethylbenzene_total_ustons': ethylbenzene_veh_ustons,
+            'formaldehyde_total_ustons': exh_ustons['formaldehyde'],
+            'naphthalene_total_ustons': naphthalene_veh_ustons,
+            '13_butadiene_total_ustons': exh_ustons['13_butadiene'],
+            '15pah_total_ustons': exh_ustons['15pah'],
+            'co2_total_metrictons': co2_veh_metrictons + co2_upstream_metrictons,
+            'ch4_total_metrictons': ch4_veh_metrictons + ch4_upstream_metrictons,
+            'n2o_total_metrictons': n2o_veh_metrictons + n2o_upstream_metrictons,
+        }))
+
+    return pd.concat(calendar_year_effects_dfs, ignore_index=True)
+
+
 def calc_annual_physical_effects(batch_settings, input_df):
     """
 
@@ -780,8 +1258,8 @@ def calc_legacy_fleet_physical_effects(batch_settings, session_settings, legacy_
         tuple and values are a dictionary of attribute_name and attribute_value pairs of physical effects.
 
     Note:
-        This function must not be called until AFTER calc_physical_effects so that the EGU rates will have been
-        generated using the energy consumption there. This means that legacy fleet electricity consumption is not
+        This function must not be called until AFTER calc_physical_effects_columnar so that the EGU rates will have
+        been generated using the energy consumption there. This means that legacy fleet electricity consumption is not
         included when calculating the EGU rates used in the analysis. The legacy fleet electricity consumption is
         small and gets smaller with each future year making this a minor, if not acceptably negligible, impact.
 
@@ -1226,3 +1704,120 @@ def calc_period_consumer_physical_view(batch_settings, input_df):
         return_df = pd.concat([return_df, s], axis=1)
 
     return return_df
+
+
+if __name__ == '__main__':
+    try:
+        # columnar equivalence test, columnar physical effects versus vehicle-by-vehicle reference implementation
+        import tempfile
+        from pathlib import Path
+        from types import SimpleNamespace
+
+        from omega_effects.general.effects_log import EffectsLog
+        from omega_effects.general.general_inputs_for_effects import GeneralInputsForEffects
+        from omega_effects.context.ip_deflators import ImplicitPriceDeflators
+        from omega_effects.context.onroad_fuels import OnroadFuel
+        from omega_effects.effects.cost_factors_energysecurity import CostFactorsEnergySecurity
+        from omega_effects.effects.emission_rates_vehicles import EmissionRatesVehicles
+        from omega_effects.effects.emission_rates_egu import EmissionRatesEGU
+        from omega_effects.effects.emission_factors_refinery import EmissionFactorsRefinery
+
+        test_inputs = Path(__file__).parents[2] / 'omega_model' / 'test_inputs'
+
+        test_log = EffectsLog()
+        test_log.init_logfile(Path(tempfile.mkdtemp()))
+
+        test_batch = SimpleNamespace(calendar_years=range(2022, 2031), analysis_dollar_basis=2020,
+                                     ip_deflators=ImplicitPriceDeflators(),
+                                     general_inputs_for_effects=GeneralInputsForEffects(), onroad_fuels=OnroadFuel(),
+                                     energy_security_cost_factors=CostFactorsEnergySecurity())
+        test_batch.ip_deflators.init_from_file(test_inputs / 'implicit_price_deflators.csv', test_log)
+        test_batch.general_inputs_for_effects.init_from_file(test_inputs / 'general_inputs_for_effects.csv', test_log)
+        test_batch.onroad_fuels.init_from_file(test_inputs / 'onroad_fuels.csv', test_log)
+        test_batch.energy_security_cost_factors.init_from_file(
+            test_inputs / 'cost_factors_energysecurity.csv', test_batch, test_log)
+
+        rng = np.random.default_rng(0)
+
+        # sample of vehicles, including vehicles without targets and vehicles from before the analysis start, legacy
+        # fleet vehicles are calculated by calc_legacy_fleet_physical_effects()
+        test_vehicles = dict()
+        for vehicle_id, (model_year, reg_class_id, fueling_class) in enumerate(
+                [(model_year, reg_class_id, fueling_class)
+                 for model_year in range(2020, 2029, 2)
+                 for reg_class_id in ['car', 'truck']
+                 for fueling_class in ['ICE', 'BEV', 'PHEV']]):
+            in_use_fuel_id = {'ICE': "{'pump gasoline':1.0}", 'BEV': "{'US electricity':1.0}",
+                              'PHEV': "{'pump gasoline':0.4, 'US electricity':0.6}"}[fueling_class]
+            test_vehicles[vehicle_id] = {
+                'base_year_vehicle_id': vehicle_id % 7, 'manufacturer_id': 'consolidated_OEM',
+                'name': '%s_%s_%d' % (reg_class_id, fueling_class, vehicle_id), 'model_year': model_year,
+                'base_year_reg_class_id': reg_class_id, 'reg_class_id': reg_class_id,
+                'in_use_fuel_id': in_use_fuel_id, 'market_class_id': 'non_hauling.%s' % fueling_class,
+                'fueling_class': fueling_class, 'base_year_powertrain_type': fueling_class,
+                'footprint_ft2': 40 + 15 * rng.random(), 'workfactor': 0,
+                'target_co2e_grams_per_mile': None if vehicle_id % 11 == 0 else 150 * rng.random(),
+                'onroad_direct_co2e_grams_per_mile': 0 if fueling_class == 'BEV' else 150 + 200 * rng.random(),
+                'onroad_direct_kwh_per_mile': 0 if fueling_class == 'ICE' else 0.2 + 0.2 * rng.random(),
+                'body_style': 'sedan' if reg_class_id == 'car' else 'cuv_suv',
+                'battery_kwh': {'ICE': 1, 'BEV': 80, 'PHEV': 20}[fueling_class] * (0.5 + rng.random()),
+            }
+
+        test_vad = {calendar_year: [] for calendar_year in test_batch.calendar_years}
+        test_safety_effects_dict = dict()
+        for vehicle_id, vehicle in test_vehicles.items():
+            for calendar_year in test_batch.calendar_years:
+                if calendar_year >= vehicle['model_year']:
+                    test_vad[calendar_year].append({'vehicle_id': vehicle_id,
+                                                    'age': calendar_year - vehicle['model_year'],
+                                                    'registered_count': 1e5 * rng.random()})
+                    vmt = 1e9 * rng.random()
+                    test_safety_effects_dict[(vehicle_id, calendar_year)] = {
+                        'session_fatalities': rng.random(), 'vmt': vmt, 'annual_vmt': 1e4 * rng.random(),
+                        'odometer': 1e5 * rng.random(), 'context_vmt_adjustment': rng.random(),
+                        'vmt_rebound': 0.01 * vmt, 'annual_vmt_rebound': 100 * rng.random(),
+                        'context_size_class': 'Midsize'}
+
+        def get_vehicle_attributes(vehicle_id, *attribute_names):
+            return [test_vehicles[vehicle_id][attribute_name] for attribute_name in attribute_names]
+
+        def get_adjusted_vad_arrays(calendar_year, *attribute_names):
+            return {attribute_name: np.array([v[attribute_name] for v in test_vad[calendar_year]])
+                    for attribute_name in attribute_names}
+
+        test_session = SimpleNamespace(
+            session_policy='action_a', session_name='action_a',
+            vehicles=SimpleNamespace(get_vehicle_attributes=get_vehicle_attributes),
+            vehicle_annual_data=SimpleNamespace(
+                get_adjusted_vehicle_annual_data_by_calendar_year=lambda calendar_year: test_vad[calendar_year],
+                get_adjusted_vehicle_annual_data_arrays_by_calendar_year=get_adjusted_vad_arrays),
+            emission_rates_vehicles=EmissionRatesVehicles(), emission_rates_egu=EmissionRatesEGU(),
+            emission_factors_refinery=EmissionFactorsRefinery())
+        test_session.emission_rates_vehicles.init_from_file(
+            test_inputs / 'emission_rates_vehicles-no_gpf.csv', test_log)
+        test_session.emission_rates_egu.init_from_file(test_inputs / 'emission_rates_egu.csv', test_log)
+        test_session.emission_factors_refinery.init_from_file(test_inputs / 'emission_factors_refinery.csv', test_log)
+
+        vehicle_by_vehicle_df = pd.DataFrame.from_dict(
+            calc_physical_effects(test_batch, test_session, test_safety_effects_dict), orient='index'
+        ).reset_index(drop=True)
+        columnar_df = calc_physical_effects_columnar(test_batch, test_session, test_safety_effects_dict)
+
+        assert list(columnar_df.columns) == list(vehicle_by_vehicle_df.columns)
+        assert columnar_df.shape == vehicle_by_vehicle_df.shape, 'shape mismatch'
+        for column in columnar_df.columns:
+            if columnar_df[column].dtype.kind in 'biuf' and vehicle_by_vehicle_df[column].dtype.kind in 'biuf':
+                assert np.allclose(columnar_df[column].to_numpy(dtype=float),
+                                   vehicle_by_vehicle_df[column].to_numpy(dtype=float),
+                                   rtol=1e-12, atol=0, equal_nan=True), '%s mismatch' % column
+            else:
+                assert (columnar_df[column].astype(str) == vehicle_by_vehicle_df[column].astype(str)).all(), \
+                    '%s mismatch' % column
+
+        print('Physical effects columnar equivalence test passed')
+
+    except:
+        import os
+        import traceback
+        print("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
+        os._exit(-1)
@@ -9,6 +9,7 @@
 """
 
 import pandas as pd
+import numpy as np
 
 from omega_effects.general.general_functions import read_input_file
 from omega_effects.general.general_functions import calc_rebound_effect
@@ -21,7 +22,11 @@ class VehicleAnnualData:
     """
     def __init__(self):
         self._dict = dict()
+        self._df = pd.DataFrame()
+        self._calendar_year_rows = dict()  # row positions in _df by calendar year
+        self._calendar_year_index = dict()  # _dict entries by calendar year
         self.vad_adjusted = dict()
+        self._adjusted_calendar_year_index = dict()  # vad_adjusted entries by calendar year
 
     def init_from_file(self, filepath, effects_log):
         """
@@ -46,6 +51,13 @@ class VehicleAnnualData:
 
         self._dict = df.to_dict('index')
 
+        self._calendar_year_index = dict()
+        for k, v in self._dict.items():
+            self._calendar_year_index.setdefault(k[1], dict())[k] = v
+
+        self._df = df.reset_index(drop=True)
+        self._calendar_year_rows = self._df.groupby('calendar_year', sort=False).indices
+
     def get_vehicle_annual_data_by_calendar_year(self, calendar_year):
         """
         Get vehicle annual data by calendar year.
@@ -57,7 +69,7 @@ class VehicleAnnualData:
             Vehicle annual data for the given calendar year.
 
         """
-        return [v for k, v in self._dict.items() if k[1] == calendar_year]
+        return list(self._calendar_year_index.get(calendar_year, dict()).values())
 
     def get_adjusted_vehicle_annual_data_by_calendar_year(self, calendar_year):
         """
@@ -70,7 +82,41 @@ class VehicleAnnualData:
             Adjusted vehicle annual data for the given calendar year.
 
         """
-        return [v for k, v in self.vad_adjusted.items() if k[1] == calendar_year]
+        return list(self._adjusted_calendar_year_index.get(calendar_year, dict()).values())
+
+    def get_vehicle_annual_data_arrays_by_calendar_year(self, calendar_year, *attribute_names):
+        """
+        Get columnar vehicle annual data by calendar year.
+
+        Args:
+            calendar_year (int): the calendar year to retrieve data for
+            *attribute_names: the attribute names to retrieve
+
+        Returns:
+            A dictionary of numpy arrays by attribute name, rows are in the same order as
+            ``get_vehicle_annual_data_by_calendar_year()``.
+
+        """
+        rows = self._calendar_year_rows.get(calendar_year, np.array([], dtype=int))
+
+        return {attribute_name: self._df[attribute_name].values[rows] for attribute_name in attribute_names}
+
+    def get_adjusted_vehicle_annual_data_arrays_by_calendar_year(self, calendar_year, *attribute_names):
+        """
+        Get columnar adjusted vehicle annual data by calendar year.
+
+        Args:
+            calendar_year (int): the calendar year to retrieve data for
+            *attribute_names: the attribute names to retrieve
+
+        Returns:
+            A dictionary of numpy arrays by attribute name, rows are in the same order as
+            ``get_adjusted_vehicle_annual_data_by_calendar_year()``.
+
+        """
+        vads = self.get_adjusted_vehicle_annual_data_by_calendar_year(calendar_year)
+
+        return {attribute_name: np.array([v[attribute_name] for v in vads]) for attribute_name in attribute_names}
 
     def get_vehicle_annual_data_by_vehicle_id(self, calendar_year, vehicle_id, *attribute_names):
         """
@@ -217,3 +263,5 @@ class VehicleAnnualData:
                             'vmt_rebound': vmt_rebound,
                         }
                         self.vad_adjusted[(vehicle_id, calendar_year, age)] = update_dict
+                        self._adjusted_calendar_year_index.setdefault(calendar_year, dict())[
+                            (vehicle_id, calendar_year, age)] = update_dict
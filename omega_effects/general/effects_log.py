@@ -16,9 +16,9 @@ class EffectsLog:
     Effects log class definition.
 
     """
-    def __init__(self):
+    def __init__(self, file_name='effects_messages.log'):
         self.logfile_name = None
-        self.file_name = 'effects_messages.log'
+        self.file_name = file_name
 
     def init_logfile(self, path):
         """
@@ -54,3 +54,72 @@ class EffectsLog:
                 log.write(str(message) + terminator)
             if echo_console:
                 print(message)
+
+    def append_logfile(self, effects_log):
+        """
+
+        Args:
+            effects_log: an instance of the EffectsLog class, e.g. the session log of a pool worker process.
+
+        Returns:
+            Nothing. Appends the messages of effects_log to logfile, without echoing them to the console, and removes
+            the effects_log logfile.
+
+        """
+        if effects_log.logfile_name.exists():
+            with open(effects_log.logfile_name, 'r') as other_log, open(self.logfile_name, 'a') as log:
+                log.write(other_log.read())
+            effects_log.logfile_name.unlink()
+
+
+if __name__ == '__main__':
+    try:
+        # sessions run in 2 pool worker processes versus sessions run sequentially, including the batch log
+        import multiprocessing
+        import tempfile
+        import time
+        from pathlib import Path
+        from types import SimpleNamespace
+
+        import pandas as pd
+
+        from omega_effects import omega_effects_main
+
+        def test_run_session(batch_settings, session_num, context_fuel_cpm_dict, path_of_run_folder, effects_log):
+            for step in range(5):
+                effects_log.logwrite(f'session {session_num} step {step}', echo_console=False)
+                time.sleep(0.01 * (len(batch_settings.session_dict) - session_num))
+
+            return {'annual_safety_effects': pd.DataFrame({'session_num': [session_num], 'step': [step]})}
+
+        # pool worker processes inherit the test session function
+        multiprocessing.set_start_method('fork')
+        omega_effects_main.run_session = test_run_session
+
+        test_logs = dict()
+        test_results = dict()
+        for session_processes in [1, 2]:
+            test_path = Path(tempfile.mkdtemp())
+            test_logs[session_processes] = EffectsLog()
+            test_logs[session_processes].init_logfile(test_path)
+            test_batch = SimpleNamespace(session_dict={0: 'context', 1: 'no_action', 2: 'action_1'},
+                                         session_processes=session_processes)
+
+            test_results[session_processes] = omega_effects_main.run_sessions(
+                test_batch, dict(), test_path, test_logs[session_processes])
+
+            assert list(test_path.iterdir()) == [test_logs[session_processes].logfile_name]
+
+        for serial_result, pool_result in zip(test_results[1], test_results[2]):
+            pd.testing.assert_frame_equal(serial_result['annual_safety_effects'], pool_result['annual_safety_effects'])
+
+        with open(test_logs[1].logfile_name) as serial_log, open(test_logs[2].logfile_name) as pool_log:
+            assert ['Running 2 sessions at a time\n'] + serial_log.readlines() == pool_log.readlines()
+
+        print('session logs test passed')
+
+    except:
+        import os
+        import traceback
+        print("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
+        os._exit(-1)
@@ -12,6 +12,7 @@ import shutil
 import pandas as pd
 
 from time import time
+from multiprocessing import Pool
 from datetime import datetime
 
 from omega_effects.set_paths import SetPaths
@@ -26,14 +27,246 @@ from omega_effects.general.file_id_and_save import add_id_to_csv, save_file
 from omega_effects.effects.vmt_adjustments import AdjustmentsVMT
 from omega_effects.effects.context_fuel_cost_per_mile import calc_fuel_cost_per_mile
 from omega_effects.effects.safety_effects import calc_safety_effects, calc_legacy_fleet_safety_effects, calc_annual_avg_safety_effects
-from omega_effects.effects.physical_effects import calc_physical_effects, calc_legacy_fleet_physical_effects, \
-    calc_annual_physical_effects, calc_period_consumer_physical_view
-from omega_effects.effects.cost_effects import calc_cost_effects, calc_annual_cost_effects, calc_period_consumer_view
+from omega_effects.effects.physical_effects import calc_physical_effects_columnar, \
+    calc_legacy_fleet_physical_effects, calc_annual_physical_effects, calc_period_consumer_physical_view
+from omega_effects.effects.cost_effects import calc_cost_effects_columnar, calc_annual_cost_effects, \
+    calc_period_consumer_view
 
 from omega_effects.effects.discounting import Discounting
 from omega_effects.effects.benefits import calc_benefits
 from omega_effects.effects.sum_social_effects import calc_social_effects
 
+_pool_process_data = dict()  # batch data shared by all sessions, sent once to each pool worker process
+
+
+def run_session(batch_settings, session_num, context_fuel_cpm_dict, path_of_run_folder, effects_log):
+    """
+    Calculate the safety, physical and cost effects of a session.
+
+    Args:
+        batch_settings: an instance of the BatchSettings class.
+        session_num (int): the session number.
+        context_fuel_cpm_dict: dictionary; the context session fuel costs per mile by vehicle_id and age.
+        path_of_run_folder: the Path object of the run output folder.
+        effects_log: an instance of the EffectsLog class.
+
+    Returns:
+        A dictionary of the session annual safety, physical and cost effects and model year period physical and cost
+        effects DataFrames.
+
+    """
+    session_settings = SessionSettings()
+    session_settings.get_session_settings(batch_settings, session_num, effects_log)
+    session_name = session_settings.session_name
+    if batch_settings.save_input_files:
+        copy_files(session_settings.inputs_filelist, path_of_run_folder / f'{session_name}_inputs')
+
+    # vmt adjustments to vehicle annual data ___________________________________________________________________________
+    effects_log.logwrite(f'\nCalculating vmt adjustments for session {session_name}')
+    vmt_adjustments_session = AdjustmentsVMT()
+    vmt_adjustments_session.calc_vmt_adjustments(batch_settings, session_settings)
+
+    effects_log.logwrite(f'\nAdjusting analysis fleet VMT for {session_name}')
+    session_settings.vehicle_annual_data.adjust_vad(batch_settings, session_settings,
+                                                    vmt_adjustments_session, context_fuel_cpm_dict)
+
+    effects_log.logwrite(f'\nAdjusting legacy fleet VMT and stock for {session_name}')
+    batch_settings.legacy_fleet.adjust_legacy_fleet_stock_and_vmt(batch_settings, vmt_adjustments_session)
+
+    # safety effects ___________________________________________________________________________________________________
+    # legacy fleet effects are reused from an earlier session with the same vmt and stock adjustments and rates
+    legacy_fleet_safety_effects_key = \
+        batch_settings.legacy_fleet.get_safety_effects_key(session_settings, vmt_adjustments_session)
+    legacy_fleet_safety_effects_dict = \
+        batch_settings.legacy_fleet.get_cached_safety_effects(legacy_fleet_safety_effects_key, session_settings)
+    if legacy_fleet_safety_effects_dict is None:
+        effects_log.logwrite(f'\nCalculating legacy fleet safety effects for {session_name}')
+        legacy_fleet_safety_effects_dict = calc_legacy_fleet_safety_effects(batch_settings, session_settings)
+        batch_settings.legacy_fleet.cache_effects(legacy_fleet_safety_effects_key, legacy_fleet_safety_effects_dict)
+    else:
+        effects_log.logwrite(f'\nReusing legacy fleet safety effects for {session_name}')
+
+    effects_log.logwrite(f'Calculating analysis fleet safety effects for {session_name}')
+    analysis_fleet_safety_effects_dict = calc_safety_effects(batch_settings, session_settings)
+
+    session_safety_effects_dict = {**analysis_fleet_safety_effects_dict, **legacy_fleet_safety_effects_dict}
+
+    session_safety_effects_df = \
+        pd.DataFrame.from_dict(session_safety_effects_dict, orient='index').reset_index(drop=True)
+
+    if batch_settings.save_vehicle_safety_effects_files:
+        effects_log.logwrite(f'Saving safety effects file for {session_name}')
+        save_file(session_settings, session_safety_effects_df, path_of_run_folder, 'safety_effects',
+                  effects_log, extension=batch_settings.file_format)
+
+    effects_log.logwrite(f'\nCalculating annual safety effects for {session_name}')
+    session_annual_safety_effects_df = calc_annual_avg_safety_effects(session_safety_effects_df)
+
+    # physical effects _________________________________________________________________________________________________
+    effects_log.logwrite(f'\nCalculating analysis fleet physical effects for {session_name}')
+    analysis_fleet_physical_effects_df \
+        = calc_physical_effects_columnar(batch_settings, session_settings, analysis_fleet_safety_effects_dict)
+
+    legacy_fleet_physical_effects_key = \
+        batch_settings.legacy_fleet.get_physical_effects_key(session_settings, legacy_fleet_safety_effects_key)
+    legacy_fleet_physical_effects_df = \
+        batch_settings.legacy_fleet.get_cached_physical_effects(legacy_fleet_physical_effects_key, session_settings)
+    if legacy_fleet_physical_effects_df is None:
+        effects_log.logwrite(f'Calculating legacy fleet physical effects for {session_name}')
+        legacy_fleet_physical_effects_dict \
+            = calc_legacy_fleet_physical_effects(batch_settings, session_settings, legacy_fleet_safety_effects_dict)
+        legacy_fleet_physical_effects_df = \
+            pd.DataFrame.from_dict(legacy_fleet_physical_effects_dict, orient='index')
+        batch_settings.legacy_fleet.cache_effects(
+            legacy_fleet_physical_effects_key, legacy_fleet_physical_effects_df)
+    else:
+        effects_log.logwrite(f'Reusing legacy fleet physical effects for {session_name}')
+
+    session_physical_effects_df = pd.concat(
+        [analysis_fleet_physical_effects_df, legacy_fleet_physical_effects_df], axis=0, ignore_index=True)
+
+    if batch_settings.save_vehicle_physical_effects_files:
+        effects_log.logwrite(f'Saving physical effects file for {session_name}')
+        save_file(session_settings, session_physical_effects_df, path_of_run_folder, 'physical_effects', effects_log,
+                  extension=batch_settings.file_format)
+
+    effects_log.logwrite(f'\nCalculating annual physical effects for {session_name}')
+    session_annual_physical_effects_df = calc_annual_physical_effects(batch_settings, session_physical_effects_df)
+
+    effects_log.logwrite(f'\nCalculating model year period_duration physical effects for {session_name}')
+    session_my_period_physical_effects_df = \
+        calc_period_consumer_physical_view(batch_settings, session_physical_effects_df)
+
+    # cost effects _____________________________________________________________________________________________________
+    effects_log.logwrite(f'\nCalculating cost effects for {session_name}')
+    session_cost_effects_df = calc_cost_effects_columnar(batch_settings, session_settings,
+                                                         session_physical_effects_df, context_fuel_cpm_dict)
+
+    if batch_settings.save_vehicle_cost_effects_files:
+        effects_log.logwrite(f'Saving cost effects file for {session_name}')
+        save_file(session_settings, session_cost_effects_df, path_of_run_folder, 'cost_effects', effects_log,
+                  extension=batch_settings.file_format)
+
+    effects_log.logwrite(f'\nCalculating annual costs effects for {session_name}')
+    session_annual_cost_effects_df = calc_annual_cost_effects(session_cost_effects_df)
+
+    effects_log.logwrite(f'\nCalculating model year period_duration cost effects for {session_name}')
+    session_my_period_cost_effects_df = calc_period_consumer_view(batch_settings, session_cost_effects_df)
+
+    return {
+        'annual_safety_effects': session_annual_safety_effects_df,
+        'annual_physical_effects': session_annual_physical_effects_df,
+        'annual_cost_effects': session_annual_cost_effects_df,
+        'my_period_physical_effects': session_my_period_physical_effects_df,
+        'my_period_cost_effects': session_my_period_cost_effects_df,
+    }
+
+
+def get_session_log(path_of_run_folder, session_num):
+    """
+    Get the log of a session run in a pool worker process, so that concurrent sessions don't interleave their messages
+    in the batch log.
+
+    Args:
+        path_of_run_folder: the Path object of the run output folder.
+        session_num (int): the session number.
+
+    Returns:
+        An instance of the EffectsLog class.
+
+    """
+    session_log = EffectsLog(file_name=f'effects_messages_session_{session_num}.log')
+    session_log.init_logfile(path_of_run_folder)
+
+    return session_log
+
+
+def init_pool_process(batch_settings, context_fuel_cpm_dict, path_of_run_folder):
+    """
+    Initialize a pool worker process with the batch data shared by all sessions, so it's sent to each worker once
+    rather than with each session.
+
+    Args:
+        batch_settings: an instance of the BatchSettings class.
+        context_fuel_cpm_dict: dictionary; the context session fuel costs per mile by vehicle_id and age.
+        path_of_run_folder: the Path object of the run output folder.
+
+    """
+    _pool_process_data['batch_settings'] = batch_settings
+    _pool_process_data['context_fuel_cpm_dict'] = context_fuel_cpm_dict
+    _pool_process_data['path_of_run_folder'] = path_of_run_folder
+
+
+def run_session_process(session_num):
+    """
+    Run a session in a pool worker process, see ``run_session()`` and ``init_pool_process()``.  Session messages are
+    written to the session log, see ``get_session_log()``.
+
+    Args:
+        session_num (int): the session number.
+
+    Returns:
+        The session effects DataFrames, see ``run_session()``.
+
+    """
+    session_log = get_session_log(_pool_process_data['path_of_run_folder'], session_num)
+
+    try:
+        return run_session(_pool_process_data['batch_settings'], session_num,
+                           _pool_process_data['context_fuel_cpm_dict'], _pool_process_data['path_of_run_folder'],
+                           session_log)
+    except SystemExit:
+        # sys.exit() would end the worker without a result, leaving the main process waiting for it
+        raise RuntimeError(f'Session {session_num} exited, see {session_log.logfile_name}')
+
+
+def run_sessions(batch_settings, context_fuel_cpm_dict, path_of_run_folder, effects_log):
+    """
+    Run the batch sessions, in pool worker processes if the batch settings allow more than one session at a time.
+
+    Args:
+        batch_settings: an instance of the BatchSettings class.
+        context_fuel_cpm_dict: dictionary; the context session fuel costs per mile by vehicle_id and age.
+        path_of_run_folder: the Path object of the run output folder.
+        effects_log: an instance of the EffectsLog class.
+
+    Returns:
+        A list of the session effects DataFrames, see ``run_session()``, in session order.
+
+    Note:
+        The session logs of pool worker processes are appended to effects_log in session order, so the batch log
+        reads the same as a sequential run.  The session log of a failed session is kept.
+
+    """
+    num_processes = max(1, min(len(batch_settings.session_dict), batch_settings.session_processes))
+    if num_processes > 1:
+        effects_log.logwrite(f'Running {num_processes} sessions at a time')
+
+        # the pool is terminated on the way out of the with block if a session fails
+        with Pool(processes=num_processes, initializer=init_pool_process,
+                  initargs=[batch_settings, context_fuel_cpm_dict, path_of_run_folder]) as pool:
+
+            results = dict()
+            for session_num in batch_settings.session_dict:
+                results[session_num] = pool.apply_async(func=run_session_process, args=[session_num])
+
+            pool.close()
+
+            # collect results in session order so the batch matches a sequential run
+            session_results = []
+            for session_num in batch_settings.session_dict:
+                session_results.append(results[session_num].get())
+                effects_log.append_logfile(get_session_log(path_of_run_folder, session_num))
+
+            pool.join()
+    else:
+        session_results = [
+            run_session(batch_settings, session_num, context_fuel_cpm_dict, path_of_run_folder, effects_log)
+            for session_num in batch_settings.session_dict
+        ]
+
+    return session_results
+
 
 def main():
     """
@@ -96,135 +329,35 @@ def main():
         save_file(session_settings, context_fuel_cpm_df, path_of_run_folder, 'context_fuel_cost_per_mile',
                   effects_log, extension=batch_settings.file_format)
 
-    # loop thru sessions to calc safety effects, physical effects, cost effects for each _______________________________
-    annual_safety_effects_df = pd.DataFrame()
-    annual_physical_effects_df = pd.DataFrame()
-    annual_cost_effects_df = pd.DataFrame()
-    my_lifetime_physical_effects_df = pd.DataFrame()
-    my_lifetime_cost_effects_df = pd.DataFrame()
-
+    # run sessions to calc safety effects, physical effects, cost effects for each ___________________________________
     effects_log.logwrite(f'\nStarting work on sessions')
-    for session_num in batch_settings.session_dict:
-
-        session_settings = SessionSettings()
-        session_settings.get_session_settings(batch_settings, session_num, effects_log)
-        session_name = session_settings.session_name
-        if batch_settings.save_input_files:
-            copy_files(session_settings.inputs_filelist, path_of_run_folder / f'{session_name}_inputs')
-
-        # vmt adjustments to vehicle annual data _______________________________________________________________________
-        effects_log.logwrite(f'\nCalculating vmt adjustments for session {session_name}')
-        vmt_adjustments_session = AdjustmentsVMT()
-        vmt_adjustments_session.calc_vmt_adjustments(batch_settings, session_settings)
-
-        effects_log.logwrite(f'\nAdjusting analysis fleet VMT for {session_name}')
-        session_settings.vehicle_annual_data.adjust_vad(batch_settings, session_settings,
-                                                        vmt_adjustments_session, context_fuel_cpm_dict)
-
-        effects_log.logwrite(f'\nAdjusting legacy fleet VMT and stock for {session_name}')
-        batch_settings.legacy_fleet.adjust_legacy_fleet_stock_and_vmt(batch_settings, vmt_adjustments_session)
-
-        # safety effects _______________________________________________________________________________________________
-        effects_log.logwrite(f'\nCalculating legacy fleet safety effects for {session_name}')
-        legacy_fleet_safety_effects_dict = calc_legacy_fleet_safety_effects(batch_settings, session_settings)
-
-        effects_log.logwrite(f'Calculating analysis fleet safety effects for {session_name}')
-        analysis_fleet_safety_effects_dict = calc_safety_effects(batch_settings, session_settings)
-
-        session_safety_effects_dict = {**analysis_fleet_safety_effects_dict, **legacy_fleet_safety_effects_dict}
-
-        session_safety_effects_df = \
-            pd.DataFrame.from_dict(session_safety_effects_dict, orient='index').reset_index(drop=True)
-
-        if batch_settings.save_vehicle_safety_effects_files:
-            effects_log.logwrite(f'Saving safety effects file for {session_name}')
-            save_file(session_settings, session_safety_effects_df, path_of_run_folder, 'safety_effects',
-                      effects_log, extension=batch_settings.file_format)
-
-        effects_log.logwrite(f'\nCalculating annual safety effects for {session_name}')
-        session_annual_safety_effects_df = calc_annual_avg_safety_effects(session_safety_effects_df)
-
-        # create an annual_safety_effects_df
-        annual_safety_effects_df \
-            = pd.concat([annual_safety_effects_df, session_annual_safety_effects_df], axis=0, ignore_index=True)
-        annual_safety_effects_df.reset_index(inplace=True, drop=True)
-
-        # physical effects _____________________________________________________________________________________________
-        effects_log.logwrite(f'\nCalculating analysis fleet physical effects for {session_name}')
-        analysis_fleet_physical_effects_dict \
-            = calc_physical_effects(batch_settings, session_settings, analysis_fleet_safety_effects_dict)
-
-        effects_log.logwrite(f'Calculating legacy fleet physical effects for {session_name}')
-        legacy_fleet_physical_effects_dict \
-            = calc_legacy_fleet_physical_effects(batch_settings, session_settings, legacy_fleet_safety_effects_dict)
-
-        session_physical_effects_dict = {**analysis_fleet_physical_effects_dict, **legacy_fleet_physical_effects_dict}
-
-        session_physical_effects_df = \
-            pd.DataFrame.from_dict(session_physical_effects_dict, orient='index').reset_index(drop=True)
-
-        if batch_settings.save_vehicle_physical_effects_files:
-            effects_log.logwrite(f'Saving physical effects file for {session_name}')
-            save_file(session_settings, session_physical_effects_df, path_of_run_folder, 'physical_effects', effects_log,
-                      extension=batch_settings.file_format)
-
-        effects_log.logwrite(f'\nCalculating annual physical effects for {session_name}')
-        session_annual_physical_effects_df = calc_annual_physical_effects(batch_settings, session_physical_effects_df)
-
-        effects_log.logwrite(f'\nCalculating model year period_duration physical effects for {session_name}')
-        session_my_period_physical_effects_df = \
-            calc_period_consumer_physical_view(batch_settings, session_physical_effects_df)
-
-        # for use in benefits calcs, create an annual_physical_effects_df
-        annual_physical_effects_df \
-            = pd.concat([annual_physical_effects_df, session_annual_physical_effects_df], axis=0, ignore_index=True)
-        annual_physical_effects_df.reset_index(inplace=True, drop=True)
-
-        # for use in consumer calcs, create a my_lifetime_physical_effects_df of lifetime physical effects
-        my_lifetime_physical_effects_df = \
-            pd.concat([my_lifetime_physical_effects_df, session_my_period_physical_effects_df],
-                      axis=0, ignore_index=True)
-        my_lifetime_physical_effects_df.reset_index(inplace=True, drop=True)
-
-        # cost effects _________________________________________________________________________________________________
-        effects_log.logwrite(f'\nCalculating cost effects for {session_name}')
-        session_cost_effects_dict = {}
-        session_cost_effects_dict.update(
-            calc_cost_effects(batch_settings, session_settings, session_physical_effects_dict, context_fuel_cpm_dict))
-
-        session_cost_effects_df = pd.DataFrame.from_dict(session_cost_effects_dict, orient='index').reset_index(drop=True)
-
-        if batch_settings.save_vehicle_cost_effects_files:
-            effects_log.logwrite(f'Saving cost effects file for {session_name}')
-            save_file(session_settings, session_cost_effects_df, path_of_run_folder, 'cost_effects', effects_log,
-                      extension=batch_settings.file_format)
-
-        effects_log.logwrite(f'\nCalculating annual costs effects for {session_name}')
-        session_annual_cost_effects_df = calc_annual_cost_effects(session_cost_effects_df)
+    session_results = run_sessions(batch_settings, context_fuel_cpm_dict, path_of_run_folder, effects_log)
 
-        effects_log.logwrite(f'\nCalculating model year period_duration cost effects for {session_name}')
-        session_my_period_cost_effects_df = calc_period_consumer_view(batch_settings, session_cost_effects_df)
+    annual_safety_effects_df = \
+        pd.concat([r['annual_safety_effects'] for r in session_results], axis=0, ignore_index=True)
 
-        # for use in benefits calcs, create an annual_cost_effects_df of undiscounted annual costs
-        annual_cost_effects_df \
-            = pd.concat([annual_cost_effects_df, session_annual_cost_effects_df], axis=0, ignore_index=True)
-        annual_cost_effects_df.reset_index(inplace=True, drop=True)
+    # for use in benefits calcs, an annual_physical_effects_df and an annual_cost_effects_df of undiscounted costs
+    annual_physical_effects_df = \
+        pd.concat([r['annual_physical_effects'] for r in session_results], axis=0, ignore_index=True)
+    annual_cost_effects_df = \
+        pd.concat([r['annual_cost_effects'] for r in session_results], axis=0, ignore_index=True)
 
-        # for use in consumer calcs, create a my_lifetime_cost_effects_df of lifetime costs
-        my_lifetime_cost_effects_df = pd.concat([my_lifetime_cost_effects_df, session_my_period_cost_effects_df],
-                                                axis=0, ignore_index=True)
-        my_lifetime_cost_effects_df.reset_index(inplace=True, drop=True)
+    # for use in consumer calcs, a my_lifetime_physical_effects_df and a my_lifetime_cost_effects_df of lifetime values
+    my_lifetime_physical_effects_df = \
+        pd.concat([r['my_period_physical_effects'] for r in session_results], axis=0, ignore_index=True)
+    my_lifetime_cost_effects_df = \
+        pd.concat([r['my_period_cost_effects'] for r in session_results], axis=0, ignore_index=True)
 
     # discount annual costs ____________________________________________________________________________________________
     effects_log.logwrite('\nCalculating discounted annual costs, PVs and EAVs for the batch')
     discounted_costs = Discounting()
-    discounted_costs.discount_annual_values(batch_settings, annual_cost_effects_df)
-    discounted_costs.calc_present_values(batch_settings)
-    discounted_costs.calc_annualized_values(batch_settings)
-    discounted_costs_dict = \
-        {**discounted_costs.annual_values_dict, **discounted_costs.pv_dict, **discounted_costs.eav_dict}
+    discounted_costs.discount_annual_values_columnar(batch_settings, annual_cost_effects_df)
+    discounted_costs.calc_present_values_columnar(batch_settings)
+    discounted_costs.calc_annualized_values_columnar(batch_settings)
 
-    discounted_costs_df = pd.DataFrame.from_dict(discounted_costs_dict, orient='index')
+    discounted_costs_df = pd.concat(
+        [discounted_costs.annual_values_df, discounted_costs.pv_df, discounted_costs.eav_df],
+        axis=0, ignore_index=True)
 
     # calculate annual benefits and annual physical effects deltas _____________________________________________________
     effects_log.logwrite(f'\nCalculating annual benefits for the batch')
@@ -241,13 +374,13 @@ def main():
     # discount annual benefits _________________________________________________________________________________________
     effects_log.logwrite('\nCalculating discounted annual benefits, PVs and EAVs for the batch')
     discounted_benefits = Discounting()
-    discounted_benefits.discount_annual_values(batch_settings, annual_benefits_df)
-    discounted_benefits.calc_present_values(batch_settings)
-    discounted_benefits.calc_annualized_values(batch_settings)
-    discounted_benefits_dict = \
-        {**discounted_benefits.annual_values_dict, **discounted_benefits.pv_dict, **discounted_benefits.eav_dict}
+    discounted_benefits.discount_annual_values_columnar(batch_settings, annual_benefits_df)
+    discounted_benefits.calc_present_values_columnar(batch_settings)
+    discounted_benefits.calc_annualized_values_columnar(batch_settings)
 
-    discounted_benefits_df = pd.DataFrame.from_dict(discounted_benefits_dict, orient='index')
+    discounted_benefits_df = pd.concat(
+        [discounted_benefits.annual_values_df, discounted_benefits.pv_df, discounted_benefits.eav_df],
+        axis=0, ignore_index=True)
 
     # summarize costs, benefits and net benefits _______________________________________________________________________
     effects_log.logwrite('\nSummarizing social effects and calculating net benefits')
@@ -192,11 +192,16 @@ try:
             self.producer_compliance_search_convergence_factor = 0.9
             self.producer_compliance_search_tolerance = 1e-6
             self.producer_compliance_search_multipoint = True  # disable for zevregion batches
+            self.producer_compliance_search_warm_start = False
+            self.producer_compliance_search_warm_start_share_range = 0.1
             self.producer_cross_subsidy_price_tolerance = 5e-3
+            self.producer_cross_subsidy_search_mode = 'grid'  # 'grid' search or 'root' finding, see omega.py
             self.producer_strategic_compliance_buffer = 0.0
             self.run_profiler = False
             self.multiprocessing = True and not self.run_profiler and not getattr(sys, 'frozen', False)
             self.non_context_session_process_scaler = 1
+            self.parallel_manufacturer_runs = False  # run unconsolidated compliance IDs in parallel on later passes
+            self.parallel_manufacturer_processes = None  # number of parallel manufacturer run processes, None = auto
             self.flat_context = False
             self.flat_context_year = 2021
 
@@ -220,7 +225,7 @@ try:
             self.verbose_console_modules = ['producer_compliance_search_',
                                             'p-c_shares_and_costs_', 'p-c_max_iterations_',
                                             'cross_subsidy_search_', 'cross_subsidy_multipliers_',
-                                            'cross_subsidy_convergence_']
+                                            'cross_subsidy_convergence_', 'pool_scheduler_']
 
             self.verbose_postproc = ['iteration_']
 
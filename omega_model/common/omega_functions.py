@@ -184,6 +184,171 @@ def calc_frontier(cloud, x_key, y_key, allow_upslope=False, invert_x_axis=True):
         Cost cloud and frontier, ``o2.options.cost_curve_frontier_affinity_factor=0.75`` ``allow_upslope=False``
         Default affinity factor, no up-slope
 
+    See Also:
+        ``calc_frontier_indices()`` which does the actual work on plain numpy arrays
+
+    """
+    cloud_non_numeric_columns = omega_globals.options.CostCloud.cloud_non_numeric_columns
+
+    if len(cloud) > 1:
+        # drop non-numeric columns so dtypes don't become "object"
+        cloud = cloud.drop(columns=cloud_non_numeric_columns, errors='ignore')
+
+        frontier_indices, frontier_factors, x_norm, y_norm = \
+            calc_frontier_indices(cloud[x_key].values, cloud[y_key].values, allow_upslope=allow_upslope,
+                                  invert_x_axis=invert_x_axis)
+
+        frontier_df = cloud.iloc[frontier_indices].copy()
+        frontier_df['y_norm'] = y_norm[frontier_indices]
+        frontier_df['x_norm'] = x_norm[frontier_indices]
+        if len(frontier_indices) > 1:
+            frontier_df['frontier_factor'] = frontier_factors
+    else:
+        frontier_df = cloud
+
+    return frontier_df
+
+
+def calc_frontier_indices(x, y, allow_upslope=False, invert_x_axis=True, affinity_factor=None):
+    """
+    Calculate the frontier of a cloud of points represented by numpy arrays.
+
+    The cloud is sorted by normalized x-value once, after which each step of the frontier walk only has to consider
+    the sorted points beyond the prior frontier point (a contiguous slice) instead of culling and re-indexing a
+    DataFrame.  Selection rules (frontier factor, affinity factor, up-slope handling and tie-breaking) are the same
+    as ``calc_frontier_iterative()``, so the same points are returned.
+
+    Args:
+        x (numpy.array): x-axis data
+        y (numpy.array): y-axis data
+        allow_upslope (bool): allow U-shaped frontier if ``True``
+        invert_x_axis (bool): invert x-axis if ``True``
+        affinity_factor (float): frontier affinity factor, defaults to
+            ``omega_globals.options.cost_curve_frontier_affinity_factor``
+
+    Returns:
+        Tuple of frontier point positions (in frontier order), the frontier factor of each frontier point (``nan``
+        for the starting point), the normalized x-values and the normalized y-values of the cloud
+
+    """
+    if affinity_factor is None:
+        affinity_factor = omega_globals.options.cost_curve_frontier_affinity_factor
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+
+    if invert_x_axis:
+        x_sign = -1
+    else:
+        x_sign = 1
+
+    # normalize data (helps with up-slope frontier)
+    y_norm = (y - y.min()) / (y.max() - y.min())
+    x_norm = x_sign * ((x - x.min()) / (x.max() - x.min()))
+
+    # find frontier starting point, lowest x-value, and add to frontier
+    idxmin = int(np.nanargmin(x_norm))
+    frontier_indices = [idxmin]
+    frontier_factors = [np.nan]
+
+    if x_norm.min() != x_norm.max():
+        # stable sort keeps original cloud order within identical x-values
+        sort_order = np.argsort(x_norm, kind='stable')
+        x_sorted = x_norm[sort_order]
+        y_sorted = y_norm[sort_order]
+
+        min_frontier_factor = 0
+        remaining = len(x_norm)
+
+        while (min_frontier_factor <= 0 or allow_upslope) and not np.isinf(min_frontier_factor) and remaining:
+            prior_x = x_norm[frontier_indices[-1]]
+            prior_y = y_norm[frontier_indices[-1]]
+
+            # remaining points are the ones to the right of the prior frontier point
+            start = np.searchsorted(x_sorted, prior_x, side='right')
+            remaining = len(x_sorted) - start
+
+            if remaining:
+                x_remaining = x_sorted[start:]
+                y_remaining = y_sorted[start:]
+
+                # calculate frontier factor (more negative is more better) = slope of each point relative
+                # to prior frontier point if frontier_social_affinity_factor = 1.0, else a "weighted" slope
+                frontier_factor = (y_remaining - prior_y) / (x_remaining - prior_x) ** affinity_factor
+                min_frontier_factor = frontier_factor.min()
+
+                if min_frontier_factor > 0 and allow_upslope:
+                    # frontier factor is different for up-slope (swap x & y and invert "y")
+                    frontier_factor = (prior_x - x_remaining) / (y_remaining - prior_y) ** affinity_factor
+                    min_frontier_factor = frontier_factor.min()
+
+                idx = _select_frontier_point(sort_order[start:], frontier_factor, min_frontier_factor, x_norm)
+
+                if allow_upslope or min_frontier_factor <= 0:
+                    frontier_indices.append(sort_order[start + idx])
+                    frontier_factors.append(frontier_factor[idx])
+
+    if invert_x_axis:
+        frontier_indices.reverse()
+        frontier_factors.reverse()
+
+    return np.array(frontier_indices, dtype=int), np.array(frontier_factors), x_norm, y_norm
+
+
+def _select_frontier_point(cloud_positions, frontier_factor, min_frontier_factor, x_norm):
+    """
+    Select the next frontier point from the remaining points, using the same rules as ``get_idxmin()``.
+
+    Args:
+        cloud_positions (numpy.array): original cloud positions of the remaining points
+        frontier_factor (numpy.array): frontier factor of the remaining points
+        min_frontier_factor (float): the minimum value of the frontier_factor
+        x_norm (numpy.array): normalized x-values of the whole cloud
+
+    Returns:
+        Position of the selected point within ``frontier_factor``
+
+    """
+    if not np.isnan(min_frontier_factor) and not np.isinf(min_frontier_factor):
+        candidates = np.flatnonzero(frontier_factor == min_frontier_factor)
+        if len(candidates) == 1:
+            # the usual case, a unique minimum doesn't depend on the order of the points
+            return candidates[0]
+
+    # ties, infinities and nans are resolved in original cloud order, same as get_idxmin()
+    cloud_order = np.argsort(cloud_positions, kind='stable')
+    ff_cloud_order = frontier_factor[cloud_order]
+
+    if np.isinf(min_frontier_factor):
+        pos = np.argmax(ff_cloud_order)
+    elif np.isnan(min_frontier_factor):
+        if np.all(np.isnan(ff_cloud_order)):
+            pos = len(ff_cloud_order) - 1
+        else:
+            pos = np.nanargmin(ff_cloud_order)
+    else:
+        # if multiple points with the same slope, take the one with the highest x-value
+        candidates = ff_cloud_order == min_frontier_factor
+        pos = np.argmax(x_norm[cloud_positions[cloud_order][candidates]])
+
+    return cloud_order[pos]
+
+
+def calc_frontier_iterative(cloud, x_key, y_key, allow_upslope=False, invert_x_axis=True):
+    """
+    Calculate the frontier of a cloud by iteratively culling the cloud DataFrame.  Reference implementation for
+    ``calc_frontier()``, retained for equivalence testing.
+
+    Args:
+        cloud (DataFrame): a set of points to find the frontier of
+        x_key (str): name of the column holding x-axis data
+        y_key (str): name of the column holding y-axis data
+        allow_upslope (bool): allow U-shaped frontier if ``True``
+        invert_x_axis (bool): invert x-axis if ``True``
+
+    Returns:
+        DataFrame containing the frontier points
+
     """
     cloud_non_numeric_columns = omega_globals.options.CostCloud.cloud_non_numeric_columns
 
@@ -987,6 +1152,34 @@ if __name__ == '__main__':
                          min_constraints={'NO_ALT_BEV': 0.01},
                          max_constraints={'NO_ALT_BEV': 0.01}, verbose=True)
 
+        # frontier equivalence test, vectorized frontier versus iterative reference implementation
+        from omega_model import OMEGASessionSettings
+        from context.rse_cost_clouds import CostCloud
+
+        omega_globals.options = OMEGASessionSettings()
+        omega_globals.options.CostCloud = CostCloud
+
+        rng = np.random.default_rng(0)
+        for test_num in range(200):
+            num_points = rng.integers(2, 500)
+            test_cloud = pd.DataFrame({'x': rng.random(num_points), 'y': rng.random(num_points)})
+            if test_num % 4 == 0:
+                # coarse values to exercise duplicate points and tied frontier factors
+                test_cloud = test_cloud.round(1)
+            for upslope in [False, True]:
+                for invert in [False, True]:
+                    if test_cloud['x'].min() != test_cloud['x'].max():
+                        vectorized = calc_frontier(test_cloud, 'x', 'y', allow_upslope=upslope,
+                                                   invert_x_axis=invert)
+                        iterative = calc_frontier_iterative(test_cloud, 'x', 'y', allow_upslope=upslope,
+                                                            invert_x_axis=invert)
+                        assert list(vectorized.index) == list(iterative.index), \
+                            'frontier mismatch, test %d upslope=%s invert=%s' % (test_num, upslope, invert)
+                        assert np.allclose(vectorized[['x', 'y']].values.astype(float),
+                                           iterative[['x', 'y']].values.astype(float))
+
+        print('calc_frontier equivalence test passed')
+
     except:
         import os
         import traceback
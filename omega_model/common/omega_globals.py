@@ -18,6 +18,10 @@ import sys
 options = None  #: simulation options
 engine = None  #: connection to database engine
 session = None  #: database session
+pool = None  #: persistent multiprocessing worker pool, see ``omega.start_pool()``
+pool_num_processes = 0  #: number of worker processes in the pool
+pool_init_key = None  #: identifies the session input data the pool worker processes were initialized with
+pool_barrier = None  #: barrier shared by the pool worker processes
 pass_num = 0  #: multi-pass pass number
 producer_shares_mode = False  #: producer shares mode when True
 manufacturer_aggregation = False  #: true if manufacturer-level detail in vehicle aggregation
@@ -114,6 +114,17 @@ class OMEGABatchLog(OMEGABase):
         self.logwrite(message, terminator='')
 
 
+def set_logfilename():
+    """
+    Point the session logfile name at the current session output folder, e.g. for a pool worker process that is reused
+    from a prior session.
+
+    """
+    omega_globals.options.logfilename = '%s%s.txt' % (
+        omega_globals.options.output_folder + omega_globals.options.logfile_prefix,
+        omega_globals.options.session_unique_name)
+
+
 def init_logfile():
     """
     Create a session logfile.
@@ -125,9 +136,7 @@ def init_logfile():
 
     file_io.validate_folder(omega_globals.options.output_folder)
 
-    omega_globals.options.logfilename = '%s%s.txt' % (
-        omega_globals.options.output_folder + omega_globals.options.logfile_prefix,
-        omega_globals.options.session_unique_name)
+    set_logfilename()
 
     with open(omega_globals.options.logfilename, 'w') as log:
         log.write('OMEGA %s session %s started at %s %s\n\n' % (
@@ -0,0 +1,218 @@
+"""
+
+**Routines to pass DataFrames to and from the multiprocessing pool through shared memory.**
+
+Pickling DataFrames (e.g. vehicle cost curves) to send them to and from the pool worker processes can take longer
+than the work itself.  A ``SharedDataFrame`` copies the numeric columns of a DataFrame into a
+``multiprocessing.shared_memory`` block, and only the block name, the column layout and any non-numeric columns are
+pickled.
+
+Shared memory blocks created by the main process are released by the main process once the pool work that uses them
+is done.  Shared memory blocks created by pool worker processes (i.e. results) are unlinked by the main process after
+it reads them, and are closed by the worker when it starts work on a later batch, since on Windows a block only
+exists as long as some process holds it open.
+
+----
+
+**CODE**
+
+"""
+
+print('importing %s' % __file__)
+
+import os
+import itertools
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+import pandas as pd
+
+from common.omega_types import OMEGABase
+
+_use_posix = os.name != 'nt'
+
+_batch_ids = itertools.count()
+
+_worker_blocks = []  # shared memory blocks created by this process as a pool worker, as (batch_id, block) tuples
+
+
+def get_batch_id():
+    """
+    Get a new batch id, to identify a batch of pool work.
+
+    Returns:
+        A new batch id
+
+    """
+    return next(_batch_ids)
+
+
+def release_worker_blocks(batch_id=None):
+    """
+    Close the shared memory blocks created by this (pool worker) process for batches other than the given batch.  The
+    main process reads all the results of a batch before it submits the next batch.
+
+    Args:
+        batch_id (int): the current batch id, or ``None`` to close all blocks
+
+    """
+    for block_batch_id, block in list(_worker_blocks):
+        if block_batch_id != batch_id:
+            block.close()
+            _worker_blocks.remove((block_batch_id, block))
+
+
+def get_worker_blocks():
+    """
+    Get the shared memory blocks created by this (pool worker) process so far.
+
+    Returns:
+        List of (batch_id, block) tuples
+
+    """
+    return list(_worker_blocks)
+
+
+def unlink_worker_blocks(keep_blocks=()):
+    """
+    Unlink the shared memory blocks created by this (pool worker) process, other than the given blocks, e.g. the
+    results of jobs that won't be returned to the main process because a later job in the same chunk failed.
+
+    Args:
+        keep_blocks (list): (batch_id, block) tuples of the blocks to keep, see ``get_worker_blocks()``
+
+    """
+    for worker_block in list(_worker_blocks):
+        if worker_block not in keep_blocks:
+            block = worker_block[1]
+            block.close()
+            if _use_posix:
+                # the block was unregistered when it was created, unlink() unregisters it again
+                resource_tracker.register(block._name, 'shared_memory')
+            block.unlink()
+            _worker_blocks.remove(worker_block)
+
+
+def attach_block(name, track=True):
+    """
+    Attach to an existing shared memory block.
+
+    Args:
+        name (str): shared memory block name
+        track (bool): if ``False`` then the block is not registered with the resource tracker, which would otherwise
+            unlink the block when this process exits, even though this process doesn't own it
+
+    Returns:
+        The attached ``multiprocessing.shared_memory.SharedMemory`` block
+
+    """
+    if track:
+        return shared_memory.SharedMemory(name)
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedDataFrame(OMEGABase):
+    """
+    **Picklable handle to a DataFrame whose numeric columns are stored in shared memory.**
+
+    """
+    def __init__(self, df, batch_id=None):
+        """
+        Copy a DataFrame to a new shared memory block.
+
+        Args:
+            df (DataFrame): the DataFrame to share
+            batch_id (int): if not ``None`` then the block is created by a pool worker for the given batch and
+                ownership of the block passes to the main process, otherwise the caller owns the block and must
+                ``release()`` it
+
+        """
+        self.columns = list(df.columns)
+        self.index = df.index
+        self.num_rows = len(df)
+
+        numeric_columns = [c for c in df.columns if df[c].dtype.kind in 'biuf']
+        self.object_data = df[[c for c in df.columns if c not in numeric_columns]]
+
+        self.layout = []
+        nbytes = 0
+        for c in numeric_columns:
+            self.layout.append((c, df[c].dtype.str, nbytes))
+            nbytes += self.num_rows * df[c].dtype.itemsize
+
+        block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        for c, dtype, offset in self.layout:
+            np.ndarray(self.num_rows, dtype=dtype, buffer=block.buf, offset=offset)[:] = df[c].values
+
+        self.name = block.name
+
+        if batch_id is None:
+            self._block = block
+        else:
+            if _use_posix:
+                # the main process unlinks the block after reading it
+                resource_tracker.unregister(block._name, 'shared_memory')
+            release_worker_blocks(batch_id)
+            _worker_blocks.append((batch_id, block))
+
+    def __getstate__(self):
+        """
+        Get the state to pickle, everything but the shared memory block itself.
+
+        Returns:
+            Dict of object attributes
+
+        """
+        state = self.__dict__.copy()
+        state.pop('_block', None)
+        return state
+
+    def to_dataframe(self, unlink=False):
+        """
+        Copy the shared DataFrame out of shared memory.
+
+        Args:
+            unlink (bool): if ``True`` then unlink the block after reading it, e.g. when reading pool worker results
+
+        Returns:
+            A copy of the shared DataFrame
+
+        """
+        block = attach_block(self.name, track=unlink)
+
+        data = dict()
+        for c, dtype, offset in self.layout:
+            data[c] = np.ndarray(self.num_rows, dtype=dtype, buffer=block.buf, offset=offset).copy()
+
+        block.close()
+        if unlink:
+            block.unlink()
+
+        for c in self.object_data:
+            data[c] = self.object_data[c].values
+
+        return pd.DataFrame(data, index=self.index, columns=self.columns)
+
+    def unlink(self):
+        """
+        Unlink the shared memory block of a ``SharedDataFrame`` without reading it, e.g. to discard pool worker
+        results.
+
+        """
+        block = attach_block(self.name)
+        block.close()
+        block.unlink()
+
+    def release(self):
+        """
+        Close and unlink the shared memory block of a ``SharedDataFrame`` created by the calling process.
+
+        """
+        self._block.close()
+        self._block.unlink()
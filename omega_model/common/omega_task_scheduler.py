@@ -0,0 +1,220 @@
+"""
+
+**Routines to schedule batches of jobs on the multiprocessing pool.**
+
+Submitting one pool task per job and waiting on the results in submission order leaves workers idle, due to the
+per-task overhead of many small jobs and due to long running jobs that start late (stragglers).
+``run_pool_jobs()`` estimates the cost (run time) of each job, packs small jobs into chunks of similar cost, submits the
+most costly chunks first and collects the results as they complete using ``imap_unordered()``.
+
+Job cost estimates come from the measured run times of previous batches of the same job type.  A job that ran before
+(i.e. in a previous year, with the same job key) is estimated by its last run time, other jobs are estimated from their
+job size (e.g. vehicle count or cost cloud size) and the average seconds per unit of job size of the job type.
+
+Per-job run times and per-batch stats are kept in ``job_stats``.
+
+----
+
+**CODE**
+
+"""
+
+print('importing %s' % __file__)
+
+import time
+
+from common import omega_globals, omega_log
+from common.omega_shared_memory import get_worker_blocks, unlink_worker_blocks
+
+chunks_per_process = 4  # target number of chunks per pool process, trades off task overhead and load balance
+
+job_stats = dict()  # per job type timing stats, see ``get_job_type_stats()``
+
+
+def get_job_type_stats(job_type):
+    """
+    Get the timing stats of the given job type, creating them if necessary.
+
+    Args:
+        job_type (str): job type name, e.g. 'vehicle_frontier'
+
+    Returns:
+        Dict of job type stats, ``job_seconds`` (dict of last run time by job key), ``total_seconds`` and
+        ``total_size`` (the sum of job run times and job sizes of all jobs run so far) and ``batches`` (list of dicts of
+        per-batch stats)
+
+    """
+    if job_type not in job_stats:
+        job_stats[job_type] = {'job_seconds': dict(), 'total_seconds': 0, 'total_size': 0, 'batches': []}
+
+    return job_stats[job_type]
+
+
+def estimate_job_costs(job_type, job_keys, job_sizes):
+    """
+    Estimate job costs (run times) from the timings of previous batches.
+
+    Args:
+        job_type (str): job type name, e.g. 'vehicle_frontier'
+        job_keys (list): job keys that identify the same job from batch to batch
+        job_sizes (list): job sizes, e.g. number of vehicles or cost curve points
+
+    Returns:
+        List of estimated job costs, in seconds if there are timings from previous batches
+
+    """
+    stats = get_job_type_stats(job_type)
+
+    if stats['total_size'] > 0:
+        seconds_per_unit = stats['total_seconds'] / stats['total_size']
+    else:
+        seconds_per_unit = 1.0
+
+    return [stats['job_seconds'].get(k, seconds_per_unit * s) for k, s in zip(job_keys, job_sizes)]
+
+
+def chunk_jobs(job_costs, num_processes):
+    """
+    Pack jobs into chunks of similar cost.  Jobs that cost at least the target chunk cost run in a chunk of their own,
+    the remaining jobs are packed, costliest first, into chunks of about the target chunk cost.
+
+    Args:
+        job_costs (list): estimated job costs
+        num_processes (int): number of pool processes
+
+    Returns:
+        List of chunks (lists of job indices), costliest chunk first
+
+    """
+    target_cost = sum(job_costs) / max(1, num_processes * chunks_per_process)
+
+    chunks = []
+    chunk = []
+    chunk_cost = 0
+    for job_index in sorted(range(len(job_costs)), key=lambda i: job_costs[i], reverse=True):
+        if job_costs[job_index] >= target_cost:
+            chunks.append(([job_index], job_costs[job_index]))
+        else:
+            chunk.append(job_index)
+            chunk_cost += job_costs[job_index]
+            if chunk_cost >= target_cost:
+                chunks.append((chunk, chunk_cost))
+                chunk = []
+                chunk_cost = 0
+
+    if chunk:
+        chunks.append((chunk, chunk_cost))
+
+    return [c for c, cost in sorted(chunks, key=lambda x: x[1], reverse=True)]
+
+
+def run_job_chunk(func, chunk):
+    """
+    Run a chunk of jobs in a pool worker process.
+
+    Args:
+        func (function): the job function
+        chunk (list): list of (job index, job args) tuples
+
+    Returns:
+        List of (job index, job result, job run time in seconds) tuples
+
+    """
+    worker_blocks = get_worker_blocks()
+
+    results = []
+    try:
+        for job_index, args in chunk:
+            start_time = time.time()
+            result = func(*args)
+            results.append((job_index, result, time.time() - start_time))
+    except Exception:
+        # the results of the completed jobs of the chunk are never returned, unlink their shared memory
+        unlink_worker_blocks(worker_blocks)
+        raise
+
+    return results
+
+
+def run_job_chunk_process(chunk_args):
+    """
+    ``imap_unordered()`` entry point for ``run_job_chunk()``.
+
+    Args:
+        chunk_args (tuple): (job function, job chunk)
+
+    Returns:
+        List of (job index, job result, job run time in seconds) tuples
+
+    """
+    return run_job_chunk(*chunk_args)
+
+
+def run_pool_jobs(job_type, func, job_args, job_keys, job_sizes, results=None):
+    """
+    Run a batch of jobs on the multiprocessing pool, in chunks of similar estimated cost, and update the job type
+    timing stats.
+
+    If a job raises an exception, the remaining chunks still run to completion and their results are stored in
+    ``results`` before the first exception is re-raised, so the caller can release any resources (e.g. shared memory
+    blocks) held by the results of the jobs that did complete.
+
+    Args:
+        job_type (str): job type name, e.g. 'vehicle_frontier'
+        func (function): the job function, must be picklable (i.e. a module-level function)
+        job_args (list): list of job argument lists
+        job_keys (list): job keys that identify the same job from batch to batch, e.g. vehicle name
+        job_sizes (list): job sizes, e.g. number of vehicles or cost curve points, used to estimate the cost of jobs
+            that haven't run before
+        results (list): optional list, of the same length as ``job_args``, to store the job results in
+
+    Returns:
+        List of job results, in the order of ``job_args``, ``None`` for jobs that didn't complete
+
+    """
+    stats = get_job_type_stats(job_type)
+
+    job_costs = estimate_job_costs(job_type, job_keys, job_sizes)
+    chunks = chunk_jobs(job_costs, omega_globals.pool_num_processes)
+
+    start_time = time.time()
+
+    if results is None:
+        results = [None] * len(job_args)
+    job_seconds = [0] * len(job_args)
+    chunk_results_iter = omega_globals.pool.imap_unordered(
+        run_job_chunk_process, [(func, [(i, job_args[i]) for i in chunk]) for chunk in chunks])
+    error = None
+    for _ in chunks:
+        try:
+            chunk_results = next(chunk_results_iter)
+        except Exception as e:
+            # keep collecting the other chunks, the caller releases their results
+            error = error or e
+            continue
+        for job_index, result, seconds in chunk_results:
+            results[job_index] = result
+            job_seconds[job_index] = seconds
+
+    if error is not None:
+        raise error
+
+    elapsed_time = time.time() - start_time
+
+    for job_key, job_size, seconds in zip(job_keys, job_sizes, job_seconds):
+        stats['job_seconds'][job_key] = seconds
+        stats['total_seconds'] += seconds
+        stats['total_size'] += job_size
+
+    batch_stats = {'num_jobs': len(job_args), 'num_chunks': len(chunks), 'elapsed_seconds': elapsed_time,
+                   'job_seconds': sum(job_seconds), 'max_job_seconds': max(job_seconds, default=0),
+                   'estimated_job_seconds': sum(job_costs)}
+    stats['batches'].append(batch_stats)
+
+    if 'pool_scheduler' in omega_globals.options.verbose_console_modules:
+        utilization = batch_stats['job_seconds'] / max(1e-9, elapsed_time * omega_globals.pool_num_processes)
+        omega_log.logwrite('%s: %d jobs in %d chunks, %.2f s elapsed, %.2f s max job, %.0f%% pool utilization' %
+                           (job_type, batch_stats['num_jobs'], batch_stats['num_chunks'], elapsed_time,
+                            batch_stats['max_job_seconds'], 100 * utilization))
+
+    return results
@@ -643,6 +643,21 @@ class SalesShare(OMEGABase, SalesShareBase):
 
         calibration.to_csv(filename)
 
+    @staticmethod
+    def get_calibration_keys(compliance_id):
+        """
+        Get the calibration data keys of the given compliance ID, one per body style, as used by ``calc_shares()``
+
+        Args:
+            compliance_id (str): manufacturer name, or 'consolidated_OEM'
+
+        Returns:
+            List of calibration data keys, e.g. ``['OEM_A_sedan_wagon_calibration', ...]``
+
+        """
+        return ['%s_%s_calibration' % (compliance_id, body_style)
+                for body_style in ['sedan_wagon', 'cuv_suv_van', 'pickup']]
+
     @staticmethod
     def store_producer_decision_and_response(producer_decision_and_response):
         """
@@ -12,6 +12,25 @@ from omega_model import *
 
 vehicles_cache = dict()
 
+vehicle_info_attributes = ['market_class_id', 'model_year', '_initial_registered_count']
+
+
+def cache_vehicle_info(vehicle_ids):
+    """
+    Cache vehicle info for the given database vehicle IDs, with batched database queries for any vehicles that aren't
+    already cached
+
+    Args:
+        vehicle_ids ([ints]): the database vehicle IDs
+
+    """
+    from producer.vehicles import VehicleFinal
+
+    uncached_vehicle_ids = [vehicle_id for vehicle_id in vehicle_ids if vehicle_id not in vehicles_cache]
+
+    if uncached_vehicle_ids:
+        vehicles_cache.update(VehicleFinal.get_vehicles_attributes(uncached_vehicle_ids, vehicle_info_attributes))
+
 
 def get_vehicle_info(vehicle_id):
     """
@@ -27,12 +46,62 @@ def get_vehicle_info(vehicle_id):
     from producer.vehicles import VehicleFinal
 
     if vehicle_id not in vehicles_cache:
-        vehicles_cache[vehicle_id] = VehicleFinal.get_vehicle_attributes(vehicle_id, ['market_class_id', 'model_year',
-                                                                                      '_initial_registered_count'])
+        vehicles_cache[vehicle_id] = VehicleFinal.get_vehicle_attributes(vehicle_id, vehicle_info_attributes)
 
     return vehicles_cache[vehicle_id]
 
 
+def calc_stock_rollover(calendar_year, vehicle_ids, prior_odometer):
+    """
+    Calculate the re-registration factor, registered count, annual VMT, odometer and VMT of the given vehicles in the
+    given calendar year.  Re-registration and VMT schedules are looked up once per market class and age (i.e. model
+    year) and joined to the vehicles.
+
+    Args:
+        calendar_year (int): calendar year to re-register vehicles in
+        vehicle_ids (numpy.array): vehicle ids
+        prior_odometer (numpy.array): the odometer of each vehicle at the end of the prior calendar year
+
+    Returns:
+        Dict of arrays of ``age``, ``reregistration_factor``, ``registered_count``, ``annual_vmt``, ``odometer`` and
+        ``vmt``, by vehicle
+
+    """
+    vehicle_ids = vehicle_ids.tolist()
+    cache_vehicle_info(vehicle_ids)
+
+    vehicle_info = [vehicles_cache[vehicle_id] for vehicle_id in vehicle_ids]
+    market_class_id = np.array([vi[0] for vi in vehicle_info], dtype=object)
+    model_year = np.array([vi[1] for vi in vehicle_info], dtype=int)
+    initial_registered_count = np.array([vi[2] for vi in vehicle_info], dtype=float)
+
+    age = calendar_year - model_year
+
+    reregistration_factor = np.zeros(len(vehicle_ids))
+    annual_vmt = np.zeros(len(vehicle_ids))
+
+    schedule_groups = pd.DataFrame({'market_class_id': market_class_id, 'model_year': model_year}).\
+        groupby(['market_class_id', 'model_year'], sort=False).indices
+
+    for (group_market_class_id, group_model_year), rows in schedule_groups.items():
+        group_age = int(calendar_year - group_model_year)
+
+        reregistration_factor[rows] = omega_globals.options.Reregistration.\
+            get_reregistered_proportion(group_model_year, group_market_class_id, group_age)
+
+        registered_rows = rows[initial_registered_count[rows] > 0]
+        if len(registered_rows):
+            annual_vmt[registered_rows] = \
+                omega_globals.options.OnroadVMT.get_vmt(calendar_year, group_market_class_id, group_age)
+
+    registered_count = initial_registered_count * reregistration_factor
+
+    odometer = np.where(age == 0, annual_vmt, np.maximum(0, prior_odometer) + annual_vmt)
+
+    return {'age': age, 'reregistration_factor': reregistration_factor, 'registered_count': registered_count,
+            'annual_vmt': annual_vmt, 'odometer': odometer, 'vmt': annual_vmt * registered_count}
+
+
 def update_stock(calendar_year, compliance_id=None):
     """
     Re-register vehicles by calendar year, as a function of vehicle attributes (e.g. age, market class...)
@@ -52,73 +121,43 @@ def update_stock(calendar_year, compliance_id=None):
         vehicles_cache.clear()
 
     # pull in this year's vehicle ids:
-    this_years_vehicle_annual_data = VehicleAnnualData.get_vehicle_annual_data(calendar_year, compliance_id)
+    this_years_vehicle_annual_data = VehicleAnnualData.get_vehicle_annual_data(calendar_year, compliance_id,
+                                                                               'vehicle_id')
 
-    last_years_vehicle_annual_data = VehicleAnnualData.get_vehicle_annual_data(calendar_year-1, compliance_id)
+    last_years_vehicle_annual_data = VehicleAnnualData.get_vehicle_annual_data(calendar_year-1, compliance_id,
+                                                                               ['vehicle_id', 'odometer'])
 
-    # omega_globals.session.add_all(this_years_vehicle_annual_data)
     # UPDATE vehicle annual data for this year's stock
-    for vad in this_years_vehicle_annual_data:
-        market_class_id, model_year, initial_registered_count = get_vehicle_info(vad['vehicle_id'])
-        age = calendar_year - model_year
-
-        reregistration_factor = omega_globals.options.Reregistration.\
-            get_reregistered_proportion(model_year, market_class_id, age)
-
-        if initial_registered_count > 0:
-            annual_vmt = omega_globals.options.OnroadVMT.get_vmt(calendar_year, market_class_id, age)
-        else:
-            annual_vmt = 0
-
-        if age == 0:
-            odometer = annual_vmt
-        else:
-            odometer = max(0, odometer_data[odometer_data['vehicle_id'].values == vad.vehicle_id]['odometer'].values)
-            odometer += annual_vmt
+    if len(this_years_vehicle_annual_data):
+        vehicle_ids = this_years_vehicle_annual_data['vehicle_id'].values
 
-        if reregistration_factor > 0:
-            registered_count = initial_registered_count * reregistration_factor
-            vad['annual_vmt'] = annual_vmt
-            vad['odometer'] = odometer
-            vad['vmt'] = annual_vmt * registered_count
+        # odometer from last year's stock, for any vehicles that aren't new this year
+        prior_odometer = dict(zip(last_years_vehicle_annual_data['vehicle_id'].tolist(),
+                                  last_years_vehicle_annual_data['odometer'].tolist()))
+        prior_odometer = np.array([prior_odometer.get(vehicle_id, 0) for vehicle_id in vehicle_ids.tolist()])
 
-    if not last_years_vehicle_annual_data:
-        prior_year_vehicle_data = []
-    else:
-        prior_year_vehicle_data = [(v['vehicle_id'], v['odometer']) for v in last_years_vehicle_annual_data]
+        stock = calc_stock_rollover(calendar_year, vehicle_ids, prior_odometer)
 
-    vad_list = []
+        registered = stock['reregistration_factor'] > 0
+        VehicleAnnualData.update_vehicle_annual_data(this_years_vehicle_annual_data.index.values[registered],
+                                                     annual_vmt=stock['annual_vmt'][registered],
+                                                     odometer=stock['odometer'][registered],
+                                                     vmt=stock['vmt'][registered])
 
     # CREATE vehicle annual data for last year's stock, now one year older:
-    if prior_year_vehicle_data:
-        for vehicle_id, prior_odometer in prior_year_vehicle_data:
-            market_class_id, model_year, initial_registered_count = get_vehicle_info(vehicle_id)
-            age = int(calendar_year - model_year)
-
-            reregistration_factor = omega_globals.options.Reregistration.\
-                get_reregistered_proportion(model_year, market_class_id, age)
-
-            registered_count = initial_registered_count * reregistration_factor
-
-            if reregistration_factor > 0:
-                if initial_registered_count > 0:
-                    annual_vmt = omega_globals.options.OnroadVMT.get_vmt(calendar_year, market_class_id, age)
-                else:
-                    annual_vmt = 0
-
-                odometer = max(0, prior_odometer)
-                odometer += annual_vmt
-
-                vad_list.append(VehicleAnnualData.create(calendar_year=calendar_year,
-                                  vehicle_id=int(vehicle_id),
-                                  compliance_id=compliance_id,
-                                  age=age,
-                                  registered_count=registered_count,
-                                  annual_vmt=annual_vmt,
-                                  odometer=odometer,
-                                  vmt=annual_vmt * registered_count))
-
-        VehicleAnnualData.add_all(vad_list)
+    if len(last_years_vehicle_annual_data):
+        stock = calc_stock_rollover(calendar_year, last_years_vehicle_annual_data['vehicle_id'].values,
+                                    last_years_vehicle_annual_data['odometer'].values)
+
+        registered = stock['reregistration_factor'] > 0
+        VehicleAnnualData.add_columns({'calendar_year': calendar_year,
+                                       'compliance_id': compliance_id,
+                                       'vehicle_id': last_years_vehicle_annual_data['vehicle_id'].values[registered],
+                                       'age': stock['age'][registered],
+                                       'registered_count': stock['registered_count'][registered],
+                                       'annual_vmt': stock['annual_vmt'][registered],
+                                       'odometer': stock['odometer'][registered],
+                                       'vmt': stock['vmt'][registered]})
 
 
 if __name__ == '__main__':
@@ -64,42 +64,30 @@ _cache = dict()
 
 def get_trans(pkg_info):
     """
-    Get the transmission code for the given powertrain package.
+    Get the transmission codes for the given powertrain packages.
 
     Args:
-        pkg_info (Series): powertain package information
+        pkg_info (dict-like): powertain package information, tech flag values may be scalars or arrays
 
     Returns:
-        The transmission code for the given data.
+        The transmission code(s) for the given data.
 
     """
-    trans = ''
-    flags = 0
-
-    if pkg_info['trx10']:
-        trans = 'TRX10'
-        flags += 1
-    elif pkg_info['trx11']:
-        trans = 'TRX11'
-        flags += 1
-    elif pkg_info['trx12']:
-        trans = 'TRX12'
-        flags += 1
-    elif pkg_info['trx21']:
-        trans = 'TRX21'
-        flags += 1
-    elif pkg_info['trx22']:
-        trans = 'TRX22'
-        flags += 1
-    elif pkg_info['ecvt']:
-        trans = 'TRXCV'
-        flags += 1
-
-    if flags == 0:
-        raise Exception('%s has no transmission tech flag' % pkg_info.vehicle_name)
-
-    if flags > 1:
-        raise Exception('%s has multiple transmission tech flags' % pkg_info.vehicle_name)
+    trans_flags = [np.asarray(pkg_info[flag], dtype=float)
+                   for flag in ('trx10', 'trx11', 'trx12', 'trx21', 'trx22', 'ecvt')]
+
+    trans = np.select([flag.astype(bool) for flag in trans_flags],
+                      ['TRX10', 'TRX11', 'TRX12', 'TRX21', 'TRX22', 'TRXCV'], '')
+
+    if np.any(trans == ''):
+        raise Exception('%s has no transmission tech flag' % pkg_info.get('vehicle_name', 'powertrain package'))
+
+    # unset (NaN) flags select the first transmission code, as above, but don't count as multiple flags
+    flags = np.sum([np.nan_to_num(flag) != 0 for flag in trans_flags], axis=0)
+
+    if np.any(flags > 1):
+        raise Exception('%s has multiple transmission tech flags' %
+                        pkg_info.get('vehicle_name', 'powertrain package'))
 
     return trans
 
@@ -112,18 +100,16 @@ class PowertrainCost(OMEGABase):
     battery_cost_scalers = dict()
 
     @staticmethod
-    def calc_cost(vehicle, pkg_info, powertrain_type):
+    def get_markups_and_learning(vehicle):
         """
-        Calculate the value of the response surface equation for the given powertrain type, cost curve class (tech
-        package) for the full factorial combination of the iterable terms.
+        Get the markups and learning factors for the given vehicle, which are a function of the vehicle (and its model
+        year) but not of its powertrain package.
 
         Args:
-            powertrain_type:
-            vehicle (Vehicle): the vehicle to calc costs for
-            pkg_info (dict-like): the necessary information for developing cost estimates.
+            vehicle (Vehicle): the vehicle to get markups and learning factors for
 
         Returns:
-            A list of cost values indexed the same as pkg_df.
+            Dict of markups and learning factors, by name
 
         """
         market_class_id, model_year, base_year_cert_fuel_id, reg_class_id = \
@@ -180,342 +166,402 @@ class PowertrainCost(OMEGABase):
             learning_factor_ice = 1 / learning_factor_ice
             learning_factor_pev = 1 / learning_factor_pev
 
+        markups_and_learning = {'MARKUP_ICE': MARKUP_ICE, 'MARKUP_HEV': MARKUP_HEV, 'MARKUP_PHEV': MARKUP_PHEV,
+                                'MARKUP_BEV': MARKUP_BEV, 'MARKUP_ALL': MARKUP_ALL,
+                                'learning_factor_ice': learning_factor_ice,
+                                'learning_factor_pev': learning_factor_pev,
+                                'learning_pev_battery_scaling_factor': learning_pev_battery_scaling_factor}
+
+        return markups_and_learning
+
+    @staticmethod
+    def calc_cost(vehicle, pkg_info, powertrain_type):
+        """
+        Calculate the value of the response surface equation for the given powertrain type, cost curve class (tech
+        package) for the full factorial combination of the iterable terms.
+
+        Args:
+            powertrain_type:
+            vehicle (Vehicle): the vehicle to calc costs for
+            pkg_info (dict-like): the necessary information for developing cost estimates.
+
+        Returns:
+            Tuple of engine, driveline, e-machine, battery and electrified driveline costs
+
+        See Also:
+            ``calc_costs()`` to calculate the costs of many powertrain packages at once
+
+        """
+        pkg_data = {k: np.array([v]) for k, v in pkg_info.items()}
+        pkg_data['powertrain_type'] = np.array([powertrain_type])
+
+        return tuple(cost[0] for cost in PowertrainCost.calc_costs(vehicle, pkg_data))
+
+    @staticmethod
+    def calc_costs(vehicle, pkg_df):
+        """
+        Calculate powertrain costs for a set of powertrain packages (e.g. a cost cloud) at once.  Vehicle and model
+        year terms (markups, learning factors, etc) are evaluated once and shared by all packages, package terms are
+        calculated as arrays.
+
+        Args:
+            vehicle (Vehicle): the vehicle to calc costs for
+            pkg_df (DataFrame or dict): the necessary information for developing cost estimates, including the
+                ``powertrain_type`` of each package, as columns or dict of arrays
+
+        Returns:
+            Tuple of engine, driveline, e-machine, battery and electrified driveline cost arrays, indexed the same as
+            pkg_df.
+
+        """
+        market_class_id, model_year, base_year_cert_fuel_id, reg_class_id = \
+            vehicle.market_class_id, vehicle.model_year, vehicle.base_year_cert_fuel_id, vehicle.reg_class_id
+
+        markups_and_learning = PowertrainCost.get_markups_and_learning(vehicle)
+        MARKUP_ICE = markups_and_learning['MARKUP_ICE']
+        MARKUP_HEV = markups_and_learning['MARKUP_HEV']
+        MARKUP_PHEV = markups_and_learning['MARKUP_PHEV']
+        MARKUP_BEV = markups_and_learning['MARKUP_BEV']
+        MARKUP_ALL = markups_and_learning['MARKUP_ALL']
+        learning_factor_ice = markups_and_learning['learning_factor_ice']
+        learning_factor_pev = markups_and_learning['learning_factor_pev']
+        learning_pev_battery_scaling_factor = markups_and_learning['learning_pev_battery_scaling_factor']
+
+        gasoline_flag = 1
+        diesel_flag = 0
+        if 'diesel' in base_year_cert_fuel_id:
+            diesel_flag = 1
+            gasoline_flag = 0
+
         weight_bins = (0, 3200, 3800, 4400, 5000, 5600, 6200, 14000)
-        tractive_motor = 'dual'
-        if (market_class_id.__contains__('non_hauling') and vehicle.drive_system < 4) or powertrain_type == 'HEV':
-            tractive_motor = 'single'
-
-        trans_cost = cyl_cost = liter_cost = 0
-        high_eff_alt_cost = start_stop_cost = deac_pd_cost = deac_fc_cost = cegr_cost = atk2_cost = gdi_cost = 0
-        turb12_cost = turb11_cost = 0
-        twc_cost = gpf_cost = diesel_eas_cost = 0
-        ac_leakage_cost = ac_efficiency_cost = 0
-        induction_inverter_cost = 0
-        turb_scaler = 1  # default value adjusted below for turb packages
-
-        battery_cost = electrified_driveline_cost = motor_cost = induction_motor_cost = inverter_cost = 0
-        obc_and_dcdc_converter_cost = hv_orange_cables_cost = lv_battery_cost = 0
-        hvac_cost = single_speed_gearbox_cost = powertrain_cooling_loop_cost = 0
-        charging_cord_kit_cost = dc_fast_charge_circuitry_cost = 0
-        power_management_and_distribution_cost = brake_sensors_actuators_cost = 0
-        additional_pair_of_half_shafts_cost = 0
-        emachine_cost = 0
-        gasoline_flag = diesel_flag = 0
-
-        CURBWT = pkg_info['curbweight_lbs']
-        # VEHICLE_SIZE_CLASS = np.array([weight_bins.index(min([v for v in weight_bins if cw < v])) for cw in CURBWT])
-        VEHICLE_SIZE_CLASS = weight_bins.index(min([v for v in weight_bins if CURBWT < v]))
-
-        # powertrain costs for anything with a liquid fueled engine
-        if powertrain_type in ['ICE', 'HEV', 'PHEV', 'MHEV']:
-
-            trans = get_trans(pkg_info)
-
-            gasoline_flag = 1
-            diesel_flag = 0
-            if 'diesel' in base_year_cert_fuel_id:
-                diesel_flag = 1
-                gasoline_flag = 0
-
-            CYL = pkg_info['engine_cylinders']
-            LITERS = pkg_info['engine_displacement_L']
+
+        pkg_powertrain_type = np.asarray(pkg_df['powertrain_type'])
+        costs = np.zeros((5, len(pkg_powertrain_type)))
+
+        # packages are costed by powertrain type, since the powertrain type determines the cost terms
+        for powertrain_type in pd.unique(pkg_powertrain_type):
+            pkg_index = np.flatnonzero(pkg_powertrain_type == powertrain_type)
+            pkg_info = {k: np.asarray(pkg_df[k])[pkg_index] for k in pkg_df}
+
+            tractive_motor = 'dual'
+            if (market_class_id.__contains__('non_hauling') and vehicle.drive_system < 4) or \
+                    powertrain_type == 'HEV':
+                tractive_motor = 'single'
+
+            trans_cost = cyl_cost = liter_cost = 0
+            high_eff_alt_cost = start_stop_cost = deac_pd_cost = deac_fc_cost = cegr_cost = atk2_cost = gdi_cost = 0
+            turb12_cost = turb11_cost = 0
+            twc_cost = gpf_cost = diesel_eas_cost = 0
+            ac_leakage_cost = ac_efficiency_cost = 0
+            induction_inverter_cost = 0
+            turb_scaler = 1  # default value adjusted below for turb packages
+
+            battery_cost = electrified_driveline_cost = motor_cost = induction_motor_cost = inverter_cost = 0
+            obc_and_dcdc_converter_cost = hv_orange_cables_cost = lv_battery_cost = 0
+            hvac_cost = single_speed_gearbox_cost = powertrain_cooling_loop_cost = 0
+            charging_cord_kit_cost = dc_fast_charge_circuitry_cost = 0
+            power_management_and_distribution_cost = brake_sensors_actuators_cost = 0
+            additional_pair_of_half_shafts_cost = 0
+            emachine_cost = 0
+
+            CURBWT = pkg_info['curbweight_lbs']
+            if np.any(np.asarray(CURBWT) >= weight_bins[-1]):
+                raise Exception('curb weight outside of powertrain cost vehicle size class range (< %d lbs)' %
+                                weight_bins[-1])
+            VEHICLE_SIZE_CLASS = np.searchsorted(weight_bins, CURBWT, side='right')
 
             locals_dict = locals()
 
-            # PGM costs and loadings for gasoline
-            if gasoline_flag == 1:
-                PT_USD_PER_OZ = eval(_cache['ALL', 'pt_dollars_per_oz']['value'], {'np': np}, locals_dict)
-                PD_USD_PER_OZ = eval(_cache['ALL', 'pd_dollars_per_oz']['value'], {'np': np}, locals_dict)
-                RH_USD_PER_OZ = eval(_cache['ALL', 'rh_dollars_per_oz']['value'], {'np': np}, locals_dict)
-                PT_GRAMS_PER_LITER_TWC = eval(_cache['ALL', 'twc_pt_grams_per_liter']['value'], {'np': np}, locals_dict)
-                PD_GRAMS_PER_LITER_TWC = eval(_cache['ALL', 'twc_pd_grams_per_liter']['value'], {'np': np}, locals_dict)
-                RH_GRAMS_PER_LITER_TWC = eval(_cache['ALL', 'twc_rh_grams_per_liter']['value'], {'np': np}, locals_dict)
-                OZ_PER_GRAM = eval(_cache['ALL', 'troy_oz_per_gram']['value'], {'np': np}, locals_dict)
-
-            turb_input_scaler = eval(_cache['ALL', 'turb_scaler']['value'], {'np': np}, locals_dict)
-
-            learn = learning_factor_ice
-            # determine trans and calc cost
-            adj_factor = _cache['ALL', trans]['dollar_adjustment']
-            trans_cost = eval(_cache['ALL', trans]['value'], {'np': np}, locals_dict) \
-                         * adj_factor * learn
-
-            # cylinder cost
-            adj_factor = _cache['ALL', 'dollars_per_cylinder']['dollar_adjustment']
-            cyl_cost = eval(_cache['ALL', 'dollars_per_cylinder']['value'], {'np': np}, locals_dict) \
-                       * adj_factor * learn
-
-            # displacement cost
-            adj_factor = _cache['ALL', 'dollars_per_liter']['dollar_adjustment']
-            liter_cost = eval(_cache['ALL', 'dollars_per_liter']['value'], {'np': np}, locals_dict) \
-                         * adj_factor * learn
-
-            # high efficiency alternator cost
-            adj_factor = _cache['ALL', 'high_eff_alternator']['dollar_adjustment']
-            high_eff_alt_cost = eval(_cache['ALL', 'high_eff_alternator']['value'], {'np': np}, locals_dict) \
-                                * adj_factor * learn * pkg_info['high_eff_alternator']
-
-            # start_stop cost
-            adj_factor = _cache['ALL', 'start_stop']['dollar_adjustment']
-            start_stop_cost = eval(_cache['ALL', 'start_stop']['value'], {'np': np}, locals_dict) \
-                              * adj_factor * learn * pkg_info['start_stop']
-
-            # deac_pd cost
-            adj_factor = _cache['ALL', 'deac_pd']['dollar_adjustment']
-            deac_pd_cost = eval(_cache['ALL', 'deac_pd']['value'], {'np': np}, locals_dict) \
-                           * adj_factor * learn * pkg_info['deac_pd']
-
-            # deac_fc cost
-            adj_factor = _cache['ALL', 'deac_fc']['dollar_adjustment']
-            deac_fc_cost = eval(_cache['ALL', 'deac_fc']['value'], {'np': np}, locals_dict) \
-                           * adj_factor * learn * pkg_info['deac_fc']
-
-            # cegr cost
-            adj_factor = _cache['ALL', 'cegr']['dollar_adjustment']
-            cegr_cost = eval(_cache['ALL', 'cegr']['value'], {'np': np}, locals_dict) \
-                        * adj_factor * learn * pkg_info['cegr']
-
-            # atk2 cost
-            adj_factor = _cache['ALL', 'atk2']['dollar_adjustment']
-            atk2_cost = eval(_cache['ALL', 'atk2']['value'], {'np': np}, locals_dict) \
-                        * adj_factor * learn * pkg_info['atk2']
-
-            # gdi cost
-            adj_factor = _cache['ALL', 'gdi']['dollar_adjustment']
-            gdi_cost = eval(_cache['ALL', 'gdi']['value'], {'np': np}, locals_dict) \
-                       * adj_factor * learn * pkg_info['gdi']
-
-            # turb12 cost
-            adj_factor = _cache['ALL', 'turb12']['dollar_adjustment']
-            turb12_cost = eval(_cache['ALL', 'turb12']['value'], {'np': np}, locals_dict) \
-                          * adj_factor * learn * pkg_info['turb12']
-
-            # turb11 cost
-            adj_factor = _cache['ALL', 'turb11']['dollar_adjustment']
-            turb11_cost = eval(_cache['ALL', 'turb11']['value'], {'np': np}, locals_dict) \
-                          * adj_factor * learn * pkg_info['turb11']
-
-            turb_scaler += (turb_input_scaler - turb_scaler) * (pkg_info['turb11'] | pkg_info['turb12'])
-
-            # 3-way catalyst cost
-            if gasoline_flag == 1:
-                adj_factor_sub = _cache['ALL', 'twc_substrate']['dollar_adjustment']
-                adj_factor_wash = _cache['ALL', 'twc_washcoat']['dollar_adjustment']
-                adj_factor_can = _cache['ALL', 'twc_canning']['dollar_adjustment']
-                TWC_SWEPT_VOLUME = eval(_cache['ALL', 'twc_swept_volume']['value'], {'np': np}, locals_dict)
-                locals_dict = locals()
-                twc_substrate = eval(_cache['ALL', 'twc_substrate']['value'], {'np': np}, locals_dict) \
-                                * adj_factor_sub * learn
-                twc_washcoat = eval(_cache['ALL', 'twc_washcoat']['value'], {'np': np}, locals_dict) \
-                               * adj_factor_wash * learn
-                twc_canning = eval(_cache['ALL', 'twc_canning']['value'], {'np': np}, locals_dict) \
-                              * adj_factor_can * learn
-                twc_pgm = eval(_cache['ALL', 'twc_pgm']['value'], {'np': np}, locals_dict)
-                twc_cost = (twc_substrate + twc_washcoat + twc_canning + twc_pgm)
-
-                # gpf cost
-                adj_factor_gpf = _cache['ALL', 'gpf_cost']['dollar_adjustment']
-                locals_dict = locals()
-                gpf_cost = eval(_cache['ALL', 'gpf_cost']['value'], {'np': np}, locals_dict) \
-                           * adj_factor_gpf * learn
+            # powertrain costs for anything with a liquid fueled engine
+            if powertrain_type in ['ICE', 'HEV', 'PHEV', 'MHEV']:
 
-            # diesel exhaust aftertreatment cost
-            elif diesel_flag == 1:
-                adj_factor_diesel_eas = _cache['ALL', 'diesel_aftertreatment_system']['dollar_adjustment']
-                locals_dict = locals()
-                diesel_eas_cost = \
-                    eval(_cache['ALL', 'diesel_aftertreatment_system']['value'], {'np': np}, locals_dict) * \
-                    adj_factor_diesel_eas * learn
-
-        if powertrain_type in ['MHEV', 'HEV', 'PHEV', 'BEV']:
-
-            if powertrain_type == 'PHEV' or powertrain_type == 'BEV':
-                learn = learning_factor_pev
-
-            KWH = pkg_info['battery_kwh']
-            KW = pkg_info['motor_kw']
-
-            if powertrain_type == 'HEV':
-                obc_kw = 0
-            elif powertrain_type == 'MHEV':
-                obc_kw = 0
-            elif powertrain_type == 'PHEV':
-                obc_kw = 1.9
-                if KWH < 10:
-                    obc_kw = 1.1
-                elif KWH < 7:
-                    obc_kw = 0.7
-            else:
-                obc_kw = 19
-                if KWH < 100:
-                    obc_kw = 11
-                elif KWH < 70:
-                    obc_kw = 7
+                trans = get_trans(pkg_info)
 
-            dcdc_converter_kw = eval(_cache[powertrain_type, 'DCDC_converter_kW']['value'], {'np': np}, locals_dict)
+                CYL = pkg_info['engine_cylinders']
+                LITERS = pkg_info['engine_displacement_L']
 
-            OBC_AND_DCDC_CONVERTER_KW = dcdc_converter_kw + obc_kw
+                locals_dict = locals()
 
-            locals_dict = locals()
+                # PGM costs and loadings for gasoline
+                if gasoline_flag == 1:
+                    PT_USD_PER_OZ = eval(_cache['ALL', 'pt_dollars_per_oz']['value'], {'np': np}, locals_dict)
+                    PD_USD_PER_OZ = eval(_cache['ALL', 'pd_dollars_per_oz']['value'], {'np': np}, locals_dict)
+                    RH_USD_PER_OZ = eval(_cache['ALL', 'rh_dollars_per_oz']['value'], {'np': np}, locals_dict)
+                    PT_GRAMS_PER_LITER_TWC = \
+                        eval(_cache['ALL', 'twc_pt_grams_per_liter']['value'], {'np': np}, locals_dict)
+                    PD_GRAMS_PER_LITER_TWC = \
+                        eval(_cache['ALL', 'twc_pd_grams_per_liter']['value'], {'np': np}, locals_dict)
+                    RH_GRAMS_PER_LITER_TWC = \
+                        eval(_cache['ALL', 'twc_rh_grams_per_liter']['value'], {'np': np}, locals_dict)
+                    OZ_PER_GRAM = eval(_cache['ALL', 'troy_oz_per_gram']['value'], {'np': np}, locals_dict)
+
+                turb_input_scaler = eval(_cache['ALL', 'turb_scaler']['value'], {'np': np}, locals_dict)
+
+                learn = learning_factor_ice
+                # determine trans and calc cost
+                for trans_code in pd.unique(trans):
+                    adj_factor = _cache['ALL', trans_code]['dollar_adjustment']
+                    trans_cost = np.where(trans == trans_code,
+                                          eval(_cache['ALL', trans_code]['value'], {'np': np}, locals_dict)
+                                          * adj_factor * learn, trans_cost)
+
+                # cylinder cost
+                adj_factor = _cache['ALL', 'dollars_per_cylinder']['dollar_adjustment']
+                cyl_cost = eval(_cache['ALL', 'dollars_per_cylinder']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn
+
+                # displacement cost
+                adj_factor = _cache['ALL', 'dollars_per_liter']['dollar_adjustment']
+                liter_cost = eval(_cache['ALL', 'dollars_per_liter']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn
+
+                # high efficiency alternator cost
+                adj_factor = _cache['ALL', 'high_eff_alternator']['dollar_adjustment']
+                high_eff_alt_cost = eval(_cache['ALL', 'high_eff_alternator']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['high_eff_alternator']
+
+                # start_stop cost
+                adj_factor = _cache['ALL', 'start_stop']['dollar_adjustment']
+                start_stop_cost = eval(_cache['ALL', 'start_stop']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['start_stop']
+
+                # deac_pd cost
+                adj_factor = _cache['ALL', 'deac_pd']['dollar_adjustment']
+                deac_pd_cost = eval(_cache['ALL', 'deac_pd']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['deac_pd']
+
+                # deac_fc cost
+                adj_factor = _cache['ALL', 'deac_fc']['dollar_adjustment']
+                deac_fc_cost = eval(_cache['ALL', 'deac_fc']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['deac_fc']
+
+                # cegr cost
+                adj_factor = _cache['ALL', 'cegr']['dollar_adjustment']
+                cegr_cost = eval(_cache['ALL', 'cegr']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['cegr']
+
+                # atk2 cost
+                adj_factor = _cache['ALL', 'atk2']['dollar_adjustment']
+                atk2_cost = eval(_cache['ALL', 'atk2']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['atk2']
+
+                # gdi cost
+                adj_factor = _cache['ALL', 'gdi']['dollar_adjustment']
+                gdi_cost = eval(_cache['ALL', 'gdi']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['gdi']
+
+                # turb12 cost
+                adj_factor = _cache['ALL', 'turb12']['dollar_adjustment']
+                turb12_cost = eval(_cache['ALL', 'turb12']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['turb12']
+
+                # turb11 cost
+                adj_factor = _cache['ALL', 'turb11']['dollar_adjustment']
+                turb11_cost = eval(_cache['ALL', 'turb11']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * pkg_info['turb11']
+
+                turb_scaler += (turb_input_scaler - turb_scaler) * (pkg_info['turb11'] | pkg_info['turb12'])
+
+                # 3-way catalyst cost
+                if gasoline_flag == 1:
+                    adj_factor_sub = _cache['ALL', 'twc_substrate']['dollar_adjustment']
+                    adj_factor_wash = _cache['ALL', 'twc_washcoat']['dollar_adjustment']
+                    adj_factor_can = _cache['ALL', 'twc_canning']['dollar_adjustment']
+                    TWC_SWEPT_VOLUME = eval(_cache['ALL', 'twc_swept_volume']['value'], {'np': np}, locals_dict)
+                    locals_dict = locals()
+                    twc_substrate = eval(_cache['ALL', 'twc_substrate']['value'], {'np': np}, locals_dict) \
+                        * adj_factor_sub * learn
+                    twc_washcoat = eval(_cache['ALL', 'twc_washcoat']['value'], {'np': np}, locals_dict) \
+                        * adj_factor_wash * learn
+                    twc_canning = eval(_cache['ALL', 'twc_canning']['value'], {'np': np}, locals_dict) \
+                        * adj_factor_can * learn
+                    twc_pgm = eval(_cache['ALL', 'twc_pgm']['value'], {'np': np}, locals_dict)
+                    twc_cost = (twc_substrate + twc_washcoat + twc_canning + twc_pgm)
+
+                    # gpf cost
+                    adj_factor_gpf = _cache['ALL', 'gpf_cost']['dollar_adjustment']
+                    locals_dict = locals()
+                    gpf_cost = eval(_cache['ALL', 'gpf_cost']['value'], {'np': np}, locals_dict) \
+                        * adj_factor_gpf * learn
+
+                # diesel exhaust aftertreatment cost
+                elif diesel_flag == 1:
+                    adj_factor_diesel_eas = _cache['ALL', 'diesel_aftertreatment_system']['dollar_adjustment']
+                    locals_dict = locals()
+                    diesel_eas_cost = \
+                        eval(_cache['ALL', 'diesel_aftertreatment_system']['value'], {'np': np}, locals_dict) * \
+                        adj_factor_diesel_eas * learn
 
-            # battery cost
             if powertrain_type in ['MHEV', 'HEV', 'PHEV', 'BEV']:
-                # battery_cost_scaler_dict \
-                #     = eval(_cache['ALL', 'battery_cost_scalers']['value'], {'np': np}, locals_dict)
-                #
-                # if model_year in battery_cost_scaler_dict['scaler'].keys():
-                #     cost_scaler = battery_cost_scaler_dict['scaler'][model_year]
-                # elif model_year in PowertrainCost.battery_cost_scalers:
-                #     cost_scaler = PowertrainCost.battery_cost_scalers[model_year]
-                # else:
-                #     min_year = max([yr for yr in battery_cost_scaler_dict['scaler'].keys() if yr < model_year])
-                #     max_year = min([yr for yr in battery_cost_scaler_dict['scaler'].keys() if yr > model_year])
-                #     min_year_scaler = battery_cost_scaler_dict['scaler'][min_year]
-                #     max_year_scaler = battery_cost_scaler_dict['scaler'][max_year]
-                #
-                #     m = (max_year_scaler - min_year_scaler) / (max_year - min_year)
-                #     cost_scaler = m * (model_year - min_year) + min_year_scaler
-                #
-                #     PowertrainCost.battery_cost_scalers[model_year] = cost_scaler
 
-                adj_factor = _cache[powertrain_type, 'battery']['dollar_adjustment']
-                battery_cost = eval(_cache[powertrain_type, 'battery']['value'], {'np': np}, locals_dict) \
-                               * adj_factor * learning_pev_battery_scaling_factor
-
-            if powertrain_type == 'BEV':
-                battery_offset_dict = eval(_cache[powertrain_type, 'battery_offset']['value'], {'np': np}, locals_dict)
-                battery_offset_min_year = min(battery_offset_dict['dollars_per_kwh'].keys())
-                battery_offset_max_year = max(battery_offset_dict['dollars_per_kwh'].keys())
-                if battery_offset_min_year <= model_year <= battery_offset_max_year:
-                    battery_offset = battery_offset_dict['dollars_per_kwh'][model_year] * KWH
-                    battery_cost += battery_offset
-
-            # electrified powertrain cost
-            adj_factor = _cache[powertrain_type, f'motor_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'motor_{tractive_motor}']['quantity']
-            motor_cost = eval(_cache[powertrain_type, f'motor_{tractive_motor}']['value'], {'np': np}, locals_dict) \
-                         * adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, f'inverter_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'inverter_{tractive_motor}']['quantity']
-            inverter_cost = \
-                eval(_cache[powertrain_type, f'inverter_{tractive_motor}']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, f'induction_motor_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'induction_motor_{tractive_motor}']['quantity']
-            induction_motor_cost = \
-                eval(_cache[powertrain_type, f'induction_motor_{tractive_motor}']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, f'induction_inverter_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'induction_inverter_{tractive_motor}']['quantity']
-            induction_inverter_cost = \
-                eval(_cache[powertrain_type, f'induction_inverter_{tractive_motor}']['value'],
-                     {'np': np}, locals_dict) * adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'OBC_and_DCDC_converter']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'OBC_and_DCDC_converter']['quantity']
-            obc_and_dcdc_converter_cost = \
-                eval(_cache[powertrain_type, 'OBC_and_DCDC_converter']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'HV_orange_cables']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'HV_orange_cables']['quantity']
-            hv_orange_cables_cost = \
-                eval(_cache[powertrain_type, 'HV_orange_cables']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['quantity']
-            single_speed_gearbox_cost = \
-                eval(_cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['value'],
-                     {'np': np}, locals_dict) * adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['quantity']
-            powertrain_cooling_loop_cost = \
-                eval(_cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['value'],
-                     {'np': np}, locals_dict) * adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'charging_cord_kit']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'charging_cord_kit']['quantity']
-            charging_cord_kit_cost = \
-                eval(_cache[powertrain_type, 'charging_cord_kit']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'DC_fast_charge_circuitry']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'DC_fast_charge_circuitry']['quantity']
-            dc_fast_charge_circuitry_cost = \
-                eval(_cache[powertrain_type, 'DC_fast_charge_circuitry']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'power_management_and_distribution']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'power_management_and_distribution']['quantity']
-            power_management_and_distribution_cost = \
-                eval(_cache[powertrain_type, 'power_management_and_distribution']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = _cache[powertrain_type, 'brake_sensors_actuators']['dollar_adjustment']
-            quantity = _cache[powertrain_type, 'brake_sensors_actuators']['quantity']
-            brake_sensors_actuators_cost = \
-                eval(_cache[powertrain_type, 'brake_sensors_actuators']['value'], {'np': np}, locals_dict) *\
-                adj_factor * learn * quantity
-
-            adj_factor = \
-                _cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['dollar_adjustment']
-            quantity = _cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['quantity']
-            additional_pair_of_half_shafts_cost = \
-                eval(_cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['value'],
-                     {'np': np}, locals_dict) * adj_factor * learn * quantity
-
-            emachine_cost = motor_cost + induction_motor_cost
-
-            electrified_driveline_cost = inverter_cost + induction_inverter_cost \
-                                         + obc_and_dcdc_converter_cost + hv_orange_cables_cost \
-                                         + single_speed_gearbox_cost + powertrain_cooling_loop_cost \
-                                         + charging_cord_kit_cost + dc_fast_charge_circuitry_cost \
-                                         + power_management_and_distribution_cost + brake_sensors_actuators_cost \
-                                         + additional_pair_of_half_shafts_cost
-
-        # ac leakage cost
-        adj_factor = _cache['ALL', 'ac_leakage']['dollar_adjustment']
-        ac_leakage_cost = eval(_cache['ALL', 'ac_leakage']['value'], {'np': np}, locals_dict) \
-                          * adj_factor * learning_factor_ice
-
-        # ac efficiency cost
-        adj_factor = _cache['ALL', 'ac_efficiency']['dollar_adjustment']
-        ac_efficiency_cost = eval(_cache['ALL', 'ac_efficiency']['value'], {'np': np}, locals_dict) \
-                             * adj_factor * learning_factor_ice
-
-        # low voltage battery and hvac
-        adj_factor = _cache[powertrain_type, 'LV_battery']['dollar_adjustment']
-        quantity = _cache[powertrain_type, 'LV_battery']['quantity']
-        lv_battery_cost = eval(_cache[powertrain_type, 'LV_battery']['value'], {'np': np}, locals_dict) \
-                          * adj_factor * learn * quantity
-
-        adj_factor = _cache[powertrain_type, 'HVAC']['dollar_adjustment']
-        quantity = _cache[powertrain_type, 'HVAC']['quantity']
-        hvac_cost = eval(_cache[powertrain_type, 'HVAC']['value'], {'np': np}, locals_dict) \
-                    * adj_factor * learn * quantity
+                if powertrain_type == 'PHEV' or powertrain_type == 'BEV':
+                    learn = learning_factor_pev
 
-        diesel_engine_cost_scaler = 1
-        if diesel_flag == 1:
-            diesel_engine_cost_scaler = \
-                eval(_cache['ALL', 'diesel_engine_cost_scaler']['value'], {'np': np}, locals_dict)
+                KWH = pkg_info['battery_kwh']
+                KW = pkg_info['motor_kw']
 
-        engine_cost = (cyl_cost + liter_cost) * turb_scaler * diesel_engine_cost_scaler \
-                      + deac_pd_cost + deac_fc_cost \
-                      + cegr_cost + atk2_cost + gdi_cost \
-                      + turb12_cost + turb11_cost \
-                      + twc_cost + gpf_cost + diesel_eas_cost
+                if powertrain_type == 'HEV':
+                    obc_kw = 0
+                elif powertrain_type == 'MHEV':
+                    obc_kw = 0
+                elif powertrain_type == 'PHEV':
+                    obc_kw = np.select([KWH < 10, KWH < 7], [1.1, 0.7], 1.9)
+                else:
+                    obc_kw = np.select([KWH < 100, KWH < 70], [11, 7], 19)
 
-        driveline_cost = trans_cost \
-                         + high_eff_alt_cost + start_stop_cost \
-                         + ac_leakage_cost + ac_efficiency_cost \
-                         + lv_battery_cost + hvac_cost
+                dcdc_converter_kw = \
+                    eval(_cache[powertrain_type, 'DCDC_converter_kW']['value'], {'np': np}, locals_dict)
+
+                OBC_AND_DCDC_CONVERTER_KW = dcdc_converter_kw + obc_kw
+
+                locals_dict = locals()
+
+                # battery cost
+                adj_factor = _cache[powertrain_type, 'battery']['dollar_adjustment']
+                battery_cost = eval(_cache[powertrain_type, 'battery']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learning_pev_battery_scaling_factor
+
+                if powertrain_type == 'BEV':
+                    battery_offset_dict = \
+                        eval(_cache[powertrain_type, 'battery_offset']['value'], {'np': np}, locals_dict)
+                    battery_offset_min_year = min(battery_offset_dict['dollars_per_kwh'].keys())
+                    battery_offset_max_year = max(battery_offset_dict['dollars_per_kwh'].keys())
+                    if battery_offset_min_year <= model_year <= battery_offset_max_year:
+                        battery_offset = battery_offset_dict['dollars_per_kwh'][model_year] * KWH
+                        battery_cost += battery_offset
+
+                # electrified powertrain cost
+                adj_factor = _cache[powertrain_type, f'motor_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'motor_{tractive_motor}']['quantity']
+                motor_cost = \
+                    eval(_cache[powertrain_type, f'motor_{tractive_motor}']['value'], {'np': np}, locals_dict) \
+                    * adj_factor * learn * quantity
 
-        return engine_cost, driveline_cost, emachine_cost, battery_cost, electrified_driveline_cost
+                adj_factor = _cache[powertrain_type, f'inverter_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'inverter_{tractive_motor}']['quantity']
+                inverter_cost = \
+                    eval(_cache[powertrain_type, f'inverter_{tractive_motor}']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, f'induction_motor_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'induction_motor_{tractive_motor}']['quantity']
+                induction_motor_cost = \
+                    eval(_cache[powertrain_type, f'induction_motor_{tractive_motor}']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, f'induction_inverter_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'induction_inverter_{tractive_motor}']['quantity']
+                induction_inverter_cost = \
+                    eval(_cache[powertrain_type, f'induction_inverter_{tractive_motor}']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'OBC_and_DCDC_converter']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'OBC_and_DCDC_converter']['quantity']
+                obc_and_dcdc_converter_cost = \
+                    eval(_cache[powertrain_type, 'OBC_and_DCDC_converter']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'HV_orange_cables']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'HV_orange_cables']['quantity']
+                hv_orange_cables_cost = \
+                    eval(_cache[powertrain_type, 'HV_orange_cables']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['quantity']
+                single_speed_gearbox_cost = \
+                    eval(_cache[powertrain_type, f'single_speed_gearbox_{tractive_motor}']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                adj_factor = \
+                    _cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['quantity']
+                powertrain_cooling_loop_cost = \
+                    eval(_cache[powertrain_type, f'powertrain_cooling_loop_{tractive_motor}']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'charging_cord_kit']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'charging_cord_kit']['quantity']
+                charging_cord_kit_cost = \
+                    eval(_cache[powertrain_type, 'charging_cord_kit']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'DC_fast_charge_circuitry']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'DC_fast_charge_circuitry']['quantity']
+                dc_fast_charge_circuitry_cost = \
+                    eval(_cache[powertrain_type, 'DC_fast_charge_circuitry']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'power_management_and_distribution']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'power_management_and_distribution']['quantity']
+                power_management_and_distribution_cost = \
+                    eval(_cache[powertrain_type, 'power_management_and_distribution']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                adj_factor = _cache[powertrain_type, 'brake_sensors_actuators']['dollar_adjustment']
+                quantity = _cache[powertrain_type, 'brake_sensors_actuators']['quantity']
+                brake_sensors_actuators_cost = \
+                    eval(_cache[powertrain_type, 'brake_sensors_actuators']['value'], {'np': np}, locals_dict) *\
+                    adj_factor * learn * quantity
+
+                adj_factor = \
+                    _cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['dollar_adjustment']
+                quantity = _cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['quantity']
+                additional_pair_of_half_shafts_cost = \
+                    eval(_cache[powertrain_type, f'additional_pair_of_half_shafts_{tractive_motor}']['value'],
+                         {'np': np}, locals_dict) * adj_factor * learn * quantity
+
+                emachine_cost = motor_cost + induction_motor_cost
+
+                electrified_driveline_cost = inverter_cost + induction_inverter_cost \
+                    + obc_and_dcdc_converter_cost + hv_orange_cables_cost \
+                    + single_speed_gearbox_cost + powertrain_cooling_loop_cost \
+                    + charging_cord_kit_cost + dc_fast_charge_circuitry_cost \
+                    + power_management_and_distribution_cost + brake_sensors_actuators_cost \
+                    + additional_pair_of_half_shafts_cost
+
+            # ac leakage cost
+            adj_factor = _cache['ALL', 'ac_leakage']['dollar_adjustment']
+            ac_leakage_cost = eval(_cache['ALL', 'ac_leakage']['value'], {'np': np}, locals_dict) \
+                * adj_factor * learning_factor_ice
+
+            # ac efficiency cost
+            adj_factor = _cache['ALL', 'ac_efficiency']['dollar_adjustment']
+            ac_efficiency_cost = eval(_cache['ALL', 'ac_efficiency']['value'], {'np': np}, locals_dict) \
+                * adj_factor * learning_factor_ice
+
+            # low voltage battery and hvac
+            adj_factor = _cache[powertrain_type, 'LV_battery']['dollar_adjustment']
+            quantity = _cache[powertrain_type, 'LV_battery']['quantity']
+            lv_battery_cost = eval(_cache[powertrain_type, 'LV_battery']['value'], {'np': np}, locals_dict) \
+                * adj_factor * learn * quantity
+
+            adj_factor = _cache[powertrain_type, 'HVAC']['dollar_adjustment']
+            quantity = _cache[powertrain_type, 'HVAC']['quantity']
+            hvac_cost = eval(_cache[powertrain_type, 'HVAC']['value'], {'np': np}, locals_dict) \
+                * adj_factor * learn * quantity
+
+            diesel_engine_cost_scaler = 1
+            if diesel_flag == 1:
+                diesel_engine_cost_scaler = \
+                    eval(_cache['ALL', 'diesel_engine_cost_scaler']['value'], {'np': np}, locals_dict)
+
+            engine_cost = (cyl_cost + liter_cost) * turb_scaler * diesel_engine_cost_scaler \
+                + deac_pd_cost + deac_fc_cost \
+                + cegr_cost + atk2_cost + gdi_cost \
+                + turb12_cost + turb11_cost \
+                + twc_cost + gpf_cost + diesel_eas_cost
+
+            driveline_cost = trans_cost \
+                + high_eff_alt_cost + start_stop_cost \
+                + ac_leakage_cost + ac_efficiency_cost \
+                + lv_battery_cost + hvac_cost
+
+            for cost, value in zip(costs, (engine_cost, driveline_cost, emachine_cost, battery_cost,
+                                           electrified_driveline_cost)):
+                cost[pkg_index] = value
+
+        return tuple(costs)
 
     @staticmethod
     def init_from_file(filename, verbose=False):
@@ -183,6 +183,82 @@ from producer.vehicles import VehicleOnroadCalculations, Vehicle, is_up_for_rede
 
 _cache = dict()
 
+_geometry_cache = dict()  # cloud geometry of vehicles that are not up for redesign, see get_cloud_geometry_key()
+
+# numeric literals (including a leading unary minus) that follow the start of an RSE or an operator/delimiter
+_rse_literal_pattern = re.compile(r'(^|[-+*/(,]\s*)(-?\s*(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+
+
+def get_rse_template(rse_source):
+    """
+    Separate the numeric literals of an RSE source string from its structure so that RSEs which differ only in their
+    coefficients can be evaluated together, using arrays of coefficients.
+
+    Args:
+        rse_source (str): RSE source string, e.g. ``'(1.5 + RLHP20 * -3.2, 0)'``
+
+    Returns:
+        Tuple of RSE template and list of coefficients, e.g. ``('(c[0] + RLHP20 * c[1], c[2])', [1.5, -3.2, 0])``
+
+    """
+    rse_template = ''
+    coefficients = []
+    end = 0
+    for match in _rse_literal_pattern.finditer(rse_source):
+        literal = match.group(2).replace(' ', '')
+        try:
+            coefficients.append(int(literal))
+        except ValueError:
+            coefficients.append(float(literal))
+        rse_template += rse_source[end:match.start(2)] + 'c[%d]' % (len(coefficients) - 1)
+        end = match.end()
+
+    return rse_template + rse_source[end:], coefficients
+
+
+def update_cloud_data(cloud_data, points, values):
+    """
+    Update cost cloud data arrays at the given points, creating (or upcasting) arrays as needed.
+
+    Args:
+        cloud_data (dict): dict of cloud point arrays
+        points (numpy.array): indices of the points to update
+        values (iterable): iterable of (key, value) pairs, value may be a scalar or an array of values at the points
+
+    """
+    num_points = len(next(iter(cloud_data.values())))
+    for k, v in values:
+        if k not in cloud_data:
+            cloud_data[k] = np.zeros(num_points, dtype=np.result_type(v))
+        elif np.result_type(cloud_data[k], v) != cloud_data[k].dtype:
+            cloud_data[k] = cloud_data[k].astype(np.result_type(cloud_data[k], v))
+        cloud_data[k][points] = v
+
+
+def get_cloud_geometry_key(vehicle):
+    """
+    Get the cloud geometry cache key of a vehicle that is not up for redesign.  The cloud geometry (the RSE outputs
+    and the sized mass, rated horsepower and battery terms of the cloud point) depends on the vehicle, on its
+    powertrain and body sizing as carried over from the prior model year and on the year-dependent sizing inputs (the
+    drive cycle ballast parameters and the kWh per mile scale) but not on the model year itself, so it can be reused
+    from year to year until the vehicle is redesigned.
+
+    Args:
+        vehicle (Vehicle): the vehicle to get the cloud geometry cache key for
+
+    Returns:
+        Tuple of vehicle identity, sizing inputs and year-dependent sizing inputs
+
+    """
+    kwh_per_mile_scale = np.interp(vehicle.model_year, omega_globals.options.kwh_per_mile_scale_years,
+                                   omega_globals.options.kwh_per_mile_scale)
+
+    return (vehicle.base_year_vehicle_id, vehicle.name, vehicle.fueling_class, vehicle.reg_class_id,
+            vehicle.cost_curve_class, vehicle.structure_material, vehicle.footprint_ft2, vehicle.curbweight_lbs,
+            vehicle.eng_rated_hp, vehicle.motor_kw, vehicle.battery_kwh, vehicle.charge_depleting_range_mi,
+            DriveCycleBallast.get_ballast_start_year(vehicle), kwh_per_mile_scale)
+
+
 # define list of non-numeric columns to ignore during frontier creation since they goof up pandas auto-typing of
 # columns when switching between Series and DataFrame representations
 
@@ -283,6 +359,10 @@ class CostCloud(OMEGABase, CostCloudBase):
                     _cache[powertrain_type][cost_curve_class]['rse_tuple'] = \
                         str(rse_tuple[1]).replace("'", '')
 
+                    _cache[powertrain_type][cost_curve_class]['rse_template'], \
+                        _cache[powertrain_type][cost_curve_class]['rse_coefficients'] = \
+                        get_rse_template(_cache[powertrain_type][cost_curve_class]['rse_tuple'])
+
                     _cache[powertrain_type][cost_curve_class]['tech_flags'] = class_cloud[tech_flags]
 
                     CostCloud.tech_flags.update(tech_flags)
@@ -357,6 +437,10 @@ class CostCloud(OMEGABase, CostCloudBase):
                     _cache[powertrain_type][cost_curve_class]['rse_tuple'] = \
                         str(rse_tuple[1]).replace("'", '')
 
+                    _cache[powertrain_type][cost_curve_class]['rse_template'], \
+                        _cache[powertrain_type][cost_curve_class]['rse_coefficients'] = \
+                        get_rse_template(_cache[powertrain_type][cost_curve_class]['rse_tuple'])
+
                     _cache[powertrain_type][cost_curve_class]['tech_flags'] = class_cloud[tech_flags]
 
                     CostCloud.tech_flags.update(tech_flags)
@@ -396,6 +480,7 @@ class CostCloud(OMEGABase, CostCloudBase):
 
         """
         _cache.clear()
+        _geometry_cache.clear()
 
         CostCloud.tech_flags = set()
         CostCloud.cost_cloud_data_columns = set()
@@ -453,7 +538,12 @@ class CostCloud(OMEGABase, CostCloudBase):
             cost_curve_classes = _cache[vehicle.fueling_class]
 
             vehicle.prior_redesign_year = vehicle.model_year
+
+            geometry_key = None
         else:
+            # the cloud geometry of the vehicle carries over from the prior year, unless its sizing inputs change
+            geometry_key = get_cloud_geometry_key(vehicle)
+
             # maintain vehicle params
             rlhp20s = [vehicle_rlhp20]
             rlhp60s = [vehicle_rlhp60]
@@ -464,12 +554,11 @@ class CostCloud(OMEGABase, CostCloudBase):
 
         # convergence terms init
         convergence_tolerance = 0.01
-        battery_kwh = vehicle.battery_kwh  # for now...
-
-        # build a list of dicts that will be dumped into the cloud at the end faster than sequentially
-        # appending Series objects)
-        cloud_points = []
 
+        # tech flags, initial rated hp and powertrain type by cost curve class
+        ccc_tech_flags = []
+        ccc_rated_hp = []
+        ccc_powertrain_type = []
         for ccc in cost_curve_classes:
             tech_flags = cost_curve_classes[ccc]['tech_flags'].to_dict()
             # RV
@@ -502,135 +591,235 @@ class CostCloud(OMEGABase, CostCloudBase):
             else:
                 vehicle.powertrain_type = 'ICE'
 
-            for structure_material in structure_materials:
-                for footprint_ft2 in vehicle_footprints:
-                    for rlhp20 in rlhp20s:
-                        for rlhp60 in rlhp60s:
-                            cloud_point = copy.copy(tech_flags)  # cost_curve_classes[ccc]['tech_flags'].to_dict()
-
-                            cloud_point['powertrain_type'] = vehicle.powertrain_type
-
-                            # ------------------------------------------------------------------------------------#
-                            prior_powertrain_mass_lbs = 1
-                            prior_rated_hp = 1
-                            prior_battery_kwh = 1
-
-                            converged = False
-                            while not converged:
-                                # rated hp sizing --------------------------------------------------------------- #
-                                structure_mass_lbs, battery_mass_lbs, powertrain_mass_lbs, \
-                                 delta_glider_non_structure_mass_lbs, usable_battery_capacity_norm = \
-                                    MassScaling.calc_mass_terms(vehicle, structure_material, rated_hp,
-                                                                battery_kwh, footprint_ft2)
-
-                                # update curbweight in case it's needed by DriveCycleBallast (medium-duty)
-                                vehicle.curbweight_lbs = sum((vehicle.base_year_glider_non_structure_mass_lbs,
-                                                             delta_glider_non_structure_mass_lbs,
-                                                             powertrain_mass_lbs, structure_mass_lbs, battery_mass_lbs))
-
-                                # vehicle ballast is f(curbweight_lbs) for medium-duty:
-                                vehicle_ballast = DriveCycleBallast.get_ballast_lbs(vehicle)
-
-                                rated_hp = vehicle.curbweight_lbs / vehicle.base_year_curbweight_lbs_to_hp
-
-                                # set up RSE terms and run RSEs
-                                ETW = vehicle.curbweight_lbs + vehicle_ballast
-
-                                RLHP20 = rlhp20 / ETW
-                                RLHP60 = rlhp60 / ETW
-                                HP_ETW = rated_hp / ETW
-
-                                cloud_point.update(zip(_cache[vehicle.fueling_class][ccc]['rse_names'],
-                                                       Eval.eval(_cache[vehicle.fueling_class][ccc]['rse_tuple'], {},
-                                                                 {'ETW': ETW, 'RLHP20': RLHP20, 'RLHP60': RLHP60,
-                                                                  'HP_ETW': HP_ETW})))
-
-                                # battery sizing -------------------------------------------------------------------- #
-                                if vehicle.powertrain_type == 'BEV':  # TODO: or 'PHEV'
-                                    cloud_point = vehicle.calc_battery_sizing_onroad_direct_kWh_per_mile(cloud_point)
-
-                                    battery_kwh = vehicle.charge_depleting_range_mi * \
-                                              cloud_point['battery_sizing_onroad_direct_kwh_per_mile'] / \
-                                              usable_battery_capacity_norm
-
-                                # determine convergence ------------------------------------------------------------- #
-                                converged = abs(
-                                    1 - powertrain_mass_lbs / prior_powertrain_mass_lbs) <= convergence_tolerance and \
-                                            abs(1 - rated_hp / prior_rated_hp) <= convergence_tolerance
-
-                                if vehicle.powertrain_type == 'BEV':
-                                    converged = converged and \
-                                            abs(1 - battery_kwh / prior_battery_kwh) < convergence_tolerance
-
-                                prior_powertrain_mass_lbs = powertrain_mass_lbs
-                                prior_rated_hp = rated_hp
-                                prior_battery_kwh = battery_kwh
-
-                                # ------------------------------------------------------------------------------------#
-
-                            cloud_point = vehicle.calc_cert_values(cloud_point)
-
-                            v = copy.copy(vehicle)
-                            v.footprint_ft2 = footprint_ft2
-                            cloud_point['target_co2e_Mg_per_vehicle'] = \
-                                omega_globals.options.VehicleTargets.calc_target_co2e_Mg(v, sales_variants=1)
-
-                            cloud_point['cert_co2e_Mg_per_vehicle'] = \
-                                omega_globals.options.VehicleTargets.\
-                                    calc_cert_co2e_Mg(v, co2_gpmi_variants=cloud_point['cert_co2e_grams_per_mile'],
-                                                      sales_variants=1)
-
-                            cloud_point['credits_co2e_Mg_per_vehicle'] = \
-                                cloud_point['target_co2e_Mg_per_vehicle'] - cloud_point['cert_co2e_Mg_per_vehicle']
-
-                            # required cloud data for powertrain costing, etc:
-                            cloud_point['cost_curve_class'] = ccc
-                            cloud_point['structure_mass_lbs'] = structure_mass_lbs
-                            cloud_point['footprint_ft2'] = footprint_ft2
-                            cloud_point['structure_material'] = structure_material
-                            cloud_point['curbweight_lbs'] = vehicle.curbweight_lbs
-                            cloud_point['rated_hp'] = rated_hp
-                            if vehicle.powertrain_type != 'BEV':
-                                # battery size and total motor/generator power come from RSEs for ICE/HEV
-                                cloud_point['battery_kwh'] = cloud_point['hev_batt_kwh']
-                                cloud_point['motor_kw'] = cloud_point['hev_motor_kw']
-                            else:
-                                # battery size and motor power determined by vehicle and iterative range calculation
-                                cloud_point['battery_kwh'] = battery_kwh
-                                cloud_point['motor_kw'] = rated_hp / 1.34102
-
-                            # informative data for troubleshooting:
-                            if vehicle.model_year in omega_globals.options.log_vehicle_cloud_years or \
-                                    omega_globals.options.log_vehicle_cloud_years == 'all':
-                                cloud_point['vehicle_id'] = vehicle.vehicle_id
-                                cloud_point['vehicle_base_year_id'] = vehicle.base_year_vehicle_id
-                                cloud_point['vehicle_name'] = vehicle.name
-                                cloud_point['model_year'] = vehicle.model_year
-                                cloud_point['delta_glider_non_structure_mass_lbs'] = \
-                                    delta_glider_non_structure_mass_lbs
-                                cloud_point['glider_non_structure_mass_lbs'] = \
-                                    vehicle.base_year_glider_non_structure_mass_lbs + \
-                                    delta_glider_non_structure_mass_lbs
-                                cloud_point['battery_mass_lbs'] = battery_mass_lbs
-                                cloud_point['powertrain_mass_lbs'] = powertrain_mass_lbs
-                                cloud_point['etw_lbs'] = ETW
-                                cloud_point['vehicle_eng_rated_hp'] = vehicle.eng_rated_hp
-                                cloud_point['vehicle_mot_rated_kw'] = vehicle.motor_kw
-                                cloud_point['rlhp20'] = rlhp20
-                                cloud_point['rlhp60'] = rlhp60
-
-                            # add powertrain costs
-                            powertrain_costs = \
-                                PowertrainCost.calc_cost(vehicle, cloud_point,
-                                                         cloud_point['powertrain_type'])  # includes battery cost
-                            powertrain_cost_terms = ['engine_cost', 'driveline_cost', 'emachine_cost', 'battery_cost',
-                                                     'electrified_driveline_cost']
-                            for idx, ct in enumerate(powertrain_cost_terms):
-                                cloud_point[ct] = powertrain_costs[idx]
-
-                            cloud_points.append(cloud_point)
-
-        cost_cloud = pd.DataFrame(cloud_points)
+            ccc_tech_flags.append(tech_flags)
+            ccc_rated_hp.append(rated_hp)
+            ccc_powertrain_type.append(vehicle.powertrain_type)
+
+        # cloud points are all combinations of cost curve class and vehicle params, in cost curve class, structure
+        # material, footprint, rlhp20, rlhp60 order
+        sweep_values = [np.asarray(v) for v in (list(cost_curve_classes), structure_materials, vehicle_footprints,
+                                                rlhp20s, rlhp60s)]
+        sweep_indices = [idx.ravel() for idx in
+                         np.meshgrid(*[np.arange(len(v)) for v in sweep_values], indexing='ij')]
+        cost_curve_class, structure_material, footprint_ft2, rlhp20, rlhp60 = \
+            [v[idx] for v, idx in zip(sweep_values, sweep_indices)]
+        ccc_index = sweep_indices[0]
+        num_points = len(ccc_index)
+
+        # dict of cloud point arrays that will be dumped into the cloud at the end
+        cloud_data = {tf: np.array([tech_flags[tf] for tech_flags in ccc_tech_flags])[ccc_index]
+                      for tf in ccc_tech_flags[0]}
+        cloud_data['powertrain_type'] = np.array(ccc_powertrain_type)[ccc_index]
+
+        # per point vehicle attributes used by the mass scaling calcs
+        point_attributes = list(cloud_data)
+        bev = cloud_data['powertrain_type'] == 'BEV'
+
+        geometry_terms = ['rated_hp', 'battery_kwh', 'structure_mass_lbs', 'battery_mass_lbs', 'powertrain_mass_lbs',
+                          'delta_glider_non_structure_mass_lbs', 'curbweight_lbs', 'etw_lbs']
+
+        if geometry_key in _geometry_cache:
+            cloud_data, geometry = copy.deepcopy(_geometry_cache[geometry_key])
+            rated_hp, battery_kwh, structure_mass_lbs, battery_mass_lbs, powertrain_mass_lbs, \
+                delta_glider_non_structure_mass_lbs, curbweight_lbs, etw_lbs = [geometry[k] for k in geometry_terms]
+        else:
+            # RSEs that differ only in their coefficients are evaluated together, RSE outputs are the same for all cost
+            # curve classes of the vehicle fueling class
+            rse_names = cost_curve_classes[ccc]['rse_names']
+            rse_groups = []
+            ccc_rse_templates = [cost_curve_classes[ccc]['rse_template'] for ccc in cost_curve_classes]
+            for rse_template in dict.fromkeys(ccc_rse_templates):
+                template_cccs = [ccc for ccc, t in zip(cost_curve_classes, ccc_rse_templates) if t == rse_template]
+                template_points = np.flatnonzero(np.isin(cost_curve_class, template_cccs))
+                coefficients = [np.array(c) for c in
+                                zip(*[cost_curve_classes[ccc]['rse_coefficients'] for ccc in template_cccs])]
+                coefficient_index = np.searchsorted(
+                    np.flatnonzero([t == rse_template for t in ccc_rse_templates]), ccc_index[template_points])
+                rse_groups.append((rse_template, template_points, [c[coefficient_index] for c in coefficients]))
+
+            # ------------------------------------------------------------------------------------------------------#
+            # points start from the converged rated hp of the prior point of their cost curve class (or the cost curve
+            # class rated hp) and from the battery size of the prior point (or the vehicle battery size), in sweep
+            # order.  Battery size only changes for BEV points, so without BEV points the points of a sweep position
+            # are independent of each other and are sized together, only unconverged points are iterated
+            num_sweep_points = num_points // len(ccc_rated_hp)
+            sweep_position = np.arange(num_points) % num_sweep_points
+            if bev.any():
+                point_groups = [np.array([p]) for p in range(num_points)]
+            else:
+                point_groups = [np.flatnonzero(sweep_position == sp) for sp in range(num_sweep_points)]
+
+            rated_hp = np.array(ccc_rated_hp, dtype=float)[ccc_index]
+            battery_kwh = np.full(num_points, vehicle.battery_kwh, dtype=float)
+
+            prior_powertrain_mass_lbs = np.ones(num_points)
+            prior_rated_hp = np.ones(num_points)
+            prior_battery_kwh = np.ones(num_points)
+
+            structure_mass_lbs, battery_mass_lbs, powertrain_mass_lbs, delta_glider_non_structure_mass_lbs, \
+                usable_battery_capacity_norm, curbweight_lbs, etw_lbs = np.zeros((7, num_points))
+
+            for iterating in point_groups:
+                continuing = iterating[sweep_position[iterating] > 0]
+                rated_hp[continuing] = rated_hp[continuing - 1]
+                if bev.any() and iterating[0] > 0:
+                    battery_kwh[iterating] = battery_kwh[iterating - 1]
+
+                while len(iterating):
+                    for attribute in point_attributes:
+                        vehicle.__setattr__(attribute, cloud_data[attribute][iterating])
+
+                    # rated hp sizing -------------------------------------------------------------------------------- #
+                    structure_mass_lbs[iterating], battery_mass_lbs[iterating], powertrain_mass_lbs[iterating], \
+                        delta_glider_non_structure_mass_lbs[iterating], usable_battery_capacity_norm[iterating] = \
+                        MassScaling.calc_mass_terms(vehicle, structure_material[iterating], rated_hp[iterating],
+                                                    battery_kwh[iterating], footprint_ft2[iterating])
+
+                    # update curbweight in case it's needed by DriveCycleBallast (medium-duty)
+                    vehicle.curbweight_lbs = sum((vehicle.base_year_glider_non_structure_mass_lbs,
+                                                  delta_glider_non_structure_mass_lbs[iterating],
+                                                  powertrain_mass_lbs[iterating], structure_mass_lbs[iterating],
+                                                  battery_mass_lbs[iterating]))
+                    curbweight_lbs[iterating] = vehicle.curbweight_lbs
+
+                    # vehicle ballast is f(curbweight_lbs) for medium-duty:
+                    vehicle_ballast = DriveCycleBallast.get_ballast_lbs(vehicle)
+
+                    rated_hp[iterating] = vehicle.curbweight_lbs / vehicle.base_year_curbweight_lbs_to_hp
+
+                    # set up RSE terms and run RSEs
+                    etw_lbs[iterating] = vehicle.curbweight_lbs + vehicle_ballast
+
+                    is_iterating = np.zeros(num_points, dtype=bool)
+                    is_iterating[iterating] = True
+                    for rse_template, template_points, coefficients in rse_groups:
+                        iterating_points = is_iterating[template_points]
+                        if iterating_points.any():
+                            points = template_points[iterating_points]
+                            ETW = etw_lbs[points]
+                            RLHP20 = rlhp20[points] / ETW
+                            RLHP60 = rlhp60[points] / ETW
+                            HP_ETW = rated_hp[points] / ETW
+
+                            update_cloud_data(cloud_data, points, zip(rse_names,
+                                              Eval.eval(rse_template, {},
+                                                        {'ETW': ETW, 'RLHP20': RLHP20, 'RLHP60': RLHP60,
+                                                         'HP_ETW': HP_ETW,
+                                                         'c': [c[iterating_points] for c in coefficients]})))
+
+                    # battery sizing -------------------------------------------------------------------------------- #
+                    points = iterating[bev[iterating]]  # TODO: or 'PHEV'
+                    if len(points):
+                        iteration_point = {k: cloud_data[k][points] for k in rse_names}
+                        iteration_point = vehicle.calc_battery_sizing_onroad_direct_kWh_per_mile(iteration_point)
+
+                        battery_kwh[points] = vehicle.charge_depleting_range_mi * \
+                            iteration_point['battery_sizing_onroad_direct_kwh_per_mile'] / \
+                            usable_battery_capacity_norm[points]
+
+                        update_cloud_data(cloud_data, points,
+                                          ((k, v) for k, v in iteration_point.items() if k not in rse_names))
+
+                    # determine convergence ------------------------------------------------------------------------- #
+                    converged = \
+                        (abs(1 - powertrain_mass_lbs[iterating] / prior_powertrain_mass_lbs[iterating]) <=
+                         convergence_tolerance) & \
+                        (abs(1 - rated_hp[iterating] / prior_rated_hp[iterating]) <= convergence_tolerance)
+
+                    # battery size only converges for BEV points (non-BEV battery size may be zero)
+                    bev_iterating = bev[iterating]
+                    converged[bev_iterating] &= \
+                        abs(1 - battery_kwh[iterating[bev_iterating]] / prior_battery_kwh[iterating[bev_iterating]]) < \
+                        convergence_tolerance
+
+                    prior_powertrain_mass_lbs[iterating] = powertrain_mass_lbs[iterating]
+                    prior_rated_hp[iterating] = rated_hp[iterating]
+                    prior_battery_kwh[iterating] = battery_kwh[iterating]
+
+                    iterating = iterating[~converged]
+
+                # -----------------------------------------------------------------------------------------------------#
+
+            if geometry_key is not None:
+                geometry = dict(zip(geometry_terms, (rated_hp, battery_kwh, structure_mass_lbs, battery_mass_lbs,
+                                                     powertrain_mass_lbs, delta_glider_non_structure_mass_lbs,
+                                                     curbweight_lbs, etw_lbs)))
+                _geometry_cache[geometry_key] = copy.deepcopy((cloud_data, geometry))
+
+        for attribute in point_attributes:
+            vehicle.__setattr__(attribute, cloud_data[attribute])
+        vehicle.curbweight_lbs = curbweight_lbs
+
+        cloud_data = vehicle.calc_cert_values(cloud_data)
+
+        # targets are a function of footprint (and curbweight, for medium-duty)
+        target_co2e_Mg_per_vehicle = np.zeros(num_points)
+        cert_co2e_Mg_per_vehicle = np.zeros(num_points)
+        cert_co2e_grams_per_mile = np.broadcast_to(cloud_data['cert_co2e_grams_per_mile'], num_points)
+        for vehicle_footprint in sweep_values[2]:
+            footprint_points = footprint_ft2 == vehicle_footprint
+
+            v = copy.copy(vehicle)
+            v.footprint_ft2 = vehicle_footprint
+            v.curbweight_lbs = curbweight_lbs[footprint_points]
+
+            target_co2e_Mg_per_vehicle[footprint_points] = \
+                omega_globals.options.VehicleTargets.calc_target_co2e_Mg(v, sales_variants=1)
+
+            cert_co2e_Mg_per_vehicle[footprint_points] = \
+                omega_globals.options.VehicleTargets.\
+                calc_cert_co2e_Mg(v, co2_gpmi_variants=cert_co2e_grams_per_mile[footprint_points], sales_variants=1)
+
+        # leave the vehicle as it was after the last point of the cloud
+        vehicle.powertrain_type = ccc_powertrain_type[-1]
+        vehicle.curbweight_lbs = curbweight_lbs[-1]
+
+        cloud_data['target_co2e_Mg_per_vehicle'] = target_co2e_Mg_per_vehicle
+        cloud_data['cert_co2e_Mg_per_vehicle'] = cert_co2e_Mg_per_vehicle
+        cloud_data['credits_co2e_Mg_per_vehicle'] = target_co2e_Mg_per_vehicle - cert_co2e_Mg_per_vehicle
+
+        # required cloud data for powertrain costing, etc:
+        cloud_data['cost_curve_class'] = cost_curve_class
+        cloud_data['structure_mass_lbs'] = structure_mass_lbs
+        cloud_data['footprint_ft2'] = footprint_ft2
+        cloud_data['structure_material'] = structure_material
+        cloud_data['curbweight_lbs'] = curbweight_lbs
+        cloud_data['rated_hp'] = rated_hp
+        if not bev.any():
+            # battery size and total motor/generator power come from RSEs for ICE/HEV
+            cloud_data['battery_kwh'] = cloud_data['hev_batt_kwh']
+            cloud_data['motor_kw'] = cloud_data['hev_motor_kw']
+        else:
+            # battery size and motor power determined by vehicle and iterative range calculation for BEV
+            cloud_data['battery_kwh'] = np.where(bev, battery_kwh, cloud_data.get('hev_batt_kwh', 0))
+            cloud_data['motor_kw'] = np.where(bev, rated_hp / 1.34102, cloud_data.get('hev_motor_kw', 0))
+
+        # informative data for troubleshooting:
+        if vehicle.model_year in omega_globals.options.log_vehicle_cloud_years or \
+                omega_globals.options.log_vehicle_cloud_years == 'all':
+            cloud_data['vehicle_id'] = vehicle.vehicle_id
+            cloud_data['vehicle_base_year_id'] = vehicle.base_year_vehicle_id
+            cloud_data['vehicle_name'] = vehicle.name
+            cloud_data['model_year'] = vehicle.model_year
+            cloud_data['delta_glider_non_structure_mass_lbs'] = delta_glider_non_structure_mass_lbs
+            cloud_data['glider_non_structure_mass_lbs'] = \
+                vehicle.base_year_glider_non_structure_mass_lbs + delta_glider_non_structure_mass_lbs
+            cloud_data['battery_mass_lbs'] = battery_mass_lbs
+            cloud_data['powertrain_mass_lbs'] = powertrain_mass_lbs
+            cloud_data['etw_lbs'] = etw_lbs
+            cloud_data['vehicle_eng_rated_hp'] = vehicle.eng_rated_hp
+            cloud_data['vehicle_mot_rated_kw'] = vehicle.motor_kw
+            cloud_data['rlhp20'] = rlhp20
+            cloud_data['rlhp60'] = rlhp60
+
+        cost_cloud = pd.DataFrame(cloud_data)
+
+        # add powertrain costs
+        powertrain_costs = PowertrainCost.calc_costs(vehicle, cost_cloud)  # includes battery cost
+        powertrain_cost_terms = ['engine_cost', 'driveline_cost', 'emachine_cost', 'battery_cost',
+                                 'electrified_driveline_cost']
+        for idx, ct in enumerate(powertrain_cost_terms):
+            cost_cloud[ct] = powertrain_costs[idx]
 
         glider_costs = \
             GliderCost.calc_cost(vehicle, cost_cloud)  # includes structure_cost and glider_non_structure_cost
@@ -25,6 +25,10 @@ from context.price_modifications import PriceModifications
 
 import postproc_session
 
+cross_subsidy_price_weight = 0.925  # weight of the pricing error, relative to the share error, in the pricing score
+
+cross_subsidy_search_modes = ['grid', 'root']  # valid ``producer_cross_subsidy_search_mode`` settings
+
 
 def calc_cross_subsidy_options_and_response(calendar_year, market_class_tree, compliance_id, producer_decision,
                                             cross_subsidy_options_and_response, producer_consumer_iteration_num,
@@ -250,6 +254,10 @@ def run_producer_consumer(pass_num, manufacturer_annual_data_table):
     consolidating manufacturers, the compliance ID is 'consolidated_OEM', otherwise the compliance ID is the
     manufacturer name.
 
+    If ``parallel_manufacturer_runs`` is enabled, compliance IDs are run in parallel on passes after the first pass
+    when manufacturers are not consolidated.  The first pass is always run sequentially since battery learning
+    depends on the cumulative battery production of all prior manufacturers.
+
     Args:
         pass_num (int): the pass number, 0 = first, 1 = second, etc.
         manufacturer_annual_data_table (None, or DataFrame): if provided, contains manufacturer-level data from the
@@ -261,159 +269,369 @@ def run_producer_consumer(pass_num, manufacturer_annual_data_table):
 
     """
     from producer.vehicles import VehicleFinal
+
+    iteration_log = []
+
+    credit_banks = dict()
+
+    if omega_globals.options.parallel_manufacturer_runs and pass_num > 0 and \
+            not omega_globals.options.consolidate_manufacturers and len(VehicleFinal.compliance_ids) > 1:
+        from omega_model import omega
+        from multiprocessing import Pool
+        import copy
+
+        worker_options = copy.copy(omega_globals.options)
+        worker_options.multiprocessing = False  # pool workers can't start pools of their own
+
+        if omega_globals.options.parallel_manufacturer_processes:
+            num_processes = omega_globals.options.parallel_manufacturer_processes
+        else:
+            num_processes = max(1, min(len(VehicleFinal.compliance_ids), os.cpu_count() - 2))
+
+        # the pool is terminated on the way out of the with block if a compliance ID run fails
+        with Pool(processes=num_processes) as pool:
+            results = dict()
+            for compliance_id in VehicleFinal.compliance_ids:
+                results[compliance_id] = \
+                    pool.apply_async(func=omega.run_compliance_id_process,
+                                     args=[worker_options, pass_num, compliance_id, manufacturer_annual_data_table,
+                                           omega_globals.cumulative_battery_GWh],
+                                     error_callback=omega.error_callback)
+
+            pool.close()
+
+            # merge results in compliance ID order so the database matches a sequential run
+            for compliance_id in VehicleFinal.compliance_ids:
+                compliance_id_results = results[compliance_id].get()
+                merge_compliance_id_results(compliance_id_results)
+                iteration_log += compliance_id_results['iteration_log']
+                credit_banks[compliance_id] = compliance_id_results['credit_bank']
+
+            pool.join()
+    else:
+        for compliance_id in VehicleFinal.compliance_ids:
+            compliance_id_iteration_log, credit_banks[compliance_id] = \
+                run_compliance_id(pass_num, compliance_id, manufacturer_annual_data_table)
+            iteration_log += compliance_id_iteration_log
+
+    iteration_log_df = pd.DataFrame(iteration_log)
+
+    iteration_log_df.to_csv(
+        omega_globals.options.output_folder + omega_globals.options.session_unique_name +
+        '_producer_consumer_iteration_log.csv', columns=sorted(iteration_log_df.columns))
+
+    return iteration_log_df, credit_banks
+
+
+def run_compliance_id(pass_num, compliance_id, manufacturer_annual_data_table):
+    """
+    Run the producer-consumer iteration across the analysis years for a single compliance ID.
+
+    Args:
+        pass_num (int): the pass number, 0 = first, 1 = second, etc.
+        compliance_id (str): manufacturer name, or 'consolidated_OEM'
+        manufacturer_annual_data_table (None, or DataFrame): if provided, contains manufacturer-level data from the
+        first pass
+
+    Returns:
+        List of iteration log data, the compliance ID credit bank (iteration_log, credit_bank),
+        updates omega database with final vehicle technology and market share data
+
+    """
     from policy.credit_banking import CreditBank
     from producer import compliance_search
 
     iteration_log = []
 
-    credit_banks = dict()
+    omega_log.logwrite("\nRunning %s Pass %d: Manufacturer=%s" % (omega_globals.options.session_unique_name,
+                                                                  pass_num, compliance_id),
+                       echo_console=True)
 
-    for compliance_id in VehicleFinal.compliance_ids:
-        omega_log.logwrite("\nRunning %s Pass %d: Manufacturer=%s" % (omega_globals.options.session_unique_name,
-                                                                      pass_num, compliance_id),
-                           echo_console=True)
+    analysis_end_year = omega_globals.options.analysis_final_year + 1
 
-        analysis_end_year = omega_globals.options.analysis_final_year + 1
+    credit_bank = CreditBank(omega_globals.options.ghg_credit_params_file,
+                             omega_globals.options.ghg_credits_file, compliance_id)
 
-        credit_banks[compliance_id] = CreditBank(
-            omega_globals.options.ghg_credit_params_file,
-            omega_globals.options.ghg_credits_file, compliance_id)
+    prior_producer_decision_and_response = None
 
-        prior_producer_decision_and_response = None
+    # start from no (locked) cross subsidy multipliers, so the prior compliance ID's multipliers, if any, don't carry
+    # over and the results don't depend on which compliance IDs ran before in this process
+    omega_globals.price_modification_data = None
+    omega_globals.locked_price_modification_data = None
 
-        for calendar_year in range(omega_globals.options.analysis_initial_year, analysis_end_year):
+    for calendar_year in range(omega_globals.options.analysis_initial_year, analysis_end_year):
 
-            credit_banks[compliance_id].update_credit_age(calendar_year)
+        credit_bank.update_credit_age(calendar_year)
 
-            if manufacturer_annual_data_table is None or omega_globals.options.credit_market_efficiency == 0.0:
-                # strategy: use credits and pay debits over their remaining lifetime, instead of all at once:
-                strategic_target_offset_Mg = 0
-                current_credits, current_debits = credit_banks[compliance_id].get_credit_info(calendar_year)
-                for c in current_credits + current_debits:
-                    if c.model_year < omega_globals.options.analysis_initial_year:
-                        # allow strategic under-compliance for historical credits
-                        if c.remaining_balance_Mg < 0 or omega_globals.options.credit_market_efficiency != 0.0:
-                            strategic_target_offset_Mg += \
-                                c.remaining_balance_Mg * (1 / max(1, c.remaining_years - 1))
-                    else:
-                        # don't allow strategic under-compliance for analysis year credits
+        if manufacturer_annual_data_table is None or omega_globals.options.credit_market_efficiency == 0.0:
+            # strategy: use credits and pay debits over their remaining lifetime, instead of all at once:
+            strategic_target_offset_Mg = 0
+            current_credits, current_debits = credit_bank.get_credit_info(calendar_year)
+            for c in current_credits + current_debits:
+                if c.model_year < omega_globals.options.analysis_initial_year:
+                    # allow strategic under-compliance for historical credits
+                    if c.remaining_balance_Mg < 0 or omega_globals.options.credit_market_efficiency != 0.0:
                         strategic_target_offset_Mg += \
-                            min(0, c.remaining_balance_Mg) * (1 / max(1, c.remaining_years - 1))
+                            c.remaining_balance_Mg * (1 / max(1, c.remaining_years - 1))
+                else:
+                    # don't allow strategic under-compliance for analysis year credits
+                    strategic_target_offset_Mg += \
+                        min(0, c.remaining_balance_Mg) * (1 / max(1, c.remaining_years - 1))
+        else:
+            strategic_target_offset_Mg = \
+                manufacturer_annual_data_table[(manufacturer_annual_data_table['compliance_id'] == compliance_id) &
+                                               (manufacturer_annual_data_table['model_year'] == calendar_year)][
+                    'strategic_offset'].item()
+
+        producer_decision_and_response = None
+        best_winning_combo_with_sales_response = None
+
+        producer_consumer_iteration_num = 0
+        iterate_producer_consumer = True
+
+        if omega_globals.options.producer_shares_mode == 'auto':
+            # CU RV
+            omega_globals.producer_shares_mode = False
+        elif omega_globals.options.producer_shares_mode is True:
+            omega_globals.producer_shares_mode = True
+
+        while iterate_producer_consumer:
+            omega_log.logwrite("Running %s:  Year=%s  Iteration=%s %s" %
+                               (omega_globals.options.session_unique_name, calendar_year,
+                                producer_consumer_iteration_num, compliance_id),
+                               echo_console=True)
+
+            candidate_mfr_composite_vehicles, pre_production_vehicles, producer_decision, market_class_tree, \
+                producer_compliant, GWh_limit = \
+                compliance_search.search_production_options(compliance_id, calendar_year,
+                                                            producer_decision_and_response,
+                                                            producer_consumer_iteration_num,
+                                                            strategic_target_offset_Mg,
+                                                            prior_producer_decision_and_response)
+
+            # if producer_compliant is None:
+            #     omega_log.logwrite('%%%%%% Production Constraints Violated ... %%%%%%')
+
+            # composite vehicles have been updated from producer_decision at this point
+            producer_market_classes = \
+                calc_market_class_data_from_composite_vehicles(candidate_mfr_composite_vehicles, producer_decision)
+
+            calc_market_data_from_sales(candidate_mfr_composite_vehicles, producer_decision)
+
+            if 'producer_compliance_search' in omega_globals.options.verbose_console_modules:
+                for mc in sorted(omega_globals.options.MarketClass.market_classes):
+                    if 'producer_abs_share_frac_%s' % mc in producer_decision:
+                        omega_log.logwrite(
+                            ('%d producer_abs_share_frac_%s' % (calendar_year, mc)).ljust(50) + '= %.6f' %
+                            (producer_decision['producer_abs_share_frac_%s' % mc]))
+                omega_log.logwrite('')
+
+            best_winning_combo_with_sales_response, iteration_log, producer_decision_and_response = \
+                iterate_producer_cross_subsidy(calendar_year, compliance_id, best_winning_combo_with_sales_response,
+                                               candidate_mfr_composite_vehicles, iteration_log,
+                                               producer_consumer_iteration_num, producer_market_classes,
+                                               producer_decision, strategic_target_offset_Mg)
+
+            converged, share_convergence_error, cross_subsidy_pricing_error = \
+                detect_producer_consumer_convergence(producer_decision_and_response, producer_market_classes)
+
+            # decide whether to continue iterating or not
+            iterate_producer_consumer = omega_globals.options.iterate_producer_consumer \
+                                        and producer_consumer_iteration_num < \
+                                        omega_globals.options.producer_consumer_max_iterations \
+                                        and (not converged or producer_decision_and_response['total_battery_GWh']
+                                             > GWh_limit)
+
+            if iterate_producer_consumer:
+                producer_consumer_iteration_num += 1
             else:
-                strategic_target_offset_Mg = \
-                    manufacturer_annual_data_table[(manufacturer_annual_data_table['compliance_id'] == compliance_id) &
-                                                   (manufacturer_annual_data_table['model_year'] == calendar_year)][
-                        'strategic_offset'].item()
-
-            producer_decision_and_response = None
-            best_winning_combo_with_sales_response = None
-
-            producer_consumer_iteration_num = 0
-            iterate_producer_consumer = True
-
-            if omega_globals.options.producer_shares_mode == 'auto':
-                # CU RV
-                omega_globals.producer_shares_mode = False
-            elif omega_globals.options.producer_shares_mode is True:
-                omega_globals.producer_shares_mode = True
-
-            while iterate_producer_consumer:
-                omega_log.logwrite("Running %s:  Year=%s  Iteration=%s %s" %
-                                   (omega_globals.options.session_unique_name, calendar_year,
-                                    producer_consumer_iteration_num, compliance_id),
-                                   echo_console=True)
+                if producer_consumer_iteration_num >= omega_globals.options.producer_consumer_max_iterations:
+                    if 'p-c_max_iterations' in omega_globals.options.verbose_console_modules:
+                        omega_log.logwrite(
+                            'PRODUCER-CONSUMER MAX ITERATIONS EXCEEDED, ROLLING BACK TO BEST ITERATION',
+                            echo_console=True)
+                    producer_decision_and_response = best_winning_combo_with_sales_response
 
-                candidate_mfr_composite_vehicles, pre_production_vehicles, producer_decision, market_class_tree, \
-                    producer_compliant, GWh_limit = \
-                    compliance_search.search_production_options(compliance_id, calendar_year,
-                                                                producer_decision_and_response,
-                                                                producer_consumer_iteration_num,
-                                                                strategic_target_offset_Mg,
-                                                                prior_producer_decision_and_response)
-
-                # if producer_compliant is None:
-                #     omega_log.logwrite('%%%%%% Production Constraints Violated ... %%%%%%')
-
-                # composite vehicles have been updated from producer_decision at this point
-                producer_market_classes = \
-                    calc_market_class_data_from_composite_vehicles(candidate_mfr_composite_vehicles, producer_decision)
-
-                calc_market_data_from_sales(candidate_mfr_composite_vehicles, producer_decision)
-
-                if 'producer_compliance_search' in omega_globals.options.verbose_console_modules:
-                    for mc in sorted(omega_globals.options.MarketClass.market_classes):
-                        if 'producer_abs_share_frac_%s' % mc in producer_decision:
-                            omega_log.logwrite(
-                                ('%d producer_abs_share_frac_%s' % (calendar_year, mc)).ljust(50) + '= %.6f' %
-                                (producer_decision['producer_abs_share_frac_%s' % mc]))
-                    omega_log.logwrite('')
-
-                best_winning_combo_with_sales_response, iteration_log, producer_decision_and_response = \
-                    iterate_producer_cross_subsidy(calendar_year, compliance_id, best_winning_combo_with_sales_response,
-                                                   candidate_mfr_composite_vehicles, iteration_log,
-                                                   producer_consumer_iteration_num, producer_market_classes,
-                                                   producer_decision, strategic_target_offset_Mg)
-
-                converged, share_convergence_error, cross_subsidy_pricing_error = \
-                    detect_producer_consumer_convergence(producer_decision_and_response, producer_market_classes)
-
-                # decide whether to continue iterating or not
-                iterate_producer_consumer = omega_globals.options.iterate_producer_consumer \
-                                            and producer_consumer_iteration_num < \
-                                            omega_globals.options.producer_consumer_max_iterations \
-                                            and (not converged or producer_decision_and_response['total_battery_GWh']
-                                                 > GWh_limit)
-
-                if iterate_producer_consumer:
-                    producer_consumer_iteration_num += 1
-                else:
-                    if producer_consumer_iteration_num >= omega_globals.options.producer_consumer_max_iterations:
-                        if 'p-c_max_iterations' in omega_globals.options.verbose_console_modules:
-                            omega_log.logwrite(
-                                'PRODUCER-CONSUMER MAX ITERATIONS EXCEEDED, ROLLING BACK TO BEST ITERATION',
-                                echo_console=True)
-                        producer_decision_and_response = best_winning_combo_with_sales_response
+        update_cross_subsidy_log_data(producer_decision_and_response, calendar_year, compliance_id, converged,
+                                      producer_consumer_iteration_num, producer_compliant, share_convergence_error)
 
-            update_cross_subsidy_log_data(producer_decision_and_response, calendar_year, compliance_id, converged,
-                                          producer_consumer_iteration_num, producer_compliant, share_convergence_error)
+        producer_decision_and_response['cross_subsidy_iteration_num'] = -10  # tag final result
 
-            producer_decision_and_response['cross_subsidy_iteration_num'] = -10  # tag final result
+        iteration_log.append(producer_decision_and_response)
 
-            iteration_log.append(producer_decision_and_response)
+        total_credits_co2e_megagrams, production_battery_gigawatthours = \
+            compliance_search.finalize_production(calendar_year, compliance_id,
+                                                  candidate_mfr_composite_vehicles,
+                                                  pre_production_vehicles,
+                                                  producer_decision_and_response)
 
-            total_credits_co2e_megagrams, production_battery_gigawatthours = \
-                compliance_search.finalize_production(calendar_year, compliance_id,
-                                                      candidate_mfr_composite_vehicles,
-                                                      pre_production_vehicles,
-                                                      producer_decision_and_response)
+        if pass_num == 0:
+            omega_globals.cumulative_battery_GWh['total'] += production_battery_gigawatthours
+            omega_globals.cumulative_battery_GWh[calendar_year] = omega_globals.cumulative_battery_GWh['total']
 
-            if pass_num == 0:
-                omega_globals.cumulative_battery_GWh['total'] += production_battery_gigawatthours
-                omega_globals.cumulative_battery_GWh[calendar_year] = omega_globals.cumulative_battery_GWh['total']
+        credit_bank.handle_credit(calendar_year, total_credits_co2e_megagrams)  # CU RV
 
-            credit_banks[compliance_id].handle_credit(calendar_year, total_credits_co2e_megagrams)  # CU RV
+        omega_globals.options.SalesShare.store_producer_decision_and_response(producer_decision_and_response)
 
-            omega_globals.options.SalesShare.store_producer_decision_and_response(producer_decision_and_response)
+        stock.update_stock(calendar_year, compliance_id)
 
-            stock.update_stock(calendar_year, compliance_id)
+        prior_producer_decision_and_response = producer_decision_and_response
 
-            prior_producer_decision_and_response = producer_decision_and_response
+    credit_bank.credit_bank.to_csv(omega_globals.options.output_folder +
+                                   omega_globals.options.session_unique_name +
+                                   ' %s GHG_credit_balances.csv' % compliance_id, index=False)
 
-        credit_banks[compliance_id].credit_bank.to_csv(omega_globals.options.output_folder +
-                                                       omega_globals.options.session_unique_name +
-                                                       ' %s GHG_credit_balances.csv' % compliance_id, index=False)
+    credit_bank.transaction_log.to_csv(
+        omega_globals.options.output_folder + omega_globals.options.session_unique_name +
+        ' %s GHG_credit_transactions.csv' % compliance_id, index=False)
 
-        credit_banks[compliance_id].transaction_log.to_csv(
-            omega_globals.options.output_folder + omega_globals.options.session_unique_name +
-            ' %s GHG_credit_transactions.csv' % compliance_id, index=False)
+    return iteration_log, credit_bank
 
-    iteration_log_df = pd.DataFrame(iteration_log)
 
-    iteration_log_df.to_csv(
-        omega_globals.options.output_folder + omega_globals.options.session_unique_name +
-        '_producer_consumer_iteration_log.csv', columns=sorted(iteration_log_df.columns))
+def run_compliance_id_process(session_runtime_options, pass_num, compliance_id, manufacturer_annual_data_table,
+                              cumulative_battery_GWh):
+    """
+    Initialize a fresh OMEGA database in a worker process and run a single compliance ID.
 
-    return iteration_log_df, credit_banks
+    Args:
+        session_runtime_options (OMEGASessionSettings): session runtime options
+        pass_num (int): the pass number, 0 = first, 1 = second, etc.
+        compliance_id (str): manufacturer name, or 'consolidated_OEM'
+        manufacturer_annual_data_table (None, or DataFrame): if provided, contains manufacturer-level data from the
+        first pass
+        cumulative_battery_GWh (dict): cumulative battery GWh production, by calendar year, from the first pass
+
+    Returns:
+        Dict of compliance ID results, see ``get_compliance_id_results()``
+
+    """
+    session_runtime_options.logfile_prefix = '%s%s_' % (session_runtime_options.logfile_prefix, compliance_id)
+
+    omega_globals.pass_num = pass_num
+    omega_globals.cumulative_battery_GWh = cumulative_battery_GWh
+
+    init_fail = init_omega(session_runtime_options)
+
+    if init_fail:
+        raise Exception('\n'.join(init_fail))
+
+    iteration_log, credit_bank = run_compliance_id(pass_num, compliance_id, manufacturer_annual_data_table)
+
+    return get_compliance_id_results(compliance_id, iteration_log, credit_bank)
+
+
+def get_compliance_id_results(compliance_id, iteration_log, credit_bank):
+    """
+    Gather the analysis year data created by a compliance ID run so it can be merged into another session database.
+
+    Args:
+        compliance_id (str): manufacturer name, or 'consolidated_OEM'
+        iteration_log (list): list of iteration log data
+        credit_bank (CreditBank): the compliance ID credit bank
+
+    Returns:
+        Dict of compliance ID results
+
+    """
+    from sqlalchemy import inspect
+    from producer.vehicles import VehicleFinal
+    from producer.vehicle_annual_data import VehicleAnnualData
+    from producer.manufacturer_annual_data import ManufacturerAnnualData
+    from context.new_vehicle_market import NewVehicleMarket
+
+    analysis_initial_year = omega_globals.options.analysis_initial_year
+
+    vehicle_attributes = [c.key for c in inspect(VehicleFinal).column_attrs]
+
+    vehicles = omega_globals.session.query(VehicleFinal)\
+        .filter(VehicleFinal.compliance_id == compliance_id)\
+        .filter(VehicleFinal.model_year >= analysis_initial_year)\
+        .order_by(VehicleFinal.vehicle_id).all()
+
+    manufacturer_annual_data_attributes = [c.key for c in inspect(ManufacturerAnnualData).column_attrs
+                                           if c.key != 'index']
+
+    manufacturer_annual_data = omega_globals.session.query(ManufacturerAnnualData)\
+        .filter(ManufacturerAnnualData.compliance_id == compliance_id)\
+        .order_by(ManufacturerAnnualData.index).all()
+
+    SalesShare = omega_globals.options.SalesShare
+
+    calibration_data = dict()
+    if hasattr(SalesShare, 'get_calibration_keys'):
+        calibration_data = {k: SalesShare._calibration_data[k] for k in SalesShare.get_calibration_keys(compliance_id)
+                            if k in SalesShare._calibration_data}
+
+    return {
+        'iteration_log': iteration_log,
+        'credit_bank': credit_bank,
+        'vehicles': [{attr: getattr(v, attr) for attr in vehicle_attributes} for v in vehicles],
+        'vehicle_annual_data': VehicleAnnualData.to_dataframe(compliance_id, min_calendar_year=analysis_initial_year),
+        'manufacturer_annual_data': [{attr: getattr(mad, attr) for attr in manufacturer_annual_data_attributes}
+                                     for mad in manufacturer_annual_data],
+        'context_new_vehicle_generalized_costs':
+            {k: v for k, v in NewVehicleMarket._context_new_vehicle_generalized_costs.items()
+             if k.split('_', 1)[1] == compliance_id},
+        'session_new_vehicle_generalized_costs':
+            {k: v for k, v in NewVehicleMarket._session_new_vehicle_generalized_costs.items()
+             if k.split('_', 1)[1] == compliance_id},
+        'calibration_data': calibration_data,
+        'producer_decisions_and_responses': getattr(SalesShare, 'prev_producer_decisions_and_responses', []),
+    }
+
+
+def merge_compliance_id_results(compliance_id_results):
+    """
+    Merge compliance ID results from a worker process into the session database.  Vehicle IDs are re-assigned by the
+    session database and vehicle annual data is updated to match.
+
+    Args:
+        compliance_id_results (dict): compliance ID results, see ``get_compliance_id_results()``
+
+    Returns:
+        Nothing, updates omega database and class data
+
+    """
+    from producer.vehicles import VehicleFinal
+    from producer.vehicle_annual_data import VehicleAnnualData
+    from producer.manufacturer_annual_data import ManufacturerAnnualData
+    from context.new_vehicle_market import NewVehicleMarket
+
+    worker_vehicle_ids = []
+    vehicles = []
+    for vehicle_data in compliance_id_results['vehicles']:
+        vehicle_data = vehicle_data.copy()
+        worker_vehicle_ids.append(vehicle_data.pop('vehicle_id'))
+        vehicles.append(VehicleFinal(**vehicle_data))
+
+    omega_globals.session.add_all(vehicles)
+    omega_globals.session.flush()  # assign vehicle_ids
+
+    vehicle_id_map = dict(zip(worker_vehicle_ids, [v.vehicle_id for v in vehicles]))
+
+    vehicle_annual_data = compliance_id_results['vehicle_annual_data']
+    vehicle_annual_data['vehicle_id'] = \
+        [vehicle_id_map.get(vehicle_id, vehicle_id) for vehicle_id in vehicle_annual_data['vehicle_id'].tolist()]
+
+    VehicleAnnualData.add_columns(vehicle_annual_data)
+
+    omega_globals.session.add_all([ManufacturerAnnualData(**mad)
+                                   for mad in compliance_id_results['manufacturer_annual_data']])
+    omega_globals.session.flush()
+
+    NewVehicleMarket._context_new_vehicle_generalized_costs.update(
+        compliance_id_results['context_new_vehicle_generalized_costs'])
+
+    NewVehicleMarket._session_new_vehicle_generalized_costs.update(
+        compliance_id_results['session_new_vehicle_generalized_costs'])
+
+    SalesShare = omega_globals.options.SalesShare
+
+    if hasattr(SalesShare, '_calibration_data'):
+        SalesShare._calibration_data.update(compliance_id_results['calibration_data'])
+
+    if hasattr(SalesShare, 'prev_producer_decisions_and_responses'):
+        SalesShare.prev_producer_decisions_and_responses += compliance_id_results['producer_decisions_and_responses']
 
 
 def calc_cross_subsidy_metrics(mcat, cross_subsidy_pair, producer_decision, cross_subsidy_options_and_response):
@@ -635,6 +853,70 @@ def logwrite_cross_subsidy_results(calendar_year, producer_market_classes, cross
                 'market_class_price_modification'] = PriceModifications.get_price_modification(calendar_year, mc)
 
 
+def select_cross_subsidy_option(calendar_year, compliance_id, mcat, cross_subsidy_options_and_response,
+                                producer_consumer_iteration_num, mcat_cross_subsidy_iteration_num, iteration_log,
+                                selected_cross_subsidy_index=None):
+    """
+    Score cross subsidy options, select the best (or the given) option and check it for convergence.
+
+    Args:
+        calendar_year (int): the year in which the compliance calculations take place
+        compliance_id (str): name of manufacturer, e.g. 'consolidated_OEM'
+        mcat (str): market category, e.g. 'hauling' / 'non_hauling'
+        cross_subsidy_options_and_response (DataFrame): cross subsidy options and response, with cross subsidy metrics
+        producer_consumer_iteration_num (int): producer-consumer iteration number
+        mcat_cross_subsidy_iteration_num (int): market category cross subsidy iteration number
+        iteration_log (DataFrame): DataFrame of producer-consumer iteration data
+        selected_cross_subsidy_index (int): optional index of the option to select, else the option with the best
+            pricing score is selected
+
+    Returns:
+        tuple of selected cross subsidy option (Series), share convergence error, cross subsidy pricing error and
+        ``True`` if converged, updates ``iteration_log``
+
+    """
+    # calculate score, weighted distance to the origin
+    cross_subsidy_options_and_response['pricing_score'] = \
+        ((1 - cross_subsidy_price_weight) * cross_subsidy_options_and_response['abs_share_delta_%s' % mcat].values ** 2 +
+         cross_subsidy_price_weight * cross_subsidy_options_and_response[
+             'pricing_price_ratio_delta_%s' % mcat].values ** 2) ** 0.5
+
+    # select best score
+    if selected_cross_subsidy_index is None:
+        selected_cross_subsidy_index = cross_subsidy_options_and_response['pricing_score'].idxmin()
+
+    # note selected option
+    cross_subsidy_options_and_response['selected_cross_subsidy_option'] = 0
+    cross_subsidy_options_and_response.loc[selected_cross_subsidy_index, 'selected_cross_subsidy_option'] = 1
+
+    cross_subsidy_options_and_response['cross_subsidy_iteration_num_%s' % mcat] = \
+        mcat_cross_subsidy_iteration_num
+
+    if 'cross_subsidy_search' in omega_globals.options.verbose_log_modules:
+        iteration_log.append(cross_subsidy_options_and_response)
+
+    # select best cross subsidy option
+    cross_subsidy_options_and_response = \
+        cross_subsidy_options_and_response.loc[selected_cross_subsidy_index].copy()
+
+    share_convergence_error = cross_subsidy_options_and_response['abs_share_delta_%s' % mcat]
+    cross_subsidy_pricing_error = cross_subsidy_options_and_response['pricing_price_ratio_delta_%s' % mcat]
+
+    mcat_converged = (cross_subsidy_pricing_error <=
+                      omega_globals.options.producer_cross_subsidy_price_tolerance) \
+                     and \
+                     (share_convergence_error <= omega_globals.options.producer_consumer_convergence_tolerance)
+
+    # update iteration log
+    update_cross_subsidy_log_data(cross_subsidy_options_and_response, calendar_year, compliance_id, mcat_converged,
+                                  producer_consumer_iteration_num, None,
+                                  cross_subsidy_options_and_response['abs_share_delta_%s' % mcat])
+
+    iteration_log.append(cross_subsidy_options_and_response)
+
+    return cross_subsidy_options_and_response, share_convergence_error, cross_subsidy_pricing_error, mcat_converged
+
+
 def search_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pair, producer_decision,
                            cross_subsidy_options_and_response, producer_consumer_iteration_num, iteration_log):
     """
@@ -642,6 +924,9 @@ def search_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pai
     minimize the error between producer and consumer market shares while maintaining revenue neutrality for the
     producer.
 
+    If ``producer_cross_subsidy_search_mode`` is ``'root'`` the multipliers are first solved for by
+    ``solve_cross_subsidies()``, the grid search is only run if that doesn't converge.
+
     Args:
         calendar_year (int): the year in which the compliance calculations take place
         compliance_id (str): name of manufacturer, e.g. 'consolidated_OEM'
@@ -663,6 +948,22 @@ def search_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pai
     prev_multiplier_range = dict()
     continue_search = True
 
+    locked_multipliers = omega_globals.locked_price_modification_data and \
+        any(mc in omega_globals.locked_price_modification_data for mc in cross_subsidy_pair)
+
+    if omega_globals.options.producer_cross_subsidy_search_mode == 'root' and not locked_multipliers:
+        solved_options_and_response, share_convergence_error, cross_subsidy_pricing_error, mcat_converged, \
+            mcat_cross_subsidy_iteration_num = \
+            solve_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pair, multiplier_columns,
+                                  producer_decision, cross_subsidy_options_and_response,
+                                  producer_consumer_iteration_num, iteration_log)
+
+        if mcat_converged:
+            cross_subsidy_options_and_response = solved_options_and_response
+            continue_search = False
+        elif 'cross_subsidy_search' in omega_globals.options.verbose_console_modules:
+            omega_log.logwrite('ROOT SEARCH FAILED, GRID SEARCH')
+
     while continue_search:
         continue_search, cross_subsidy_options = \
             create_cross_subsidy_options(calendar_year, continue_search, cross_subsidy_pair, multiplier_columns,
@@ -674,61 +975,140 @@ def search_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pai
 
         calc_cross_subsidy_metrics(mcat, cross_subsidy_pair, producer_decision, cross_subsidy_options_and_response)
 
-        price_weight = 0.925
+        cross_subsidy_options_and_response, share_convergence_error, cross_subsidy_pricing_error, mcat_converged = \
+            select_cross_subsidy_option(calendar_year, compliance_id, mcat, cross_subsidy_options_and_response,
+                                        producer_consumer_iteration_num, mcat_cross_subsidy_iteration_num,
+                                        iteration_log)
 
-        # calculate score, weighted distance to the origin
-        cross_subsidy_options_and_response['pricing_score'] = \
-            ((1 - price_weight) * cross_subsidy_options_and_response['abs_share_delta_%s' % mcat].values ** 2 +
-             price_weight * cross_subsidy_options_and_response[
-                 'pricing_price_ratio_delta_%s' % mcat].values ** 2) ** 0.5
+        mcat_cross_subsidy_iteration_num += 1
 
-        # select best score
-        selected_cross_subsidy_index = cross_subsidy_options_and_response['pricing_score'].idxmin()
+        continue_search = continue_search and not mcat_converged
+
+    if cross_subsidy_options_and_response['consumer_constrained_%s' % mcat] and \
+            'p-c_shares_and_costs' in omega_globals.options.verbose_console_modules:
+        omega_log.logwrite('%%%%%% consumer %s shares constrained %%%%%%' % mcat)
 
-        # note selected option
-        cross_subsidy_options_and_response['selected_cross_subsidy_option'] = 0
-        cross_subsidy_options_and_response.loc[selected_cross_subsidy_index, 'selected_cross_subsidy_option'] = 1
+    update_cross_subsidy_pair_console_log(cross_subsidy_pair, share_convergence_error, cross_subsidy_pricing_error,
+                                          mcat_converged)
 
-        cross_subsidy_options_and_response['cross_subsidy_iteration_num_%s' % mcat] = \
-            mcat_cross_subsidy_iteration_num
+    if 'cross_subsidy_search' in omega_globals.options.verbose_console_modules:
+        omega_log.logwrite('')
 
-        if 'cross_subsidy_search' in omega_globals.options.verbose_log_modules:
-            iteration_log.append(cross_subsidy_options_and_response)
+    return cross_subsidy_options_and_response, iteration_log
 
-        # select best cross subsidy option
-        cross_subsidy_options_and_response = \
-            cross_subsidy_options_and_response.loc[selected_cross_subsidy_index].copy()
 
-        share_convergence_error = cross_subsidy_options_and_response['abs_share_delta_%s' % mcat]
-        cross_subsidy_pricing_error = cross_subsidy_options_and_response['pricing_price_ratio_delta_%s' % mcat]
+def solve_cross_subsidies(calendar_year, compliance_id, mcat, cross_subsidy_pair, multiplier_columns,
+                          producer_decision, cross_subsidy_options_and_response, producer_consumer_iteration_num,
+                          iteration_log):
+    """
+    Solve for the cross-subsidy multipliers that match producer and consumer market shares while maintaining revenue
+    neutrality for the producer, as a system of (number of market classes) nonlinear equations: the consumer minus
+    producer absolute share of all but one of the market classes and the ratio of the average cross subsidized price
+    to the average cost, minus one.
+
+    The system is solved by Newton steps from multipliers of 1.0, with a finite difference jacobian.  Each step
+    evaluates the current multipliers and one perturbed set of multipliers per market class in a single call to
+    ``SalesShare.calc_shares()``.  Multipliers are kept within the consumer pricing multiplier min and max, multipliers
+    at a limit are held there while the step would take them past it and the remaining multipliers take the least
+    squares step on the residuals, weighted as in the pricing score.  The search stops when converged, when the step
+    stalls (e.g. when the shares can't be matched within the multiplier limits or the consumer shares are constrained)
+    or when it runs out of iterations.  Convergence criteria and iteration log data are the same as for the grid
+    search.
+
+    Args:
+        calendar_year (int): the year in which the compliance calculations take place
+        compliance_id (str): name of manufacturer, e.g. 'consolidated_OEM'
+        mcat (str): market category, e.g. 'hauling' / 'non_hauling'
+        cross_subsidy_pair (list): list of cross-subsidized market classes, e.g. ['hauling.BEV', 'hauling.ICE']
+        multiplier_columns ([strs]): list of cost multiplier columns,
+            e.g. ['cost_multiplier_hauling.BEV', 'cost_multiplier_hauling.ICE', ...]
+        producer_decision (Series): result of producer compliance search, *without* consumer response
+        cross_subsidy_options_and_response (DataFrame, Series): initially empty dataframe or Series containing cross
+            subsidy options and response
+        producer_consumer_iteration_num (int): producer-consumer iteration number
+        iteration_log (DataFrame): DataFrame of producer-consumer iteration data
+
+    Returns:
+        tuple of last cross subsidy option (Series), share convergence error, cross subsidy pricing error, ``True`` if
+        converged and the number of cross subsidy iterations, updates ``iteration_log``
+
+    """
+    max_iterations = 10
+    finite_difference_step = 1e-6
+
+    multiplier_min = omega_globals.options.consumer_pricing_multiplier_min
+    multiplier_max = omega_globals.options.consumer_pricing_multiplier_max
+
+    num_multipliers = len(cross_subsidy_pair)
+    multipliers = np.ones(num_multipliers)
+
+    residual_weights = np.sqrt([1 - cross_subsidy_price_weight] * (num_multipliers - 1) + [cross_subsidy_price_weight])
+
+    mcat_converged = False
+    mcat_stalled = False
+    mcat_cross_subsidy_iteration_num = 0
+
+    while not (mcat_converged or mcat_stalled) and mcat_cross_subsidy_iteration_num < max_iterations:
+        multiplier_options = np.vstack((multipliers, multipliers + finite_difference_step * np.eye(num_multipliers)))
+
+        cross_subsidy_options = \
+            create_cross_subsidy_multiplier_options(calendar_year, cross_subsidy_pair, multiplier_columns,
+                                                    multiplier_options, producer_decision,
+                                                    cross_subsidy_options_and_response)
+
+        options_and_response = \
+            omega_globals.options.SalesShare.calc_shares(calendar_year, compliance_id, producer_decision,
+                                                         cross_subsidy_options, mcat, cross_subsidy_pair)
+
+        calc_cross_subsidy_metrics(mcat, cross_subsidy_pair, producer_decision, options_and_response)
 
-        mcat_converged = (cross_subsidy_pricing_error <=
-                          omega_globals.options.producer_cross_subsidy_price_tolerance) \
-                         and \
-                         (share_convergence_error <= omega_globals.options.producer_consumer_convergence_tolerance)
+        # consumer minus producer share for all but one market class, the last share follows from the others
+        residuals = [options_and_response['consumer_abs_share_frac_%s' % mc].values -
+                     producer_decision['producer_abs_share_frac_%s' % mc] for mc in cross_subsidy_pair[:-1]]
+        residuals.append(options_and_response['average_ALT_cross_subsidized_price_%s' % mcat].values /
+                         options_and_response['average_ALT_new_vehicle_mfr_cost_%s' % mcat].values - 1)
+        residuals = np.array(residuals, dtype=float)
+
+        if 'cross_subsidy_search' in omega_globals.options.verbose_console_modules:
+            for mcc, multiplier in zip(multiplier_columns, multipliers):
+                omega_log.logwrite(('%s' % mcc).ljust(35) + '= %.8f' % multiplier)
+
+        selected_option, share_convergence_error, cross_subsidy_pricing_error, mcat_converged = \
+            select_cross_subsidy_option(calendar_year, compliance_id, mcat, options_and_response,
+                                        producer_consumer_iteration_num, mcat_cross_subsidy_iteration_num,
+                                        iteration_log, selected_cross_subsidy_index=0)
 
         mcat_cross_subsidy_iteration_num += 1
 
-        # update iteration log
-        update_cross_subsidy_log_data(cross_subsidy_options_and_response, calendar_year, compliance_id, mcat_converged,
-                                      producer_consumer_iteration_num, None,
-                                      cross_subsidy_options_and_response['abs_share_delta_%s' % mcat])
+        if not mcat_converged:
+            jacobian = (residuals[:, 1:] - residuals[:, [0]]) / finite_difference_step * residual_weights[:, np.newaxis]
+            weighted_residuals = residuals[:, 0] * residual_weights
 
-        iteration_log.append(cross_subsidy_options_and_response)
+            # hold multipliers at a limit if the step would take them past it
+            free_multipliers = np.ones(num_multipliers, dtype=bool)
+            delta_multipliers = np.zeros(num_multipliers)
+            while free_multipliers.any():
+                delta_multipliers[:] = 0
+                delta_multipliers[free_multipliers] = \
+                    np.linalg.lstsq(jacobian[:, free_multipliers], -weighted_residuals, rcond=None)[0]
 
-        continue_search = continue_search and not mcat_converged
+                limited_multipliers = free_multipliers & \
+                    (((multipliers <= multiplier_min) & (delta_multipliers < 0)) |
+                     ((multipliers >= multiplier_max) & (delta_multipliers > 0)))
 
-    if cross_subsidy_options_and_response['consumer_constrained_%s' % mcat] and \
-            'p-c_shares_and_costs' in omega_globals.options.verbose_console_modules:
-        omega_log.logwrite('%%%%%% consumer %s shares constrained %%%%%%' % mcat)
+                if not limited_multipliers.any():
+                    break
 
-    update_cross_subsidy_pair_console_log(cross_subsidy_pair, share_convergence_error, cross_subsidy_pricing_error,
-                                          mcat_converged)
+                free_multipliers &= ~limited_multipliers
 
-    if 'cross_subsidy_search' in omega_globals.options.verbose_console_modules:
-        omega_log.logwrite('')
+            new_multipliers = np.clip(multipliers + delta_multipliers, multiplier_min, multiplier_max)
 
-    return cross_subsidy_options_and_response, iteration_log
+            mcat_stalled = np.all(abs(new_multipliers - multipliers) <= 1e-9)
+
+            multipliers = new_multipliers
+
+    return selected_option, share_convergence_error, cross_subsidy_pricing_error, mcat_converged, \
+        mcat_cross_subsidy_iteration_num
 
 
 def update_cross_subsidy_pair_console_log(cross_subsidy_pair, share_convergence_error, cross_subsidy_pricing_error,
@@ -895,6 +1275,45 @@ def create_cross_subsidy_options(calendar_year, continue_search, mc_pair, multip
     return continue_search, price_options_df
 
 
+def create_cross_subsidy_multiplier_options(calendar_year, mc_pair, multiplier_columns, multipliers, producer_decision,
+                                            producer_decision_and_response):
+    """
+    Calculate cross subsidy pricing options for the given sets of multipliers, as for ``create_cross_subsidy_options()``
+    but without a cartesian product of multiplier ranges.
+
+    Args:
+        calendar_year (int): calendar year of the iteration
+        mc_pair ([strs]): list of cross-subsidized market classes, e.g. ['hauling.BEV', 'hauling.ICE']
+        multiplier_columns ([strs]): list of cost multiplier columns,
+            e.g. ['cost_multiplier_hauling.BEV', 'cost_multiplier_hauling.ICE', ...]
+        multipliers (numpy.array): array of multipliers, one row per option, one column per multiplier column
+        producer_decision (DataFrame): producer production decision dataframe
+        producer_decision_and_response (DataFrame, Series): empty DataFrame or Series containing producer compliance
+            search result and consumer response to any prior cross subsidy pairs
+
+    Returns:
+        Dataframe of producer decision with cross subsidy pricing options
+
+    """
+    price_options_df = pd.DataFrame(multipliers, columns=multiplier_columns)
+
+    if not producer_decision_and_response.empty:
+        # drop multiplier columns to prevent duplicates during cartesian product:
+        price_options_df = cartesian_prod(producer_decision_and_response.to_frame().transpose().
+                                          drop(multiplier_columns, axis=1, errors='ignore'), price_options_df)
+
+    for mc, mcc in zip(mc_pair, multiplier_columns):
+        price_options_df['average_ALT_cross_subsidized_price_%s' % mc] = \
+            producer_decision['average_ALT_new_vehicle_mfr_cost_%s' % mc] * price_options_df[mcc].values
+
+        price_modification = PriceModifications.get_price_modification(calendar_year, mc)
+
+        price_options_df['average_ALT_modified_cross_subsidized_price_%s' % mc] = \
+            price_options_df['average_ALT_cross_subsidized_price_%s' % mc].values + price_modification
+
+    return price_options_df
+
+
 def tighten_multiplier_range(multiplier_column, prev_multiplier_ranges, producer_decision_and_response,
                              search_collapsed):
     """
@@ -1480,6 +1899,10 @@ def init_omega(session_runtime_options):
     try:
         init_fail = init_user_definable_decomposition_attributes(verbose_init)
 
+        if omega_globals.options.producer_cross_subsidy_search_mode not in cross_subsidy_search_modes:
+            init_fail.append('Invalid producer_cross_subsidy_search_mode "%s", expected one of %s' %
+                             (omega_globals.options.producer_cross_subsidy_search_mode, cross_subsidy_search_modes))
+
         # instantiate database tables
         SQABase.metadata.create_all(omega_globals.engine)
 
@@ -1593,16 +2016,144 @@ def init_omega(session_runtime_options):
     return init_fail
 
 
-def poolstart():
+# session settings that vary from pass to pass, or session to session, without changing the input data:
+# (consolidate_manufacturers, context_new_vehicle_generalized_costs_file and sales_share_calibration_file change
+# between passes but are part of the input data, so workers are re-initialized when they change)
+pool_runtime_settings = ['inputfile_metadata', 'session_name', 'session_unique_name', 'output_folder_base',
+                         'output_folder', 'database_dump_folder', 'vehicles_df',
+                         'analysis_initial_year', 'logfilename', 'start_time', 'end_time', 'standalone_run',
+                         'manufacturer_gigawatthour_data', 'producer_consumer_max_iterations']
+
+
+def get_pool_init_key(session_runtime_options):
+    """
+    Get a key that identifies the input data of a session.  Input files are identified by their contents rather than
+    their names since each bundled session has its own copy of the input files.
+
+    Args:
+        session_runtime_options (OMEGASessionSettings): session runtime options
+
+    Returns:
+        A tuple of (setting name, setting value) pairs
+
+    """
+    import hashlib
+
+    init_key = []
+    for k, v in sorted(vars(session_runtime_options).items()):
+        if k not in pool_runtime_settings:
+            if k.endswith('_file') and type(v) is str and os.path.isfile(v):
+                with open(v, 'rb') as f:
+                    v = hashlib.md5(f.read()).hexdigest()
+            init_key.append((k, repr(v)))
+
+    return tuple(init_key)
+
+
+def init_pool_process(barrier):
+    """
+    Initialize a pool worker process.
+
+    Args:
+        barrier (multiprocessing.Barrier): barrier shared by all the pool worker processes
+
     """
-    Placeholder for pool startup function
+    omega_globals.pool_barrier = barrier
+    omega_globals.pool_init_key = None
+
+
+def pool_init_omega(session_runtime_options, init_key):
+    """
+    Initialize a pool worker process for a session.  If the worker was already initialized with the same input data
+    (e.g. on a prior session) then the loaded input data and cost clouds are kept and only the session runtime options
+    and logfile are updated.  Waits for the other pool workers so that each worker handles exactly one call.
+
+    Args:
+        session_runtime_options (OMEGASessionSettings): session runtime options
+        init_key (tuple): the input data key, from ``get_pool_init_key()``
 
     Returns:
-        ``None``
+        List of template/input errors, else empty list on success
 
     """
-    return None
-    # CU
+    try:
+        if init_key == omega_globals.pool_init_key:
+            omega_globals.options = session_runtime_options
+            omega_log.set_logfilename()
+            init_fail = []
+        else:
+            omega_globals.pool_init_key = None
+            init_fail = init_omega(session_runtime_options)
+            if not init_fail:
+                omega_globals.pool_init_key = init_key
+    finally:
+        omega_globals.pool_barrier.wait()
+
+    return init_fail
+
+
+def start_pool(num_processes):
+    """
+    Start the worker pool, or reuse the running pool if it has the requested number of processes, and make sure the
+    pool worker processes are initialized for the current session.
+
+    Args:
+        num_processes (int): the number of pool worker processes
+
+    Returns:
+        List of template/input errors, else empty list on success
+
+    """
+    from omega_model import omega
+
+    from multiprocessing import Pool, Barrier, freeze_support
+
+    if omega_globals.pool is not None and omega_globals.pool_num_processes != num_processes:
+        shutdown_pool()
+
+    if omega_globals.pool is None:
+        freeze_support()
+
+        omega_globals.pool = Pool(processes=num_processes, initializer=omega.init_pool_process,
+                                  initargs=[Barrier(num_processes)])
+        omega_globals.pool_num_processes = num_processes
+        omega_globals.pool_init_key = None
+
+    init_key = get_pool_init_key(omega_globals.options)
+
+    if init_key == omega_globals.pool_init_key:
+        omega_log.logwrite('Reusing initialized worker pool')
+
+    results = []
+    for i in range(num_processes):
+        results.append(omega_globals.pool.apply_async(func=omega.pool_init_omega,
+                                                      args=[omega_globals.options, init_key],
+                                                      callback=None,
+                                                      error_callback=omega.error_callback))
+
+    init_fail = []
+    for r in results:
+        init_fail += r.get()
+
+    if init_fail:
+        omega_globals.pool_init_key = None
+    else:
+        omega_globals.pool_init_key = init_key
+
+    return init_fail
+
+
+def shutdown_pool():
+    """
+    Close the worker pool, if there is one.
+
+    """
+    if omega_globals.pool is not None:
+        omega_globals.pool.close()
+        omega_globals.pool.join()
+        omega_globals.pool = None
+        omega_globals.pool_num_processes = 0
+        omega_globals.pool_init_key = None
 
 
 def error_callback(e):
@@ -1695,12 +2246,6 @@ def run_omega(session_runtime_options, standalone_run=False):
 
             if not init_fail:
                 if omega_globals.options.multiprocessing:
-                    from omega_model import omega
-
-                    from multiprocessing import Pool, freeze_support
-
-                    freeze_support()
-
                     num_processes = min(len(omega_globals.options.MarketClass.market_classes), os.cpu_count() - 2)
 
                     if not omega_globals.options.standalone_run and not omega_globals.options.session_is_reference:
@@ -1708,16 +2253,11 @@ def run_omega(session_runtime_options, standalone_run=False):
                             max(1, int(num_processes / omega_globals.options.non_context_session_process_scaler))
 
                     start_time = time.time()
-                    omega_globals.pool = Pool(processes=num_processes,
-                                              initializer=omega.init_omega, initargs=[omega_globals.options])
 
-                    results = []
-                    for i in range(num_processes):
-                        results.append(omega_globals.pool.apply_async(func=omega.poolstart,
-                                                                      callback=None,
-                                                                      error_callback=omega.error_callback))
+                    pool_init_fail = start_pool(num_processes)
 
-                    [r.get() for r in results]
+                    if pool_init_fail:
+                        raise Exception('\n'.join(pool_init_fail))
 
                     # print('Elapsed init time = %f' % (time.time() - start_time))
 
@@ -1767,11 +2307,6 @@ def run_omega(session_runtime_options, standalone_run=False):
                                                       (omega_globals.options.output_folder_base,
                                                        omega_globals.options.consolidate_manufacturers), index=False)
 
-                # everybody out of the pool
-                if omega_globals.options.multiprocessing:
-                    omega_globals.pool.close()
-                    omega_globals.pool.join()
-
                 # save context calibration files
                 from context.new_vehicle_market import NewVehicleMarket
                 if omega_globals.options.session_is_reference and \
@@ -1836,18 +2371,52 @@ def run_omega(session_runtime_options, standalone_run=False):
             for f in output_folders:
                 file_io.delete_folder(f)
 
+        # batch runs keep the pool for the next session, see omega_batch.run_bundled_sessions()
+        if standalone_run:
+            shutdown_pool()
+
     except:
         omega_log.logwrite("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
         print("### Check OMEGA log for error messages ###")
         omega_log.end_logfile("\nSession Fail")
         dump_omega_db_to_csv(omega_globals.options.database_dump_folder)
 
+        # everybody out of the pool
+        shutdown_pool()
+
 
 if __name__ == "__main__":
     try:
         import producer
 
         run_omega(OMEGASessionSettings(), standalone_run=True)
+
+        # parallel manufacturer runs, with 2 processes, versus sequential manufacturer runs
+        test_output_folders = dict()
+        for parallel_manufacturer_runs in [False, True]:
+            test_options = OMEGASessionSettings()
+            test_options.credit_market_efficiency = 0.5  # two-pass, second pass by manufacturer
+            test_options.include_manufacturers_list = ['BMW', 'Ford']
+            test_options.parallel_manufacturer_runs = parallel_manufacturer_runs
+            test_options.parallel_manufacturer_processes = 2
+            test_options.output_folder_base = \
+                'out%sparallel_manufacturer_runs_%d%s' % (os.sep, parallel_manufacturer_runs, os.sep)
+            test_output_folders[parallel_manufacturer_runs] = test_options.output_folder_base
+
+            run_omega(test_options, standalone_run=True)
+
+        for output_file in ['_vehicles.csv', '_vehicle_annual_data.csv', '_manufacturer_annual_data.csv',
+                            '_producer_consumer_iteration_log.csv']:
+            output_file = OMEGASessionSettings().session_unique_name + output_file
+            # from_vehicle_id is the transient Vehicle object ID, which depends on the process that created it
+            pd.testing.assert_frame_equal(
+                pd.read_csv(test_output_folders[False] + output_file).drop(columns='from_vehicle_id',
+                                                                           errors='ignore'),
+                pd.read_csv(test_output_folders[True] + output_file).drop(columns='from_vehicle_id',
+                                                                          errors='ignore'),
+                check_exact=False, rtol=1e-9)
+
+        print('parallel manufacturer runs test passed')
     except:
         print("\n#RUNTIME FAIL\n%s\n" % traceback.format_exc())
         os._exit(-1)
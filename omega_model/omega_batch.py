@@ -942,6 +942,10 @@ class OMEGASessionObject(OMEGABase):
             self.read_parameter('Run Profiler', self.settings.run_profiler),
             true_false_dict)
 
+        self.settings.parallel_manufacturer_runs = validate_predefined_input(
+            self.read_parameter('Parallel Manufacturer Runs', self.settings.parallel_manufacturer_runs),
+            true_false_dict)
+
         self.settings.slice_tech_combo_cloud_tables = validate_predefined_input(
             self.read_parameter('Slice Tech Combo Tables', self.settings.slice_tech_combo_cloud_tables),
             true_false_dict)
@@ -1176,6 +1180,10 @@ def run_bundled_sessions(options, remote_batchfile, session_list):
                         r = r[1:]
                     batch.batch_log.logwrite(r)
 
+    # the worker pool is kept between sessions, shut it down now that the batch is done
+    from omega import shutdown_pool
+    shutdown_pool()
+
     batch.batch_log.end_logfile("$$$ batch complete $$$")
     return batch
 
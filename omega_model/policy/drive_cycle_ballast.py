@@ -55,6 +55,25 @@ class DriveCycleBallast(OMEGABase):
     """
     _data = dict()
 
+    @staticmethod
+    def get_ballast_start_year(vehicle):
+        """
+        Get the start year of the drive cycle ballast parameters that apply to the given vehicle.
+
+        Args:
+            vehicle (Vehicle): the vehicle to get the drive cycle ballast start year for
+
+        Returns:
+            Drive cycle ballast start year
+
+        """
+        start_years = DriveCycleBallast._data[vehicle.reg_class_id]['start_year']
+        if len(start_years[start_years <= vehicle.model_year]) > 0:
+            return max(start_years[start_years <= vehicle.model_year])
+        else:
+            raise Exception('Missing drive cycle ballast parameters for %s, %d or prior' %
+                            (vehicle.reg_class_id, vehicle.model_year))
+
     @staticmethod
     def get_ballast_lbs(vehicle):
         """
@@ -72,16 +91,11 @@ class DriveCycleBallast(OMEGABase):
 
         if True or cache_key not in DriveCycleBallast._data:
 
-            start_years = DriveCycleBallast._data[vehicle.reg_class_id]['start_year']
-            if len(start_years[start_years <= vehicle.model_year]) > 0:
-                calendar_year = max(start_years[start_years <= vehicle.model_year])
+            calendar_year = DriveCycleBallast.get_ballast_start_year(vehicle)
 
-                DriveCycleBallast._data[cache_key] = \
-                    Eval.eval(DriveCycleBallast._data[vehicle.reg_class_id, calendar_year]['ballast_lbs'], {},
-                              {'vehicle': vehicle})
-            else:
-                raise Exception('Missing drive cycle ballast parameters for %s, %d or prior' %
-                                (vehicle.reg_class_id, vehicle.model_year))
+            DriveCycleBallast._data[cache_key] = \
+                Eval.eval(DriveCycleBallast._data[vehicle.reg_class_id, calendar_year]['ballast_lbs'], {},
+                          {'vehicle': vehicle})
 
         return DriveCycleBallast._data[cache_key]
 
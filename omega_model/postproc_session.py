@@ -70,7 +70,7 @@ def run_postproc(iteration_log, credit_banks):
         .filter(VehicleFinal.in_production).all()
 
     # index vehicle annual data by vehicle id and age for quick access
-    vehicle_annual_data_df = pd.DataFrame(VehicleAnnualData._data).set_index(['compliance_id', 'vehicle_id', 'age'])
+    vehicle_annual_data_df = VehicleAnnualData.to_dataframe().set_index(['compliance_id', 'vehicle_id', 'age'])
     vehicle_annual_data = vehicle_annual_data_df.to_dict(orient='index')
 
     analysis_years = vehicle_years[1:]
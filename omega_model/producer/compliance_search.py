@@ -11,6 +11,8 @@ vehicle CO2e g/mi) and market shares that achieve a targeted certification outco
 """
 
 import time
+import copy
+from functools import partial
 import pandas as pd
 import numpy as np
 
@@ -18,6 +20,8 @@ from common import omega_globals, omega_log, TRUE, FALSE
 
 from producer.vehicles import *
 from common.omega_functions import *
+from common.omega_shared_memory import SharedDataFrame, get_batch_id
+from common.omega_task_scheduler import run_pool_jobs
 
 from consumer.sales_volume import context_new_vehicle_sales
 
@@ -32,6 +36,10 @@ import matplotlib.pyplot as plt
 
 _cache = dict()
 
+production_options_chunk_size = 100000  # max number of compact production options to evaluate at a time
+
+_warm_start_tech_positions = dict()  # tech positions of the last production decision, by compliance_id
+
 
 def error_callback(e):
     """
@@ -142,12 +150,10 @@ def create_tech_sweeps(composite_vehicles, candidate_production_decisions, share
 
         # CU
 
-        tech_cost_options = \
-            cv.get_from_cost_curve('new_vehicle_mfr_cost_dollars', cost_curve_options)
-        tech_generalized_cost_options = \
-            cv.get_from_cost_curve('new_vehicle_mfr_generalized_cost_dollars', cost_curve_options)
-        tech_kwh_options = \
-            cv.get_from_cost_curve('battery_kwh', cost_curve_options)
+        tech_cost_options, tech_generalized_cost_options, tech_kwh_options = \
+            cv.get_attributes_from_cost_curve(['new_vehicle_mfr_cost_dollars',
+                                               'new_vehicle_mfr_generalized_cost_dollars',
+                                               'battery_kwh'], cost_curve_options).T
         # RV CU
 
         d = {'veh_%s_cost_curve_indices' % cv.vehicle_id: cost_curve_options,
@@ -196,7 +202,7 @@ def round_constraints(constraints, min_val=0.0, max_val=1.0):
 
 def create_share_sweeps(calendar_year, market_class_dict, candidate_production_decisions, share_range,
                         consumer_response, context_based_total_sales, prior_producer_decision_and_response,
-                        producer_consumer_iteration_num, node_name='', verbose=False):
+                        producer_consumer_iteration_num, warm_start=False, node_name='', verbose=False):
     """
     Create share sweeps is responsible for creating market share options to
     develop a set of candidate compliance outcomes for the manufacturer in the given year as a function of the
@@ -223,6 +229,10 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
     include the ``consumer_response`` and are used as to generate nearby market share options, again as a function of
     the ``share_range`` as the producer continues to search compliance options.
 
+    On a warm start the constraints are set up as on the first pass but the market share options are generated around
+    the ``candidate_production_decisions`` seed, within the given ``share_range``.  The seed shares are taken relative
+    to their market category so they scale with this year's market category share.
+
     Args:
         calendar_year (int): the year in which the compliance calculations take place
         market_class_dict (dict): a dict of CompositeVehicle object lists hiearchically grouped by market categories
@@ -236,6 +246,7 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
         context_based_total_sales (float): context-based total vehicle sales for the given year
         prior_producer_decision_and_response (Series): prior-year producer decision and response
         producer_consumer_iteration_num (int): producer-consumer iteration number
+        warm_start (bool): ``True`` if the search is warm started from the ``candidate_production_decisions`` seed
         node_name (str): name of the node in the ``market_class_dict``, used to traverse the market class tree
         verbose (bool): enables additional console output if ``True``
 
@@ -258,7 +269,7 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
                                 candidate_production_decisions, share_range,
                                 consumer_response, context_based_total_sales,
                                 prior_producer_decision_and_response, producer_consumer_iteration_num,
-                                node_name=k))
+                                warm_start=warm_start, node_name=k))
 
     if node_name:
         abs_share_column_names = ['producer_abs_share_frac_' + node_name + '.' + c + '.' + alt
@@ -315,7 +326,7 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
                     else:
                         node_abs_share = consumer_response['consumer_abs_share_frac_%s' % node_name]
 
-                    if share_range == 1.0:
+                    if share_range == 1.0 or warm_start:
                         locked_consumer_shares = False
 
                         if consumer_response is not None:
@@ -517,9 +528,30 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
                         round_constraints(min_constraints)
                         round_constraints(max_constraints)
 
+                        warm_start_node = warm_start and not locked_consumer_shares and \
+                            all(scn in candidate_production_decisions for scn in abs_share_column_names) and \
+                            all(candidate_production_decisions[abs_share_column_names].sum(axis=1) > 0)
+
                         if locked_consumer_shares:
                             # print('%s locked consumer shares' % node_name)
                             node_partition = pd.DataFrame.from_dict([min_constraints])
+                        elif warm_start_node:
+                            # generate shares around the seed, within the full range constraints
+                            for scn in abs_share_column_names:
+                                min_constraints.setdefault(scn, 0.0)
+                                max_constraints.setdefault(scn, 1.0)
+
+                            cpd = candidate_production_decisions[abs_share_column_names]
+                            cpd = cpd.div(cpd.sum(axis=1), axis=0)
+                            for scn in abs_share_column_names:
+                                # e.g. this year's NO_ALT shares
+                                cpd[scn] = cpd[scn].clip(min_constraints[scn], max_constraints[scn])
+
+                            node_partition = generate_constrained_nearby_shares(abs_share_column_names, cpd,
+                                                               share_range,
+                                                               omega_globals.options.producer_num_market_share_options,
+                                                               min_constraints=min_constraints,
+                                                               max_constraints=max_constraints)
                         else:
                             node_partition = partition(abs_share_column_names,
                                       num_levels=omega_globals.options.producer_num_market_share_options,
@@ -541,8 +573,10 @@ def create_share_sweeps(calendar_year, market_class_dict, candidate_production_d
                             max_constraints[c] = 0
                         min_constraints[node_name] = 0
                         for scn in sales_share_df.columns:
-                            min_constraints[scn] = sales_share_df[scn].min() / node_abs_share
-                            max_constraints[scn] = sales_share_df[scn].max() / node_abs_share
+                            if not warm_start_node:
+                                # else keep the full range constraints, in case the search has to be widened
+                                min_constraints[scn] = sales_share_df[scn].min() / node_abs_share
+                                max_constraints[scn] = sales_share_df[scn].max() / node_abs_share
                             for c in children:
                                 if c in scn.split('.'):
                                     min_constraints[c] += min_constraints[scn]
@@ -651,6 +685,13 @@ def search_production_options(compliance_id, calendar_year, producer_decision_an
     (``producer_consumer_iteration_num`` > 0) the producer decision and consumer response is used to constrain the range
     of market shares under consideration by the producer.
 
+    If ``producer_compliance_search_warm_start`` is enabled the first producer-consumer iteration is seeded by the
+    prior year's production decision, see ``create_warm_start_decision()``, and starts from
+    ``producer_compliance_search_warm_start_share_range`` instead of the full share range.  If the first search
+    iteration doesn't bracket the compliance target then the search is restarted from a wider share range, and
+    ultimately the full share range.  Subsequent producer-consumer iterations search the full share range, so the
+    producer is free to respond to the consumer shares.
+
     Args:
         compliance_id (str): manufacturer name, or 'consolidated_OEM'
         calendar_year (int): the year of the compliance search
@@ -675,39 +716,60 @@ def search_production_options(compliance_id, calendar_year, producer_decision_an
 
     if (calendar_year == omega_globals.options.analysis_initial_year) and (producer_consumer_iteration_num == 0):
         _cache.clear()
+        _warm_start_tech_positions.clear()
 
     producer_iteration_log = \
         omega_log.IterationLog('%s%d_%d_%s_producer_compliance_search.csv' % (
             omega_globals.options.output_folder, calendar_year, producer_consumer_iteration_num, compliance_id))
 
+    composite_vehicles, pre_production_vehicles, market_class_tree, context_based_total_sales = \
+        create_composite_vehicles(calendar_year, compliance_id)
+
+    first_search_iteration = 0
+    warm_start_decision = None
+    if omega_globals.options.producer_compliance_search_warm_start and producer_consumer_iteration_num == 0:
+        warm_start_decision = create_warm_start_decision(compliance_id, composite_vehicles,
+                                                         prior_producer_decision_and_response)
+        if warm_start_decision is not None:
+            first_search_iteration = \
+                int(np.ceil(np.log(omega_globals.options.producer_compliance_search_warm_start_share_range) /
+                            np.log(omega_globals.options.producer_compliance_search_convergence_factor)))
+            candidate_production_decisions = warm_start_decision
+
     continue_search = True
-    search_iteration = 0
+    search_iteration = first_search_iteration
     best_candidate_production_decision = None
     most_strategic_production_decision = None
 
     while continue_search:
         share_range = omega_globals.options.producer_compliance_search_convergence_factor ** search_iteration
 
-        composite_vehicles, pre_production_vehicles, market_class_tree, context_based_total_sales = \
-            create_composite_vehicles(calendar_year, compliance_id)
+        warm_start = first_search_iteration > 0 and search_iteration == first_search_iteration
+
+        if warm_start:
+            # start tech options in the same range as the shares
+            for cv in composite_vehicles:
+                cv.tech_option_iteration_num = first_search_iteration - 1
 
         tech_sweeps = create_tech_sweeps(composite_vehicles, candidate_production_decisions, share_range)
 
         share_sweeps = create_share_sweeps(calendar_year, market_class_tree,
                                            candidate_production_decisions, share_range,
                                            producer_decision_and_response, context_based_total_sales,
-                                           prior_producer_decision_and_response, producer_consumer_iteration_num)
+                                           prior_producer_decision_and_response, producer_consumer_iteration_num,
+                                           warm_start)
 
         # attempt to save some RAM...
         tech_sweeps = tech_sweeps.astype(np.float32)
         share_sweeps = share_sweeps.astype(np.float32)
 
-        tech_and_share_sweeps = cartesian_prod(tech_sweeps, share_sweeps)
-
         # CU
 
-        production_options = create_production_options_from_shares(composite_vehicles, tech_and_share_sweeps,
-                                                                   context_based_total_sales)
+        production_options = create_compact_production_options(composite_vehicles, tech_sweeps, share_sweeps,
+                                                                context_based_total_sales)
+
+        materialize_func = partial(materialize_production_options, composite_vehicles, tech_sweeps, share_sweeps,
+                                   context_based_total_sales)
 
         # insert code to cull production options based on policy here #
 
@@ -757,7 +819,29 @@ def search_production_options(compliance_id, calendar_year, producer_decision_an
 
             candidate_production_decisions, compliance_possible = \
                 select_candidate_manufacturing_decisions(production_options, calendar_year, search_iteration,
-                                                         producer_iteration_log, buffered_strategic_target_offset_Mg)
+                                                         producer_iteration_log, buffered_strategic_target_offset_Mg,
+                                                         first_search_iteration, materialize_func)
+
+            if warm_start:
+                credits_with_offset_Mg = production_options['total_credits_co2e_megagrams'].values + \
+                                         buffered_strategic_target_offset_Mg.values
+
+                if not (any(credits_with_offset_Mg >= 0) and any(credits_with_offset_Mg < 0)):
+                    # no compliance bracket around the seed, widen the search
+                    first_search_iteration = first_search_iteration // 2
+                    search_iteration = first_search_iteration
+
+                    if first_search_iteration > 0:
+                        candidate_production_decisions = warm_start_decision
+                    else:
+                        candidate_production_decisions = None
+
+                    if 'producer_compliance_search' in omega_globals.options.verbose_console_modules:
+                        omega_log.logwrite('%d_%d WARM START NOT BRACKETED, WIDENING TO SR:%f' %
+                                           (calendar_year, producer_consumer_iteration_num,
+                                            omega_globals.options.producer_compliance_search_convergence_factor **
+                                            search_iteration))
+                    continue
 
             producer_compliance_possible |= compliance_possible
 
@@ -849,10 +933,90 @@ def search_production_options(compliance_id, calendar_year, producer_decision_an
         composite_vehicles = apply_production_decision_to_composite_vehicles(composite_vehicles,
                                                                              selected_production_decision)
 
+        if omega_globals.options.producer_compliance_search_warm_start:
+            _warm_start_tech_positions[compliance_id] = \
+                get_tech_positions(composite_vehicles, selected_production_decision)
+
     return composite_vehicles, pre_production_vehicles, selected_production_decision, market_class_tree, \
            producer_compliance_possible, battery_GWh_limit
 
 
+def get_tech_positions(composite_vehicles, production_decision):
+    """
+    Get the relative position of each composite vehicle's tech option on its cost curve.
+
+    Args:
+        composite_vehicles ([CompositeVehicle]): list of composite vehicles
+        production_decision (Series): production decision with composite vehicle cost curve indices
+
+    Returns:
+        Dict of tech positions [0..1] between the min and max cost curve index, by composite vehicle id
+
+    """
+    tech_positions = dict()
+
+    for cv in composite_vehicles:
+        veh_min_cost_curve_index = cv.get_min_cost_curve_index()
+        veh_max_cost_curve_index = cv.get_max_cost_curve_index()
+
+        if veh_max_cost_curve_index > veh_min_cost_curve_index:
+            tech_positions[cv.vehicle_id] = \
+                (production_decision['veh_%s_cost_curve_indices' % cv.vehicle_id] - veh_min_cost_curve_index) / \
+                (veh_max_cost_curve_index - veh_min_cost_curve_index)
+        else:
+            tech_positions[cv.vehicle_id] = 0
+
+    return tech_positions
+
+
+def create_warm_start_decision(compliance_id, composite_vehicles, prior_producer_decision_and_response):
+    """
+    Create a production decision to seed a warm-started compliance search from the prior year's production decision.
+
+    Market shares are the prior year's consumer shares (or the producer shares, if there's no consumer share).
+    ``create_share_sweeps()`` takes the shares relative to their market category, so the seed follows this year's
+    projected sales mix.  Tech options are placed at the same relative position on each composite vehicle's cost curve
+    as in the prior year's production decision, so the seed follows changes in the cost curves (e.g. due to target
+    changes).
+
+    Args:
+        compliance_id (str): manufacturer name, or 'consolidated_OEM'
+        composite_vehicles ([CompositeVehicle]): the list of producer composite vehicles
+        prior_producer_decision_and_response (Series): prior-year producer decision and response, if any
+
+    Returns:
+        DataFrame of a single production decision, or ``None`` if no seed is available
+
+    """
+    seed = prior_producer_decision_and_response
+
+    if seed is None or compliance_id not in _warm_start_tech_positions:
+        return None
+
+    tech_positions = _warm_start_tech_positions[compliance_id]
+
+    warm_start_decision = dict()
+
+    for scn in seed.keys():
+        if scn.startswith('producer_abs_share_frac_'):
+            warm_start_decision[scn] = seed.get(scn.replace('producer', 'consumer'), seed[scn])
+
+    for cv in composite_vehicles:
+        if cv.vehicle_id not in tech_positions:
+            return None
+
+        veh_min_cost_curve_index = cv.get_min_cost_curve_index()
+        veh_max_cost_curve_index = cv.get_max_cost_curve_index()
+
+        warm_start_decision['veh_%s_cost_curve_indices' % cv.vehicle_id] = \
+            veh_min_cost_curve_index + \
+            tech_positions[cv.vehicle_id] * (veh_max_cost_curve_index - veh_min_cost_curve_index)
+
+        warm_start_decision['veh_%s_sales' % cv.vehicle_id] = seed.get('veh_%s_sales' % cv.vehicle_id, 0)
+
+    return pd.DataFrame([warm_start_decision])
+
+
 def calc_composite_vehicle(mc, rc, alt, mctrc):
     """
     Calculate composite vehicle for the set of vehicles in the given market class / reg class / alt class
@@ -875,6 +1039,108 @@ def calc_composite_vehicle(mc, rc, alt, mctrc):
     return cv
 
 
+def share_vehicle_data(vehicles, batch_id=None):
+    """
+    Get copies of the given vehicles to send to or from the pool worker processes, with their cost curves in shared
+    memory and without the global cumulative battery GWh.
+
+    Args:
+        vehicles ([Vehicle, ...]): the vehicles to share
+        batch_id (int): pool batch id when sharing results from a pool worker process, see ``SharedDataFrame``
+
+    Returns:
+        List of vehicle copies
+
+    """
+    shared_vehicles = []
+    for v in vehicles:
+        shared_veh = copy.copy(v)
+        if v.cost_curve is not None:
+            shared_veh.cost_curve = SharedDataFrame(v.cost_curve, batch_id)
+        shared_veh.global_cumulative_battery_GWh = None
+        shared_vehicles.append(shared_veh)
+
+    return shared_vehicles
+
+
+def restore_vehicle_data(vehicles):
+    """
+    Restore the cost curves and global cumulative battery GWh of vehicles returned by the pool worker processes.
+
+    Args:
+        vehicles ([Vehicle, ...]): the vehicles to restore
+
+    Returns:
+        Nothing, updates vehicle ``cost_curve`` and ``global_cumulative_battery_GWh``
+
+    """
+    for v in vehicles:
+        if isinstance(v.cost_curve, SharedDataFrame):
+            v.cost_curve = v.cost_curve.to_dataframe(unlink=True)
+        v.global_cumulative_battery_GWh = omega_globals.cumulative_battery_GWh
+
+
+def discard_vehicle_data(vehicles):
+    """
+    Unlink the shared memory cost curves of vehicles returned by the pool worker processes that haven't been restored,
+    e.g. when another pool job fails.
+
+    Args:
+        vehicles ([Vehicle, ...]): the vehicles to discard the shared cost curves of, ``None`` entries are skipped
+
+    Returns:
+        Nothing, unlinks the shared memory blocks of unrestored vehicle cost curves
+
+    """
+    for v in vehicles:
+        if v is not None and isinstance(v.cost_curve, SharedDataFrame):
+            v.cost_curve.unlink()
+            v.cost_curve = None
+
+
+def calc_vehicle_frontier_process(vehicle, batch_id):
+    """
+    Calculate the frontier of the given vehicle in a pool worker process.
+
+    Args:
+        vehicle (Vehicle): the vehicle to calculate a frontier for
+        batch_id (int): pool batch id
+
+    Returns:
+        Copy of ``vehicle`` with updated frontier, in shared memory
+
+    """
+    return share_vehicle_data([calc_vehicle_frontier(vehicle)], batch_id)[0]
+
+
+def calc_composite_vehicle_process(mc, rc, alt, mctrc, batch_id):
+    """
+    Calculate composite vehicle in a pool worker process, for the set of vehicles in the given market class / reg
+    class / alt class.  Vehicle cost curves are read from, and returned in, shared memory.
+
+    Args:
+        mc (str): market classs id, e.g. 'hauling.ICE'
+        rc (str): regulatory class, e.g. 'car', 'truck'
+        alt (str): 'ALT' or 'NO_ALT'
+        mctrc (dict): market-class/reg-clas tree, only needs to contain the given market class / reg class / alt class
+        batch_id (int): pool batch id
+
+    Returns:
+        The composite vehicle for the set of vehicles in the given market class / reg class / alt class, with its cost
+        curve and source vehicle cost curves in shared memory
+
+    """
+    for v in mctrc[mc][rc][alt]:
+        v.cost_curve = v.cost_curve.to_dataframe()
+
+    cv = calc_composite_vehicle(mc, rc, alt, mctrc)
+
+    cv.vehicle_list = share_vehicle_data(cv.vehicle_list, batch_id)
+    cv.cost_curve = SharedDataFrame(cv.cost_curve, batch_id)
+
+    return cv
+
+
 def create_composite_vehicles(calendar_year, compliance_id):
     """
     Create composite vehicles based on the prior year's finalized vehicle production and update the sales mix based on
@@ -917,13 +1183,19 @@ def create_composite_vehicles(calendar_year, compliance_id):
                 pre_production_vehicles.append(new_veh)
 
         if omega_globals.options.multiprocessing:
-            results = []
-            for new_veh in manufacturer_vehicles:
-                results.append(omega_globals.pool.apply_async(func=calc_vehicle_frontier,
-                                                              args=[new_veh],
-                                                              callback=None,
-                                                              error_callback=error_callback))
-            manufacturer_vehicles = [r.get() for r in results]
+            batch_id = get_batch_id()
+            frontier_vehicles = [None] * len(manufacturer_vehicles)
+            try:
+                run_pool_jobs('vehicle_frontier', calc_vehicle_frontier_process,
+                              job_args=[[new_veh, batch_id] for new_veh in manufacturer_vehicles],
+                              job_keys=[(new_veh.compliance_id, new_veh.name, new_veh.base_year_vehicle_id)
+                                        for new_veh in manufacturer_vehicles],
+                              job_sizes=[1] * len(manufacturer_vehicles), results=frontier_vehicles)
+                restore_vehicle_data(frontier_vehicles)
+            finally:
+                # unlink the results of completed jobs if a job failed
+                discard_vehicle_data(frontier_vehicles)
+            manufacturer_vehicles = frontier_vehicles
         else:
             for new_veh in manufacturer_vehicles:
                 calc_vehicle_frontier(new_veh)
@@ -1062,15 +1334,37 @@ def create_composite_vehicles(calendar_year, compliance_id):
         composite_vehicles = []
 
         if omega_globals.options.multiprocessing:
-            results = []
-            # start longest jobs first!
-            for mc, rc, alt, _ in mcrc_priority_list:
-                results.append(omega_globals.pool.apply_async(func=calc_composite_vehicle,
-                                                              args=[mc, rc, alt, mctrc],
-                                                              callback=None,
-                                                              error_callback=error_callback))
-
-            composite_vehicles = [r.get() for r in results]
+            batch_id = get_batch_id()
+            shared_vehicles = []
+            try:
+                job_args = []
+                job_keys = []
+                job_sizes = []
+                for mc, rc, alt, _ in mcrc_priority_list:
+                    # send only the vehicles and sales of the composite vehicle, rather than the whole tree
+                    vehicles = share_vehicle_data(mctrc[mc][rc][alt])
+                    shared_vehicles += vehicles
+                    job_args.append([mc, rc, alt,
+                                     {mc: {rc: {alt: vehicles}, '%s_sales' % alt: mctrc[mc]['%s_sales' % alt]}},
+                                     batch_id])
+                    job_keys.append((compliance_id, mc, rc, alt))
+                    # job size is the total number of source vehicle cost curve points
+                    job_sizes.append(sum([v.cost_curve.num_rows for v in vehicles]))
+
+                composite_vehicles = [None] * len(job_args)
+                run_pool_jobs('composite_vehicle', calc_composite_vehicle_process, job_args, job_keys, job_sizes,
+                              results=composite_vehicles)
+
+                for cv in composite_vehicles:
+                    cv.cost_curve = cv.cost_curve.to_dataframe(unlink=True)
+                    restore_vehicle_data(cv.vehicle_list)
+            finally:
+                for v in shared_vehicles:
+                    v.cost_curve.release()
+                # unlink the results of completed jobs if a job failed
+                for cv in composite_vehicles:
+                    if cv is not None:
+                        discard_vehicle_data([cv] + cv.vehicle_list)
         else:
             for mc, rc, alt, _ in mcrc_priority_list:
                 composite_vehicles.append(calc_composite_vehicle(mc, rc, alt, mctrc))
@@ -1217,6 +1511,102 @@ def decompose_candidate_vehicles(candidate_mfr_composite_vehicles, producer_deci
         cv.decompose()  # propagate sales to source vehicles and interpolate cost curve data
 
 
+def get_share_columns(composite_vehicles, production_options):
+    """
+    Get the names of the market share columns that determine composite vehicle sales.
+
+    Args:
+        composite_vehicles (list): list of ``CompositeVehicle`` objects
+        production_options (DataFrame, Series): production options or share options
+
+    Returns:
+        List of market share column names, one per composite vehicle, consumer shares if available (and not in
+        producer shares mode), else producer shares
+
+    """
+    share_columns = []
+    for composite_veh in composite_vehicles:
+        share_id = composite_veh.market_class_id + '.' + composite_veh.alt_type
+        if ('consumer_abs_share_frac_%s' % share_id) in production_options and not omega_globals.producer_shares_mode:
+            share_columns.append('consumer_abs_share_frac_%s' % share_id)
+        else:
+            share_columns.append('producer_abs_share_frac_%s' % share_id)
+
+    return share_columns
+
+
+def calc_production_option_arrays(composite_vehicles, production_options, total_sales):
+    """
+    Calculate composite vehicle sales, costs and compliance outcomes for a set of tech and share options as 2-D arrays
+    (options x composite vehicles), and the option totals as matrix products of those arrays.
+
+    Args:
+        composite_vehicles (list): list of ``CompositeVehicle`` objects
+        production_options (DataFrame, Series): tech and share combinations, one option per row, or a single option
+        total_sales (float): manufacturer total vehicle sales based on the context or the consumer response
+
+    Returns:
+        dict of numpy arrays, per-vehicle values (``veh_sales``, ``veh_total_cost_dollars``,
+        ``veh_cert_co2e_megagrams``, ``veh_target_co2e_megagrams``) have one column per composite vehicle, totals
+        have one value per option
+
+    """
+    is_series = type(production_options) == pd.Series
+
+    def option_columns(column_names):
+        if is_series:
+            return np.array([[production_options[cn] for cn in column_names]], dtype='float64')
+        else:
+            return production_options[column_names].values.astype('float64')
+
+    share_columns = get_share_columns(composite_vehicles, production_options)
+
+    vehicle_ids = [composite_veh.vehicle_id for composite_veh in composite_vehicles]
+
+    # assign sales to vehicles based on market share fractions and reg class share fractions
+    market_class_share_frac = np.array([composite_veh.market_class_share_frac for composite_veh in composite_vehicles])
+    sales = total_sales * option_columns(share_columns) * market_class_share_frac
+
+    cost_curve_indices = option_columns(['veh_%s_cost_curve_indices' % vid for vid in vehicle_ids])
+
+    total_cost_dollars = sales * option_columns(['veh_%s_cost_dollars' % vid for vid in vehicle_ids])
+    total_generalized_cost_dollars = \
+        sales * option_columns(['veh_%s_generalized_cost_dollars' % vid for vid in vehicle_ids])
+    total_GWh = sales * option_columns(['veh_%s_battery_kwh' % vid for vid in vehicle_ids]) / 1e6
+
+    # get cert and target Mg for the composite vehicles from the composite cost curves
+    cert_co2e_Mg = np.empty_like(sales)
+    target_co2e_Mg = np.empty_like(sales)
+    for idx, composite_veh in enumerate(composite_vehicles):
+        cert_and_target_co2e_Mg_per_vehicle = \
+            composite_veh.get_attributes_from_cost_curve(['cert_co2e_Mg_per_vehicle', 'target_co2e_Mg_per_vehicle'],
+                                                         cost_curve_indices[:, idx])
+
+        cert_co2e_Mg[:, idx] = sales[:, idx] * cert_and_target_co2e_Mg_per_vehicle[:, 0]
+        target_co2e_Mg[:, idx] = sales[:, idx] * cert_and_target_co2e_Mg_per_vehicle[:, 1]
+
+    all_vehicles = np.ones(len(composite_vehicles))
+    no_alt_vehicles = np.array([composite_veh.alt_type == 'NO_ALT' for composite_veh in composite_vehicles],
+                               dtype='float64')
+
+    total_target_co2e_Mg = target_co2e_Mg @ all_vehicles
+    total_cert_co2e_Mg = cert_co2e_Mg @ all_vehicles
+
+    return {'veh_sales': sales,
+            'veh_total_cost_dollars': total_cost_dollars,
+            'veh_cert_co2e_megagrams': cert_co2e_Mg,
+            'veh_target_co2e_megagrams': target_co2e_Mg,
+            'total_battery_GWh': total_GWh @ all_vehicles,
+            'total_NO_ALT_battery_GWh': total_GWh @ no_alt_vehicles,
+            'total_ALT_battery_GWh': total_GWh @ (1 - no_alt_vehicles),
+            'total_target_co2e_megagrams': total_target_co2e_Mg,
+            'total_cert_co2e_megagrams': total_cert_co2e_Mg,
+            'total_cost_dollars': total_cost_dollars @ all_vehicles,
+            'total_generalized_cost_dollars': total_generalized_cost_dollars @ all_vehicles,
+            'total_credits_co2e_megagrams': total_target_co2e_Mg - total_cert_co2e_Mg,
+            }
+
+
 def create_production_options_from_shares(composite_vehicles, tech_and_share_combinations, total_sales):
     """
     Create a set of production options, including compliance outcomes, based on the given tech and share combinations.
@@ -1229,129 +1619,176 @@ def create_production_options_from_shares(composite_vehicles, tech_and_share_com
 
     Args:
         composite_vehicles (list): list of ``CompositeVehicle`` objects
-        tech_and_share_combinations (DataFrame): the result of ``create_tech_and_share_sweeps()``
+        tech_and_share_combinations (DataFrame, Series): the result of ``create_tech_and_share_sweeps()``, or a
+            single producer decision
         total_sales (float): manufacturer total vehicle sales based on the context or the consumer response
 
     Returns:
         ``production_options`` DataFrame of technology and share options including compliance outcomes in CO2e Mg
 
+    See Also:
+        ``calc_production_option_arrays()``
+
     """
     production_options = tech_and_share_combinations
 
     is_series = type(production_options) == pd.Series
 
-    total_battery_GWh = 0
-    total_NO_ALT_battery_GWh = 0
-    total_ALT_battery_GWh = 0
-    total_target_co2e_Mg = 0
-    total_cert_co2e_Mg = 0
-    total_cost_dollars = 0
-    total_generalized_cost_dollars = 0
+    option_arrays = calc_production_option_arrays(composite_vehicles, production_options, total_sales)
 
     production_data = dict()
 
-    for composite_veh in composite_vehicles:
-        # assign sales to vehicle based on market share fractions and reg class share fractions
-        share_id = composite_veh.market_class_id + '.' + composite_veh.alt_type
+    for idx, composite_veh in enumerate(composite_vehicles):
+        for k in ['sales', 'total_cost_dollars', 'cert_co2e_megagrams', 'target_co2e_megagrams']:
+            production_data['veh_%s_%s' % (composite_veh.vehicle_id, k)] = option_arrays['veh_%s' % k][:, idx]
 
-        if ('consumer_abs_share_frac_%s' % share_id) in production_options and not omega_globals.producer_shares_mode:
-            if is_series:
-                market_class_sales = total_sales * production_options[
-                    'consumer_abs_share_frac_%s' % share_id]
-            else:
-                market_class_sales = total_sales * production_options[
-                    'consumer_abs_share_frac_%s' % share_id].values
+    for k in ['total_battery_GWh', 'total_NO_ALT_battery_GWh', 'total_ALT_battery_GWh',
+              'total_target_co2e_megagrams', 'total_cert_co2e_megagrams', 'total_cost_dollars',
+              'total_generalized_cost_dollars', 'total_credits_co2e_megagrams']:
+        production_data[k] = option_arrays[k]
 
-        elif ('producer_abs_share_frac_%s' % share_id) in production_options:
-            if is_series:
-                market_class_sales = total_sales * production_options[
-                    'producer_abs_share_frac_%s' % share_id]
-            else:
-                market_class_sales = total_sales * production_options[
-                    'producer_abs_share_frac_%s' % share_id].values
+    if is_series:
+        # apply updated data to production_options
+        for k in production_data:
+            production_options[k] = production_data[k].item()
+        production_options['total_sales'] = total_sales
+    else:
+        production_data['total_sales'] = total_sales
+        production_options = pd.concat([production_options,
+                                        pd.DataFrame(production_data, index=production_options.index)], axis=1)
 
-        composite_veh_sales = market_class_sales * composite_veh.market_class_share_frac
+    return production_options
 
-        # calculate vehicle total cost
-        if is_series:
-            composite_veh_total_cost_dollars = \
-                composite_veh_sales * production_options[
-                    'veh_%s_cost_dollars' % composite_veh.vehicle_id]
 
-            composite_veh_total_generalized_cost_dollars = \
-                composite_veh_sales * production_options[
-                    'veh_%s_generalized_cost_dollars' % composite_veh.vehicle_id]
+def create_compact_production_options(composite_vehicles, tech_sweeps, share_sweeps, total_sales):
+    """
+    Create a set of compact production options, one per combination of tech option and share option, as row numbers
+    in ``tech_sweeps`` and ``share_sweeps`` plus the option totals (compliance outcomes, costs and battery GWh) needed
+    to select candidate production decisions.
 
-            composite_veh_total_GWh = \
-                composite_veh_sales * production_options[
-                    'veh_%s_battery_kwh' % composite_veh.vehicle_id] / 1e6
+    The tech and share option columns and composite vehicle data of selected options are created by
+    ``materialize_production_options()``, rather than creating the cartesian product of all the tech and share option
+    columns.  Option totals are calculated as in ``calc_production_option_arrays()``, for a chunk of tech options at a
+    time.
 
-            composite_veh_cost_curve_options = production_options[
-                'veh_%s_cost_curve_indices' % composite_veh.vehicle_id]
+    Args:
+        composite_vehicles (list): list of ``CompositeVehicle`` objects
+        tech_sweeps (DataFrame): tech options, from ``create_tech_sweeps()``
+        share_sweeps (DataFrame): share options, from ``create_share_sweeps()``
+        total_sales (float): manufacturer total vehicle sales based on the context
 
-        else:
-            composite_veh_total_cost_dollars = \
-                composite_veh_sales * production_options[
-                    'veh_%s_cost_dollars' % composite_veh.vehicle_id].values
-
-            composite_veh_total_generalized_cost_dollars = \
-                composite_veh_sales * production_options[
-                    'veh_%s_generalized_cost_dollars' % composite_veh.vehicle_id].values
-
-            composite_veh_total_GWh = \
-                composite_veh_sales * production_options[
-                    'veh_%s_battery_kwh' % composite_veh.vehicle_id].values / 1e6
-
-            composite_veh_cost_curve_options = production_options[
-                'veh_%s_cost_curve_indices' % composite_veh.vehicle_id].values
-
-        # get cert and target Mg for the composite vehicle from the composite cost curve
-        composite_veh_cert_co2e_Mg = \
-            composite_veh_sales * \
-            DecompositionAttributes.interp1d(composite_veh, composite_veh.cost_curve, cost_curve_interp_key,
-                                             composite_veh_cost_curve_options, 'cert_co2e_Mg_per_vehicle')
-
-        composite_veh_target_co2e_Mg = \
-            composite_veh_sales * \
-            DecompositionAttributes.interp1d(composite_veh, composite_veh.cost_curve, cost_curve_interp_key,
-                                             composite_veh_cost_curve_options, 'target_co2e_Mg_per_vehicle')
-
-        production_data['veh_%s_sales' % composite_veh.vehicle_id] = composite_veh_sales
-        production_data['veh_%s_total_cost_dollars' % composite_veh.vehicle_id] = composite_veh_total_cost_dollars
-        production_data['veh_%s_cert_co2e_megagrams' % composite_veh.vehicle_id] = composite_veh_cert_co2e_Mg
-        production_data['veh_%s_target_co2e_megagrams' % composite_veh.vehicle_id] = composite_veh_target_co2e_Mg
-
-        # update totals
-        total_battery_GWh += composite_veh_total_GWh
-        if composite_veh.alt_type == 'NO_ALT':
-            total_NO_ALT_battery_GWh += composite_veh_total_GWh
-        else:
-            total_ALT_battery_GWh += composite_veh_total_GWh
-        total_target_co2e_Mg += composite_veh_target_co2e_Mg
-        total_cert_co2e_Mg += composite_veh_cert_co2e_Mg
-        total_cost_dollars += composite_veh_total_cost_dollars
-        total_generalized_cost_dollars += composite_veh_total_generalized_cost_dollars
-
-    production_data['total_battery_GWh'] = total_battery_GWh
-    production_data['total_NO_ALT_battery_GWh'] = total_NO_ALT_battery_GWh
-    production_data['total_ALT_battery_GWh'] = total_ALT_battery_GWh
-    production_data['total_target_co2e_megagrams'] = total_target_co2e_Mg
-    production_data['total_cert_co2e_megagrams'] = total_cert_co2e_Mg
-    production_data['total_cost_dollars'] = total_cost_dollars
-    production_data['total_generalized_cost_dollars'] = total_generalized_cost_dollars
-    production_data['total_credits_co2e_megagrams'] = total_target_co2e_Mg - total_cert_co2e_Mg
-    production_data['total_sales'] = total_sales
-
-    if type(production_options) is pd.DataFrame:
-        production_options = pd.concat([production_options, pd.DataFrame(production_data)], axis=1)
-    else:
-        # apply updated data to production_options
-        for k in production_data:
-            production_options[k] = production_data[k]
+    Returns:
+        ``production_options`` DataFrame of ``tech_option_index``, ``share_option_index`` and option totals, in the
+        order of ``cartesian_prod(tech_sweeps, share_sweeps)``
+
+    """
+    num_tech_options = len(tech_sweeps)
+    num_share_options = len(share_sweeps)
+    num_vehicles = len(composite_vehicles)
+
+    vehicle_ids = [composite_veh.vehicle_id for composite_veh in composite_vehicles]
+
+    def tech_columns(column_names):
+        return tech_sweeps[column_names].values.astype('float64')
+
+    # composite vehicle sales of each share option
+    market_class_share_frac = np.array([composite_veh.market_class_share_frac for composite_veh in composite_vehicles])
+    share_sales = total_sales * share_sweeps[get_share_columns(composite_vehicles, share_sweeps)].values.astype(
+        'float64') * market_class_share_frac
+
+    # composite vehicle costs, battery kWh, cert and target Mg per vehicle of each tech option
+    cost_curve_indices = tech_columns(['veh_%s_cost_curve_indices' % vid for vid in vehicle_ids])
+    tech_cost_dollars = tech_columns(['veh_%s_cost_dollars' % vid for vid in vehicle_ids])
+    tech_generalized_cost_dollars = tech_columns(['veh_%s_generalized_cost_dollars' % vid for vid in vehicle_ids])
+    tech_battery_kwh = tech_columns(['veh_%s_battery_kwh' % vid for vid in vehicle_ids])
+
+    tech_cert_co2e_Mg = np.empty((num_tech_options, num_vehicles))
+    tech_target_co2e_Mg = np.empty((num_tech_options, num_vehicles))
+    for idx, composite_veh in enumerate(composite_vehicles):
+        cert_and_target_co2e_Mg_per_vehicle = \
+            composite_veh.get_attributes_from_cost_curve(['cert_co2e_Mg_per_vehicle', 'target_co2e_Mg_per_vehicle'],
+                                                         cost_curve_indices[:, idx])
+        tech_cert_co2e_Mg[:, idx] = cert_and_target_co2e_Mg_per_vehicle[:, 0]
+        tech_target_co2e_Mg[:, idx] = cert_and_target_co2e_Mg_per_vehicle[:, 1]
+
+    all_vehicles = np.ones(num_vehicles)
+    no_alt_vehicles = np.array([composite_veh.alt_type == 'NO_ALT' for composite_veh in composite_vehicles],
+                               dtype='float64')
+
+    num_options = num_tech_options * num_share_options
+    production_data = {k: np.empty(num_options) for k in
+                       ['total_battery_GWh', 'total_NO_ALT_battery_GWh', 'total_ALT_battery_GWh',
+                        'total_target_co2e_megagrams', 'total_cert_co2e_megagrams', 'total_cost_dollars',
+                        'total_generalized_cost_dollars', 'total_credits_co2e_megagrams']}
+
+    chunk_num_tech_options = max(1, production_options_chunk_size // max(1, num_share_options))
+
+    for tech_start in range(0, num_tech_options, chunk_num_tech_options):
+        tech_end = min(num_tech_options, tech_start + chunk_num_tech_options)
+        options = slice(tech_start * num_share_options, tech_end * num_share_options)
+
+        def option_tech_values(tech_values):
+            return np.repeat(tech_values[tech_start:tech_end], num_share_options, axis=0)
+
+        sales = np.tile(share_sales, (tech_end - tech_start, 1))
+
+        total_GWh = sales * option_tech_values(tech_battery_kwh) / 1e6
+        total_target_co2e_Mg = (sales * option_tech_values(tech_target_co2e_Mg)) @ all_vehicles
+        total_cert_co2e_Mg = (sales * option_tech_values(tech_cert_co2e_Mg)) @ all_vehicles
+
+        production_data['total_battery_GWh'][options] = total_GWh @ all_vehicles
+        production_data['total_NO_ALT_battery_GWh'][options] = total_GWh @ no_alt_vehicles
+        production_data['total_ALT_battery_GWh'][options] = total_GWh @ (1 - no_alt_vehicles)
+        production_data['total_target_co2e_megagrams'][options] = total_target_co2e_Mg
+        production_data['total_cert_co2e_megagrams'][options] = total_cert_co2e_Mg
+        production_data['total_cost_dollars'][options] = (sales * option_tech_values(tech_cost_dollars)) @ all_vehicles
+        production_data['total_generalized_cost_dollars'][options] = \
+            (sales * option_tech_values(tech_generalized_cost_dollars)) @ all_vehicles
+        production_data['total_credits_co2e_megagrams'][options] = total_target_co2e_Mg - total_cert_co2e_Mg
+
+    production_options = pd.DataFrame({'tech_option_index': np.repeat(np.arange(num_tech_options), num_share_options),
+                                       'share_option_index': np.tile(np.arange(num_share_options), num_tech_options)})
+
+    for k in production_data:
+        production_options[k] = production_data[k]
+
+    production_options['total_sales'] = total_sales
 
     return production_options
 
 
+def materialize_production_options(composite_vehicles, tech_sweeps, share_sweeps, total_sales, production_options):
+    """
+    Create full production options, with tech and share option columns and composite vehicle data, for a (small)
+    subset of compact production options, e.g. candidate production decisions.
+
+    Args:
+        composite_vehicles (list): list of ``CompositeVehicle`` objects
+        tech_sweeps (DataFrame): tech options, from ``create_tech_sweeps()``
+        share_sweeps (DataFrame): share options, from ``create_share_sweeps()``
+        total_sales (float): manufacturer total vehicle sales based on the context
+        production_options (DataFrame): compact production options, from ``create_compact_production_options()``
+
+    Returns:
+        DataFrame of production options as from ``create_production_options_from_shares()`` plus any other columns of
+        the compact ``production_options``, with the same index
+
+    """
+    tech_and_share_options = \
+        pd.concat([tech_sweeps.iloc[production_options['tech_option_index'].values].reset_index(drop=True),
+                   share_sweeps.iloc[production_options['share_option_index'].values].reset_index(drop=True)], axis=1)
+
+    tech_and_share_options.index = production_options.index
+
+    full_production_options = \
+        create_production_options_from_shares(composite_vehicles, tech_and_share_options, total_sales)
+
+    for c in production_options.columns.drop(['tech_option_index', 'share_option_index']):
+        full_production_options[c] = production_options[c]
+
+    return full_production_options
+
+
 def _plot_tech_share_combos_total(calendar_year, production_options):
     """
     Optional function that can bse used to investigate production options via various plots
@@ -1416,7 +1853,8 @@ cloud_slope = None
 
 
 def select_candidate_manufacturing_decisions(production_options, calendar_year, search_iteration,
-                                             producer_iteration_log, strategic_target_offset_Mg):
+                                             producer_iteration_log, strategic_target_offset_Mg,
+                                             first_search_iteration=0, materialize_func=None):
     """
     Select candidate manufacturing decisions from the cloud of production options.  If possible, there will be two
     candidates, one on either side of the compliance target.  If not possible then the closest option will be selected.
@@ -1429,6 +1867,11 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
         strategic_target_offset_Mg (float): if positive, the raw compliance outcome will be under-compliance, if
             negative then the raw compliance outcome will be over-compliance. Used to strategically under- or over-
             comply, perhaps as a result of the desired to earn or burn prior credits in the credit bank
+        first_search_iteration (int): the iteration number the compliance search started from, non-zero for a warm
+            start
+        materialize_func (function): if not ``None`` then ``production_options`` are compact and
+            ``materialize_func(production_options)`` creates the full production options, see
+            ``materialize_production_options()``
 
     Returns:
         tuple ``candidate_production_decisions`` (the best available production decisions),
@@ -1442,6 +1885,13 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
 
     cost_name = 'total_generalized_cost_dollars'
 
+    def production_option_rows(index):
+        # candidate production options, with full production option data
+        if materialize_func is None:
+            return production_options.loc[index]
+        else:
+            return materialize_func(production_options.loc[index])
+
     if production_options['total_generalized_cost_dollars'].max() != \
             production_options['total_generalized_cost_dollars'].min():
         production_options['normalized_total_generalized_cost_dollars'] = \
@@ -1466,7 +1916,7 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
     mini_df['normalized_total_generalized_cost_dollars'] = \
         production_options['normalized_total_generalized_cost_dollars']
 
-    if search_iteration == 0:
+    if search_iteration == first_search_iteration:
         prior_most_strategic_compliant_tech_share_option = None
         prior_most_strategic_non_compliant_tech_share_option = None
         cheapest_index = production_options[cost_name].idxmin()
@@ -1504,7 +1954,7 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
 
         # grab lowest-cost compliant option
         lowest_cost_compliant_tech_share_option = \
-            production_options.loc[[compliant_tech_share_options[cost_name].idxmin()]]
+            production_option_rows([compliant_tech_share_options[cost_name].idxmin()])
 
         compliant_tech_share_options = cull_compliant_points(compliant_tech_share_options,
                                                              prior_most_strategic_compliant_tech_share_option)
@@ -1516,7 +1966,7 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
 
             if np.max(dx) == 0:
                 most_strategic_non_compliant_tech_share_option = \
-                    production_options.loc[[non_compliant_tech_share_options[cost_name].idxmin()]]
+                    production_option_rows([non_compliant_tech_share_options[cost_name].idxmin()])
             else:
                 dy = (non_compliant_tech_share_options[cost_name].values -
                       lowest_cost_compliant_tech_share_option[cost_name].item())
@@ -1526,12 +1976,12 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
                     (dx + sys.float_info.epsilon)
 
                 most_strategic_non_compliant_tech_share_option = \
-                    production_options.loc[[non_compliant_tech_share_options['weighted_slope'].idxmin()]]
+                    production_option_rows([non_compliant_tech_share_options['weighted_slope'].idxmin()])
 
         else:
             if len(non_compliant_tech_share_options.columns) == len(mini_df.columns):
                 most_strategic_non_compliant_tech_share_option = \
-                    production_options.loc[[non_compliant_tech_share_options.index[0]]]
+                    production_option_rows([non_compliant_tech_share_options.index[0]])
             else:
                 most_strategic_non_compliant_tech_share_option = non_compliant_tech_share_options.iloc[[0]]
 
@@ -1543,7 +1993,7 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
 
                 if np.max(dx) == 0:
                     most_strategic_compliant_tech_share_option = \
-                        production_options.loc[[compliant_tech_share_options[cost_name].idxmin()]]
+                        production_option_rows([compliant_tech_share_options[cost_name].idxmin()])
                 else:
                     dy = (compliant_tech_share_options[cost_name].values -
                            most_strategic_non_compliant_tech_share_option[cost_name].item())
@@ -1554,11 +2004,11 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
                         (dx + sys.float_info.epsilon)
 
                     most_strategic_compliant_tech_share_option = \
-                        production_options.loc[[compliant_tech_share_options['weighted_slope'].idxmax()]]
+                        production_option_rows([compliant_tech_share_options['weighted_slope'].idxmax()])
             else:
                 if len(compliant_tech_share_options.columns) == len(mini_df.columns):
                     most_strategic_compliant_tech_share_option = \
-                        production_options.loc[[compliant_tech_share_options.index[0]]]
+                        production_option_rows([compliant_tech_share_options.index[0]])
                 else:
                     most_strategic_compliant_tech_share_option = compliant_tech_share_options.iloc[[0]]
 
@@ -1597,7 +2047,7 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
 
         if len(non_compliant_tech_share_options.columns) == len(mini_df.columns):
             most_strategic_non_compliant_tech_share_option = \
-                production_options.loc[[non_compliant_tech_share_options['strategic_compliance_ratio'].idxmin()]]
+                production_option_rows([non_compliant_tech_share_options['strategic_compliance_ratio'].idxmin()])
         else:
             most_strategic_non_compliant_tech_share_option = non_compliant_tech_share_options.iloc[[0]]
 
@@ -1629,11 +2079,11 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
                     omega_globals.options.producer_voluntary_overcompliance_min_benefit_frac:
                 # take lowest cost if it's at least X percent cheaper than the most strategic
                 most_strategic_compliant_tech_share_option = \
-                    production_options.loc[[compliant_tech_share_options[cost_name].idxmin()]]
+                    production_option_rows([compliant_tech_share_options[cost_name].idxmin()])
             else:
                 # take closest to strategic taraget
                 most_strategic_compliant_tech_share_option = \
-                    production_options.loc[[compliant_tech_share_options['strategic_compliance_ratio'].idxmax()]]
+                    production_option_rows([compliant_tech_share_options['strategic_compliance_ratio'].idxmax()])
         else:
             most_strategic_compliant_tech_share_option = compliant_tech_share_options.iloc[[0]]
 
@@ -1653,6 +2103,8 @@ def select_candidate_manufacturing_decisions(production_options, calendar_year,
                 pass
             if omega_globals.options.slice_tech_combo_cloud_tables:
                 production_options = production_options[production_options['strategic_compliance_ratio'].values <= 1.2]
+            if materialize_func is not None:
+                production_options = materialize_func(production_options)
             producer_iteration_log.write(production_options)
         else:
             # log candidate production decisions only
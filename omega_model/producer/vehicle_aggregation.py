@@ -349,7 +349,8 @@ class VehicleAggregation(OMEGABase):
 
             global aggregation_columns
             # if not omega_globals.options.consolidate_manufacturers:
-            aggregation_columns += ['manufacturer_id']
+            if 'manufacturer_id' not in aggregation_columns:  # may be re-initialized in the same process
+                aggregation_columns += ['manufacturer_id']
             omega_globals.manufacturer_aggregation = True
 
             # process manufacturer include/exclude lists
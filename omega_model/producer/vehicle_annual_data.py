@@ -21,9 +21,21 @@ class VehicleAnnualData(OMEGABase):
     """
     **Stores and retrieves vehicle annual data, which includes age, registered count, vehicle miles travelled, etc.**
 
+    Data is stored by column, in numpy arrays that grow as records are added, with hash indexes of the records by
+    calendar year and compliance id and by calendar year and vehicle id, so lookups don't have to scan the (growing)
+    data set.
+
     """
 
-    _data = []
+    columns = {'calendar_year': int, 'compliance_id': object, 'vehicle_id': int, 'age': int,
+               'registered_count': float, 'annual_vmt': float, 'odometer': float, 'vmt': float}
+
+    _data = dict()  # dict of column arrays, only the first ``_num_rows`` rows are valid
+    _num_rows = 0
+
+    _calendar_year_index = dict()  # lists of rows by calendar year
+    _compliance_id_index = dict()  # lists of rows by (calendar year, compliance id)
+    _vehicle_id_index = dict()  # row by (calendar year, vehicle id)
 
     @staticmethod
     def create(calendar_year, vehicle_id, compliance_id, age, registered_count=0, annual_vmt=0, odometer=0, vmt=0):
@@ -54,17 +66,72 @@ class VehicleAnnualData(OMEGABase):
         Add all vehicle annual data records to the class data set.
 
         Args:
-            vad_list (list): list of vehicle annual data dicts
+            vad_list (list): list of vehicle annual data dicts, or a single vehicle annual data dict
 
         Returns:
             Nothing, updates ``VehicleAnnualData._data``
 
         """
-        if type(vad_list) == list:
-            for vad in vad_list:
-                VehicleAnnualData._data.append(vad)
-        else:
-            VehicleAnnualData._data.append(vad_list)  # , ignore_index=True)
+        if type(vad_list) != list:
+            vad_list = [vad_list]
+
+        VehicleAnnualData.add_columns({c: [vad[c] for vad in vad_list] for c in VehicleAnnualData.columns})
+
+    @staticmethod
+    def add_columns(data):
+        """
+        Add vehicle annual data records to the class data set, by column.
+
+        Args:
+            data (dict, DataFrame): column values by column name, for all of ``VehicleAnnualData.columns``,
+                columns with the same value for all records may be given as a scalar, except ``vehicle_id``
+
+        Returns:
+            Nothing, updates ``VehicleAnnualData._data`` and indexes
+
+        """
+        num_new_rows = len(data['vehicle_id'])
+        start_row = VehicleAnnualData._num_rows
+        end_row = start_row + num_new_rows
+
+        if not VehicleAnnualData._data or end_row > len(VehicleAnnualData._data['vehicle_id']):
+            # grow capacity geometrically so appending is amortized constant time per record
+            capacity = max(1024, end_row, 2 * start_row)
+            columns = dict()
+            for c, dtype in VehicleAnnualData.columns.items():
+                columns[c] = np.zeros(capacity, dtype=dtype)
+                if VehicleAnnualData._data:
+                    columns[c][:start_row] = VehicleAnnualData._data[c][:start_row]
+            VehicleAnnualData._data = columns
+
+        for c in VehicleAnnualData.columns:
+            VehicleAnnualData._data[c][start_row:end_row] = data[c]
+
+        VehicleAnnualData._num_rows = end_row
+
+        for row, calendar_year, compliance_id, vehicle_id in \
+                zip(range(start_row, end_row), VehicleAnnualData._data['calendar_year'][start_row:end_row].tolist(),
+                    VehicleAnnualData._data['compliance_id'][start_row:end_row],
+                    VehicleAnnualData._data['vehicle_id'][start_row:end_row].tolist()):
+            VehicleAnnualData._calendar_year_index.setdefault(calendar_year, []).append(row)
+            VehicleAnnualData._compliance_id_index.setdefault((calendar_year, compliance_id), []).append(row)
+            VehicleAnnualData._vehicle_id_index[calendar_year, vehicle_id] = row
+
+    @staticmethod
+    def update_vehicle_annual_data(rows, **values):
+        """
+        Update vehicle annual data records.
+
+        Args:
+            rows (int, [ints]): the row(s) to update, e.g. from the index of ``get_vehicle_annual_data()``
+            **values: new values by column name, e.g. ``vmt=vmt``
+
+        Returns:
+            Nothing, updates ``VehicleAnnualData._data``
+
+        """
+        for c, value in values.items():
+            VehicleAnnualData._data[c][rows] = value
 
     @staticmethod
     def update_registered_count(vehicle, calendar_year, registered_count):
@@ -82,15 +149,14 @@ class VehicleAnnualData(OMEGABase):
         """
         age = int(calendar_year - vehicle.model_year)
 
-        vad = [v for v in VehicleAnnualData._data
-               if v['calendar_year'] == calendar_year and v['vehicle_id'] == vehicle.vehicle_id]
+        row = VehicleAnnualData._vehicle_id_index.get((calendar_year, vehicle.vehicle_id))
 
-        if not vad:
+        if row is None:
             vad = VehicleAnnualData.create(int(calendar_year), vehicle.vehicle_id, vehicle.compliance_id, age,
                                            registered_count)
             VehicleAnnualData.add_all(vad)
         else:
-            vad['registered_count'] = registered_count
+            VehicleAnnualData.update_vehicle_annual_data(row, registered_count=registered_count)
 
     @staticmethod
     def get_calendar_years():
@@ -101,7 +167,7 @@ class VehicleAnnualData(OMEGABase):
             List of calendar years that have vehicle annual data.
 
         """
-        return [v['calendar_year'] for v in VehicleAnnualData._data]
+        return sorted(VehicleAnnualData._calendar_year_index)
 
     @staticmethod
     def get_vehicle_annual_data(calendar_year, compliance_id=None, attributes=None):
@@ -114,20 +180,26 @@ class VehicleAnnualData(OMEGABase):
             attributes (str, [strs]): optional name of attribute(s) to retrieve instead of all data
 
         Returns:
-            A list of VehicleAnnualData objects, or a list of n-tuples of the requested attribute(s) value(s), e.g.
-            ``[(1,), (2,), (3,), ...`` which can be conveniently unpacked by ``omega_db.sql_unpack_result()``
+            A DataFrame of vehicle annual data, indexed by row so data can be updated via
+            ``update_vehicle_annual_data()``
 
         """
-        from producer.vehicles import VehicleFinal
+        if compliance_id is None:
+            rows = VehicleAnnualData._calendar_year_index.get(calendar_year, [])
+        else:
+            rows = VehicleAnnualData._compliance_id_index.get((calendar_year, compliance_id), [])
 
-        if attributes is None and compliance_id is None:
-            result = [v for v in VehicleAnnualData._data
-                      if v['calendar_year'] == calendar_year]
-        elif attributes is None and compliance_id is not None:
-            result = [v for v in VehicleAnnualData._data
-                      if v['calendar_year'] == calendar_year and v['compliance_id'] == compliance_id]
+        if attributes is None:
+            attributes = VehicleAnnualData.columns
+        elif type(attributes) is not list:
+            attributes = [attributes]
 
-        return result
+        if not VehicleAnnualData._data:
+            return pd.DataFrame(columns=attributes)
+
+        rows = np.array(rows, dtype=int)
+
+        return pd.DataFrame({c: VehicleAnnualData._data[c][rows] for c in attributes}, index=rows)
 
     @staticmethod
     def get_vehicle_annual_data_by_vehicle_id(calendar_year, vehicle_id, attribute_name):
@@ -143,10 +215,38 @@ class VehicleAnnualData(OMEGABase):
             The attribute_value for the given attribute_name
 
         """
-        result = [v[attribute_name] for v in VehicleAnnualData._data
-                  if v['calendar_year'] == calendar_year and v['vehicle_id'] == vehicle_id]
+        return VehicleAnnualData._data[attribute_name][VehicleAnnualData._vehicle_id_index[calendar_year, vehicle_id]]
+
+    @staticmethod
+    def to_dataframe(compliance_id=None, min_calendar_year=None):
+        """
+        Get vehicle annual data as a DataFrame, e.g. for post-processing.  Columns are built directly from the
+        column arrays, without per-record conversion.
+
+        Args:
+            compliance_id (str): optional name of manufacturer to get data for, e.g. 'consolidated_OEM'
+            min_calendar_year (int): optional first calendar year to get data for
+
+        Returns:
+            A DataFrame of vehicle annual data, in the order the data was added
+
+        """
+        num_rows = VehicleAnnualData._num_rows
+
+        if not VehicleAnnualData._data:
+            return pd.DataFrame({c: np.zeros(0, dtype=dtype) for c, dtype in VehicleAnnualData.columns.items()})
+
+        data = {c: VehicleAnnualData._data[c][:num_rows] for c in VehicleAnnualData.columns}
+
+        if compliance_id is not None or min_calendar_year is not None:
+            rows = np.ones(num_rows, dtype=bool)
+            if compliance_id is not None:
+                rows &= data['compliance_id'] == compliance_id
+            if min_calendar_year is not None:
+                rows &= data['calendar_year'] >= min_calendar_year
+            data = {c: data[c][rows] for c in data}
 
-        return result[0]
+        return pd.DataFrame(data, copy=False)
 
     @staticmethod
     def init_vehicle_annual_data():
@@ -159,7 +259,11 @@ class VehicleAnnualData(OMEGABase):
         """
         _cache.clear()
 
-        VehicleAnnualData._data = []
+        VehicleAnnualData._data = dict()
+        VehicleAnnualData._num_rows = 0
+        VehicleAnnualData._calendar_year_index = dict()
+        VehicleAnnualData._compliance_id_index = dict()
+        VehicleAnnualData._vehicle_id_index = dict()
 
         return []
 
@@ -79,7 +79,7 @@ from policy.drive_cycle_weights import DriveCycleWeights
 from policy.offcycle_credits import OffCycleCredits
 from policy.upstream_methods import UpstreamMethods
 
-from common.omega_functions import cartesian_prod, calc_frontier
+from common.omega_functions import calc_frontier, calc_frontier_indices
 from common.omega_plot import figure, label_xyt, vlineat
 from common.omega_functions import weighted_value
 
@@ -90,6 +90,8 @@ from producer.vehicle_annual_data import VehicleAnnualData
 
 cost_curve_interp_key = 'credits_co2e_Mg_per_vehicle'  # was 'cert_co2e_grams_per_mile'
 
+vehicle_ids_query_chunk_size = 500  # max vehicle IDs per IN query, keeps below the SQLite bound parameter limit
+
 
 class DecompositionAttributes(OMEGABase):
     """
@@ -263,6 +265,84 @@ class DecompositionAttributes(OMEGABase):
         return cost_curve.rename(columns=rename_dict)
 
 
+class CostCurveInterpTable(OMEGABase):
+    """
+    **Precomputed linear interpolation table for a cost curve.**
+
+    Stores the sorted cost curve index values and all numeric cost curve columns as one contiguous 2-D array, along
+    with the segment slopes, so that any number of attributes can be interpolated in a single lookup without
+    re-extracting DataFrame columns.  Results are the same as ``np.interp()`` of the individual columns.
+
+    """
+    def __init__(self, cost_curve, index_column):
+        """
+        Create an interpolation table from the given cost curve.
+
+        Args:
+            cost_curve (DataFrame): the cost curve to interpolate
+            index_column (str): the name of the x-axis / index column
+
+        """
+        numeric_columns = [c for c in cost_curve.columns if is_numeric_dtype(cost_curve[c])]
+
+        x = cost_curve[index_column].values.astype('float64')
+        sort_order = np.argsort(x, kind='stable')
+
+        self.x = x[sort_order]
+        self.data = np.ascontiguousarray(cost_curve[numeric_columns].values.astype('float64')[sort_order])
+        self.column_index = {c: idx for idx, c in enumerate(numeric_columns)}
+
+        if len(self.x) > 1:
+            # segments between duplicate index values have non-finite slopes, but are never interpolated, same as
+            # np.interp(), which takes the value of the last of the duplicates
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.slopes = np.diff(self.data, axis=0) / np.diff(self.x)[:, np.newaxis]
+        else:
+            self.slopes = None
+
+    def __contains__(self, attribute_name):
+        return attribute_name in self.column_index
+
+    def interp(self, query_points, attribute_names):
+        """
+        Interpolate the given attributes at the given query point(s).
+
+        Args:
+            query_points (numeric or Array): the x-axis / index value(s) at which to interpolate
+            attribute_names ([strs]): names of the attributes to interpolate
+
+        Returns:
+            Array of interpolated values, one column per attribute name and, for array ``query_points``, one row per
+            query point
+
+        """
+        columns = [self.column_index[an] for an in attribute_names]
+
+        scalar_query = np.ndim(query_points) == 0
+        query_points = np.atleast_1d(np.asarray(query_points, dtype='float64'))
+
+        if self.slopes is None:
+            values = np.tile(self.data[0, columns], (len(query_points), 1))
+        else:
+            segments = np.clip(np.searchsorted(self.x, query_points, side='right') - 1, 0, len(self.x) - 2)
+            rows = segments[:, np.newaxis]
+            segment_x = self.x[rows]
+
+            with np.errstate(invalid='ignore'):
+                values = \
+                    self.slopes[rows, columns] * (query_points[:, np.newaxis] - segment_x) + self.data[rows, columns]
+
+            # exact hits and points outside the table take the table values, same as np.interp()
+            values = np.where(query_points[:, np.newaxis] == segment_x, self.data[rows, columns], values)
+            values[query_points < self.x[0]] = self.data[0, columns]
+            values[query_points >= self.x[-1]] = self.data[-1, columns]
+
+        if scalar_query:
+            return values[0]
+        else:
+            return values
+
+
 class VehicleOnroadCalculations(OMEGABase):
     """
     **Performs vehicle attribute calculations, as outlined in the input file.**
@@ -451,6 +531,8 @@ class CompositeVehicle(OMEGABase):
             else:
                 v.composite_vehicle_share_frac = 0
 
+        self.cost_curve_interp_table = None
+
         if calc_composite_cost_curve:
             plot_cost_curve = ((omega_globals.options.log_vehicle_cloud_years == 'all') or
                               (self.model_year in omega_globals.options.log_vehicle_cloud_years)) and \
@@ -502,11 +584,19 @@ class CompositeVehicle(OMEGABase):
 
         for v in self.vehicle_list:
             if 'cost_curve' in self.__dict__:
+                # interpolate all available decomposition attributes in a single lookup
+                cost_curve_interp_table = self.get_cost_curve_interp_table()
+                interp_attributes = [ccv for ccv in DecompositionAttributes.values
+                                     if 'veh_%s_%s' % (v.vehicle_id, ccv) in cost_curve_interp_table]
+                interp_values = cost_curve_interp_table.interp(
+                    self.__getattribute__(cost_curve_interp_key),
+                    ['veh_%s_%s' % (v.vehicle_id, ccv) for ccv in interp_attributes])
+
                 for ccv in DecompositionAttributes.values:
-                    v.__setattr__(ccv,
-                              DecompositionAttributes.interp1d(v, self.cost_curve, cost_curve_interp_key,
-                                                               self.__getattribute__(cost_curve_interp_key),
-                                                               ccv))
+                    v.__setattr__(ccv, None)
+
+                for ccv, value in zip(interp_attributes, interp_values):
+                    v.__setattr__(ccv, value)
 
                 for ccv in omega_globals.options.CostCloud.cloud_non_numeric_data_columns:
                     v.__setattr__(ccv,
@@ -596,31 +686,7 @@ class CompositeVehicle(OMEGABase):
             vehicle_frontier = v.cost_curve
             vehicle_frontier['veh_%s_market_share' % v.vehicle_id] = v.composite_vehicle_share_frac
 
-            composite_frontier_df = cartesian_prod(composite_frontier_df, vehicle_frontier)
-
-            prior_market_share_frac = composite_frontier_df['market_share_frac'].values
-            veh_market_share_frac = composite_frontier_df['veh_%s_market_share' % v.vehicle_id].values
-
-            for wv in self.weighted_values:
-                composite_frontier_df[wv] = \
-                    (composite_frontier_df[wv].values * prior_market_share_frac +
-                     composite_frontier_df['veh_%s_%s' % (v.vehicle_id, wv)].values * veh_market_share_frac) / \
-                    (prior_market_share_frac + veh_market_share_frac)
-
-            # update running total market share
-            composite_frontier_df['market_share_frac'] = prior_market_share_frac + veh_market_share_frac
-
-            drop_columns = [c for c in composite_frontier_df.columns if c.endswith('_y') or c.endswith('_x') or
-                            c.endswith('_market_share')] + ['_']
-
-            # calculate new sales-weighted frontier
-            composite_frontier_df = calc_frontier(composite_frontier_df, cost_curve_interp_key,
-                                                  'new_vehicle_mfr_generalized_cost_dollars',
-                                                  allow_upslope=True)
-
-            # CU
-            composite_frontier_df = \
-                composite_frontier_df.drop(drop_columns + ['frontier_factor'], axis=1, errors='ignore')
+            composite_frontier_df = self.calc_weighted_frontier(composite_frontier_df, vehicle_frontier, v)
 
             if plot:
                 if v.name in omega_globals.options.plot_and_log_vehicles:
@@ -648,6 +714,102 @@ class CompositeVehicle(OMEGABase):
 
         return composite_frontier_df
 
+    def calc_weighted_frontier(self, composite_frontier_df, vehicle_frontier, vehicle):
+        """
+        Weight a Vehicle's cost curve into the composite cost curve and calculate the frontier of the result.
+
+        Only the two frontier axes are evaluated over the full factorial combination of the composite and Vehicle
+        cost curve points, as flat numpy arrays, and only the resulting frontier points are materialized as
+        DataFrame rows.  Produces the same frontier as calculating the frontier of the full
+        ``cartesian_prod(composite_frontier_df, vehicle_frontier)``, without building the wide intermediate
+        DataFrame.
+
+        Args:
+            composite_frontier_df (DataFrame): the composite cost curve so far
+            vehicle_frontier (DataFrame): the Vehicle cost curve to weight into the composite cost curve
+            vehicle (Vehicle): the Vehicle associated with ``vehicle_frontier``
+
+        Returns:
+            DataFrame containing the new composite cost curve
+
+        """
+        frontier_x_key = cost_curve_interp_key
+        frontier_y_key = 'new_vehicle_mfr_generalized_cost_dollars'
+
+        num_composite_points = len(composite_frontier_df)
+        num_vehicle_points = len(vehicle_frontier)
+
+        # market share is the same for every point of a cost curve
+        prior_market_share_frac = composite_frontier_df['market_share_frac'].values[0]
+        veh_market_share_frac = vehicle_frontier['veh_%s_market_share' % vehicle.vehicle_id].values[0]
+        total_market_share_frac = prior_market_share_frac + veh_market_share_frac
+
+        if num_composite_points * num_vehicle_points > 1:
+            # frontier axes of the full factorial combination, in cartesian_prod() row order
+            frontier_x = \
+                ((composite_frontier_df[frontier_x_key].values[:, np.newaxis] * prior_market_share_frac +
+                  vehicle_frontier['veh_%s_%s' % (vehicle.vehicle_id, frontier_x_key)].values[np.newaxis, :] *
+                  veh_market_share_frac) / total_market_share_frac).ravel()
+
+            frontier_y = \
+                ((composite_frontier_df[frontier_y_key].values[:, np.newaxis] * prior_market_share_frac +
+                  vehicle_frontier['veh_%s_%s' % (vehicle.vehicle_id, frontier_y_key)].values[np.newaxis, :] *
+                  veh_market_share_frac) / total_market_share_frac).ravel()
+
+            frontier_indices, frontier_factors, x_norm, y_norm = \
+                calc_frontier_indices(frontier_x, frontier_y, allow_upslope=True)
+        else:
+            frontier_indices = np.array([0])
+            frontier_factors = x_norm = y_norm = None
+
+        composite_indices, vehicle_indices = np.divmod(frontier_indices, num_vehicle_points)
+
+        composite_frontier_df = \
+            pd.merge(composite_frontier_df.iloc[composite_indices].reset_index(drop=True),
+                     vehicle_frontier.iloc[vehicle_indices].reset_index(drop=True),
+                     left_index=True, right_index=True)
+
+        composite_frontier_df.index = frontier_indices
+
+        for wv in self.weighted_values:
+            composite_frontier_df[wv] = \
+                (composite_frontier_df[wv].values * prior_market_share_frac +
+                 composite_frontier_df['veh_%s_%s' % (vehicle.vehicle_id, wv)].values * veh_market_share_frac) / \
+                total_market_share_frac
+
+        # update running total market share
+        composite_frontier_df['market_share_frac'] = total_market_share_frac
+
+        drop_columns = [c for c in composite_frontier_df.columns if c.endswith('_y') or c.endswith('_x') or
+                        c.endswith('_market_share')] + ['_']
+
+        if x_norm is not None:
+            # drop non-numeric columns, same as calc_frontier()
+            drop_columns += omega_globals.options.CostCloud.cloud_non_numeric_columns
+
+        # copy() consolidates the column blocks so the fragmentation doesn't carry over to the next vehicle
+        composite_frontier_df = composite_frontier_df.drop(drop_columns, axis=1, errors='ignore').copy()
+
+        if x_norm is not None:
+            composite_frontier_df['y_norm'] = y_norm[frontier_indices]
+            composite_frontier_df['x_norm'] = x_norm[frontier_indices]
+
+        # CU
+        return composite_frontier_df
+
+    def get_cost_curve_interp_table(self):
+        """
+        Get the interpolation table of the composite cost curve, creating it on first use.
+
+        Returns:
+            The ``CostCurveInterpTable`` of the composite cost curve
+
+        """
+        if self.cost_curve_interp_table is None:
+            self.cost_curve_interp_table = CostCurveInterpTable(self.cost_curve, cost_curve_interp_key)
+
+        return self.cost_curve_interp_table
+
     def get_from_cost_curve(self, attribute_name, query_points):
         """
         Get new vehicle manufacturer cost from the composite cost curve for the provided cert CO2e g/mi value(s).
@@ -660,9 +822,24 @@ class CompositeVehicle(OMEGABase):
             A float or numeric Array of new vehicle manufacturer costs
 
         """
+        if attribute_name in self.get_cost_curve_interp_table():
+            return self.get_attributes_from_cost_curve([attribute_name], query_points)[..., 0]
+        else:
+            return None
 
-        return DecompositionAttributes.interp1d(self, self.cost_curve, cost_curve_interp_key, query_points,
-                                                attribute_name)
+    def get_attributes_from_cost_curve(self, attribute_names, query_points):
+        """
+        Get several attributes from the composite cost curve for the provided query point(s) in a single lookup.
+
+        Args:
+            attribute_names ([strs]): the names of the attributes to query
+            query_points (numeric list or Array): the values at which to query the cost curve
+
+        Returns:
+            Array of attribute values, one column per attribute and, for array ``query_points``, one row per query point
+
+        """
+        return self.get_cost_curve_interp_table().interp(query_points, attribute_names)
 
     def get_max_cost_curve_index(self):
         """
@@ -1236,7 +1413,11 @@ class VehicleFinal(SQABase, Vehicle):
     """
     # --- database table properties ---
     __tablename__ = 'vehicles'
-    __table_args__ = {'extend_existing': True}  # fix sphinx-apidoc crash
+    __table_args__ = (
+        # compliance ID and model year queries, e.g. get_compliance_vehicles(), calc_target_co2e_Mg()
+        Index('ix_vehicles_compliance_id_model_year', 'compliance_id', 'model_year'),
+        {'extend_existing': True},  # fix sphinx-apidoc crash
+    )
     vehicle_id = Column(Integer, primary_key=True)  #: unique vehicle ID, database table primary key
     from_vehicle_id = Column(String)  #: transferred vehicle ID from Vehicle object
     name = Column(String)  #: vehicle name
@@ -1404,6 +1585,33 @@ class VehicleFinal(SQABase, Vehicle):
         attrs = VehicleFinal.get_class_attributes(attributes)
         return omega_globals.session.query(*attrs).filter(VehicleFinal.vehicle_id == vehicle_id).one()
 
+    @staticmethod
+    def get_vehicles_attributes(vehicle_ids, attributes):
+        """
+        A generic 'getter' to retrieve one or more ``VehicleFinal`` object attributes of many vehicles at once, with
+        one database query per chunk of vehicle IDs rather than one per vehicle
+
+        Args:
+            vehicle_ids ([ints]): the vehicle IDs
+            attributes (str, [strs]): the name or list of names of vehicle attributes to get
+
+        Returns:
+            A dict of the value(s) of the requested attribute(s) by vehicle ID
+
+        """
+        if type(attributes) is not list:
+            attributes = [attributes]
+        attrs = VehicleFinal.get_class_attributes(attributes)
+
+        vehicles_attributes = dict()
+        for chunk_start in range(0, len(vehicle_ids), vehicle_ids_query_chunk_size):
+            chunk_vehicle_ids = vehicle_ids[chunk_start:chunk_start + vehicle_ids_query_chunk_size]
+            for row in omega_globals.session.query(VehicleFinal.vehicle_id, *attrs).\
+                    filter(VehicleFinal.vehicle_id.in_(chunk_vehicle_ids)):
+                vehicles_attributes[row[0]] = row[1:]
+
+        return vehicles_attributes
+
     @staticmethod
     def calc_target_co2e_Mg(model_year, compliance_id):
         """
@@ -1812,7 +2020,23 @@ if __name__ == '__main__':
         init_fail = []
 
         if not init_fail:
-            pass
+            # CostCurveInterpTable versus np.interp(), including cost curves with duplicate index values
+            rng = np.random.default_rng(0)
+            for _ in range(2000):
+                test_curve = pd.DataFrame({'x': rng.integers(0, 5, rng.integers(1, 10)).astype(float)})
+                test_curve['y1'] = rng.random(len(test_curve))
+                test_curve['y2'] = rng.random(len(test_curve))
+                test_curve = test_curve.sort_values('x', kind='stable')
+
+                test_points = np.concatenate([rng.uniform(-1, 6, 5), test_curve['x'].values])
+                test_values = CostCurveInterpTable(test_curve, 'x').interp(test_points, ['y2', 'y1'])
+
+                for column, attribute_name in enumerate(['y2', 'y1']):
+                    assert np.array_equal(test_values[:, column],
+                                          np.interp(test_points, test_curve['x'].values,
+                                                    test_curve[attribute_name].values))
+
+            print('CostCurveInterpTable test passed')
 
         else:
             print(init_fail)